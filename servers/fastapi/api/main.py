@@ -6,9 +6,18 @@ from sqlmodel import SQLModel
 from contextlib import asynccontextmanager
 
 from api.models import SelectedLLMProvider
+from api.routers.metrics.router import metrics_router
+from api.routers.presentation.handlers.generate_presentation import (
+    run_presentation_generation_job,
+)
 from api.routers.presentation.router import presentation_router
 from api.routers.social.router import social_router
 from api.services.database import sql_engine
+from api.services.instances import (
+    GENERATION_JOB_SERVICE,
+    LLM_CLIENT_SERVICE,
+    THEME_REGISTRY_SERVICE,
+)
 from api.utils.supported_ollama_models import SUPPORTED_OLLAMA_MODELS
 from api.utils.utils import update_env_with_user_config
 from api.utils.model_utils import (
@@ -18,6 +27,9 @@ from api.utils.model_utils import (
     list_available_custom_models,
     pull_ollama_model,
 )
+from image_processor.icons_vectorstore_utils import get_icons_index
+from ppt_generator.icon_variants import get_icon_variant_cache
+from ppt_generator.picture_processing import shutdown_picture_process_pool
 
 can_change_keys = os.getenv("CAN_CHANGE_KEYS") != "false"
 
@@ -74,8 +86,19 @@ async def check_llm_model_availability():
 async def lifespan(_: FastAPI):
     os.makedirs(os.getenv("APP_DATA_DIRECTORY"), exist_ok=True)
     SQLModel.metadata.create_all(sql_engine)
+    THEME_REGISTRY_SERVICE.load()
+    get_icon_variant_cache().start_warming(THEME_REGISTRY_SERVICE.get_icon_colors())
+    try:
+        await asyncio.to_thread(get_icons_index)
+    except Exception as e:
+        # ? Icons fall back to the placeholder, the rest of the app still works
+        print("Could not load the icon index: ", e)
     await check_llm_model_availability()
+    await GENERATION_JOB_SERVICE.start(run_presentation_generation_job)
     yield
+    await GENERATION_JOB_SERVICE.stop()
+    await LLM_CLIENT_SERVICE.close()
+    shutdown_picture_process_pool()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -98,3 +121,4 @@ async def update_env_middleware(request: Request, call_next):
 
 app.include_router(presentation_router)
 app.include_router(social_router)
+app.include_router(metrics_router)
@@ -59,6 +59,32 @@ class SSECompleteResponse(BaseModel):
         ).to_string()
 
 
+class SSESlideCompleteResponse(BaseModel):
+    index: int
+    slide: dict
+
+    def to_string(self):
+        return SSEResponse(
+            event="response",
+            data=json.dumps(
+                {"type": "slide_complete", "index": self.index, "slide": self.slide}
+            ),
+        ).to_string()
+
+
+class SSEAssetFetchedResponse(BaseModel):
+    slide_index: int
+    kind: str
+    done: int
+    total: int
+
+    def to_string(self):
+        return SSEResponse(
+            event="response",
+            data=json.dumps({"type": "asset_fetched", **self.model_dump()}),
+        ).to_string()
+
+
 class UserConfig(BaseModel):
     LLM: Optional[str] = None
     OPENAI_API_KEY: Optional[str] = None
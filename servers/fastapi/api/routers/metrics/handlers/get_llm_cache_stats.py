@@ -0,0 +1,9 @@
+from api.models import LogMetadata
+from api.services.instances import LLM_RESPONSE_CACHE_SERVICE
+from api.services.logging import LoggingService
+
+
+class GetLLMCacheStatsHandler:
+
+    async def get(self, logging_service: LoggingService, log_metadata: LogMetadata):
+        return await LLM_RESPONSE_CACHE_SERVICE.get_stats()
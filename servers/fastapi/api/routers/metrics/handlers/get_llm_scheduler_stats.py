@@ -0,0 +1,9 @@
+from api.models import LogMetadata
+from api.services.instances import LLM_SCHEDULER_SERVICE
+from api.services.logging import LoggingService
+
+
+class GetLLMSchedulerStatsHandler:
+
+    async def get(self, logging_service: LoggingService, log_metadata: LogMetadata):
+        return LLM_SCHEDULER_SERVICE.get_stats()
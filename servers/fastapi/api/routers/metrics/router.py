@@ -0,0 +1,41 @@
+from fastapi import APIRouter
+
+from api.request_utils import RequestUtils
+from api.routers.metrics.handlers.get_llm_cache_stats import GetLLMCacheStatsHandler
+from api.routers.metrics.handlers.get_llm_client_stats import (
+    GetLLMClientStatsHandler,
+)
+from api.routers.metrics.handlers.get_llm_scheduler_stats import (
+    GetLLMSchedulerStatsHandler,
+)
+from api.utils.utils import handle_errors
+
+route_prefix = "/api/v1/metrics"
+metrics_router = APIRouter(prefix=route_prefix)
+
+
+@metrics_router.get("/llm/clients", response_model=dict)
+async def get_llm_client_stats():
+    request_utils = RequestUtils(f"{route_prefix}/llm/clients")
+    logging_service, log_metadata = await request_utils.initialize_logger()
+    return await handle_errors(
+        GetLLMClientStatsHandler().get, logging_service, log_metadata
+    )
+
+
+@metrics_router.get("/llm/cache", response_model=dict)
+async def get_llm_cache_stats():
+    request_utils = RequestUtils(f"{route_prefix}/llm/cache")
+    logging_service, log_metadata = await request_utils.initialize_logger()
+    return await handle_errors(
+        GetLLMCacheStatsHandler().get, logging_service, log_metadata
+    )
+
+
+@metrics_router.get("/llm/scheduler", response_model=dict)
+async def get_llm_scheduler_stats():
+    request_utils = RequestUtils(f"{route_prefix}/llm/scheduler")
+    logging_service, log_metadata = await request_utils.initialize_logger()
+    return await handle_errors(
+        GetLLMSchedulerStatsHandler().get, logging_service, log_metadata
+    )
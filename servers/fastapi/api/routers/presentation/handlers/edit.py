@@ -8,7 +8,7 @@ from api.models import LogMetadata
 from api.routers.presentation.models import (
     EditPresentationSlideRequest,
 )
-from api.services.instances import TEMP_FILE_SERVICE
+from api.services.instances import TEMP_FILE_SERVICE, THEME_REGISTRY_SERVICE
 from api.services.logging import LoggingService
 from api.utils.supported_ollama_models import SUPPORTED_OLLAMA_MODELS
 from api.utils.utils import (
@@ -16,9 +16,8 @@ from api.utils.utils import (
     get_presentation_images_dir,
 )
 from api.utils.model_utils import is_custom_llm_selected, is_ollama_selected
-from image_processor.icons_vectorstore_utils import get_icons_vectorstore
 from image_processor.images_finder import generate_image
-from image_processor.icons_finder import get_icon
+from image_processor.icons_finder import get_icons_for_queries
 from ppt_generator.models.query_and_prompt_models import (
     IconQueryCollectionWithData,
     ImagePromptWithThemeAndAspectRatio,
@@ -102,7 +101,11 @@ class PresentationEditHandler:
         new_slide_images_count = new_slide_model.images_count
         new_slide_icons_count = new_slide_model.icons_count
 
-        slide_model_utils = SlideModelUtils(presentation.theme, new_slide_model)
+        slide_model_utils = SlideModelUtils(
+            presentation.theme,
+            new_slide_model,
+            THEME_REGISTRY_SERVICE.get_prompt((presentation.theme or {}).get("name")),
+        )
 
         new_slide_images: dict[int, str | ImagePromptWithThemeAndAspectRatio] = {}
         new_slide_icons: dict[int, str | IconQueryCollectionWithData] = {}
@@ -160,19 +163,15 @@ class PresentationEditHandler:
                 icons_to_generate.append(each)
 
         images_directory = get_presentation_images_dir(self.presentation_id)
-        if icons_to_generate:
-            icons_vectorstore = get_icons_vectorstore()
-
-        coroutines = [
-            generate_image(each_prompt, images_directory)
-            for each_prompt in images_to_generate
-        ] + [
-            get_icon(icons_vectorstore, each_query) for each_query in icons_to_generate
-        ]
-        generated_assets = await asyncio.gather(*coroutines)
-        generated_image_count = len(images_to_generate)
-        generate_images = generated_assets[:generated_image_count]
-        generate_icons = generated_assets[generated_image_count:]
+
+        # All icons are searched as one batch
+        *generate_images, generate_icons = await asyncio.gather(
+            *[
+                generate_image(each_prompt, images_directory)
+                for each_prompt in images_to_generate
+            ],
+            get_icons_for_queries(icons_to_generate),
+        )
 
         for each in new_slide_images:
             if isinstance(new_slide_images[each], ImagePromptWithThemeAndAspectRatio):
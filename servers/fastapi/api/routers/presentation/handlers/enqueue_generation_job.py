@@ -0,0 +1,54 @@
+import uuid
+
+from api.models import LogMetadata
+from api.routers.presentation.handlers.generate_presentation import (
+    validate_llm_supports_presentation_generation,
+)
+from api.routers.presentation.models import (
+    GeneratePresentationOptions,
+    GeneratePresentationRequest,
+    GenerationJobResponse,
+)
+from api.services.instances import GENERATION_JOB_SERVICE, TEMP_FILE_SERVICE
+from api.services.logging import LoggingService
+from api.validators import validate_files
+from document_processor.loader import UPLOAD_ACCEPTED_DOCUMENTS
+
+
+class EnqueueGenerationJobHandler:
+
+    def __init__(self, presentation_id: str, data: GeneratePresentationRequest):
+        self.job_id = str(uuid.uuid4())
+        self.presentation_id = presentation_id
+        self.data = data
+
+    async def post(self, logging_service: LoggingService, log_metadata: LogMetadata):
+        validate_llm_supports_presentation_generation()
+        validate_files(self.data.documents, True, True, 50, UPLOAD_ACCEPTED_DOCUMENTS)
+
+        # ? Uploads are kept with the job so it can resume after a restart
+        job_dir = GENERATION_JOB_SERVICE.get_job_dir(self.job_id)
+        document_paths = []
+        for each in self.data.documents or []:
+            document_path = TEMP_FILE_SERVICE.create_temp_file_path(
+                each.filename, job_dir
+            )
+            with open(document_path, "wb") as f:
+                f.write(await each.read())
+            document_paths.append(document_path)
+
+        request = GeneratePresentationOptions(
+            **self.data.model_dump(exclude={"documents"})
+        ).model_dump(mode="json")
+        request["documents"] = document_paths
+
+        job = GENERATION_JOB_SERVICE.create_job(
+            self.job_id, self.presentation_id, request
+        )
+
+        logging_service.logger.info(
+            logging_service.message({"job_id": job.id, **request}),
+            extra=log_metadata.model_dump(),
+        )
+
+        return GenerationJobResponse.from_sql_model(job)
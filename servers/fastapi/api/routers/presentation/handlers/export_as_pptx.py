@@ -1,5 +1,7 @@
+import asyncio
 import os
 import uuid
+from typing import List, Optional, Tuple
 from api.models import LogMetadata
 from api.routers.presentation.mixins.fetch_presentation_assets import (
     FetchPresentationAssetsMixin,
@@ -9,10 +11,19 @@ from api.routers.presentation.models import (
     PresentationAndPath,
 )
 from api.services.logging import LoggingService
-from api.services.instances import TEMP_FILE_SERVICE
+from api.services.instances import TEMP_FILE_SERVICE, THEME_REGISTRY_SERVICE
 from api.sql_models import PresentationSqlModel
 from api.utils.utils import get_presentation_dir, sanitize_filename
-from ppt_generator.pptx_presentation_creator import PptxPresentationCreator
+from ppt_generator.models.pptx_models import PptxRendererEnum
+from ppt_generator.pptx_export_manifest import (
+    PptxExportManifest,
+    get_presentation_hash,
+)
+from ppt_generator.pptx_presentation_creator import (
+    PptxPresentationCreator,
+    get_slide_hashes,
+)
+from ppt_generator.pptx_xml_presentation_creator import PptxXmlPresentationCreator
 from api.services.database import get_sql_session
 
 
@@ -29,6 +40,73 @@ class ExportAsPptxHandler(FetchPresentationAssetsMixin):
     def __del__(self):
         TEMP_FILE_SERVICE.cleanup_temp_dir(self.temp_dir)
 
+    def get_ppt_path(self, presentation: PresentationSqlModel) -> str:
+        return os.path.join(
+            self.presentation_dir,
+            sanitize_filename(f"{presentation.title}.pptx")
+        )
+
+    def get_ppt_creator(self, theme: Optional[dict]) -> PptxPresentationCreator:
+        ppt_creator_class = (
+            PptxXmlPresentationCreator
+            if self.data.renderer == PptxRendererEnum.LXML
+            else PptxPresentationCreator
+        )
+        return ppt_creator_class(
+            self.data.pptx_model,
+            self.temp_dir,
+            THEME_REGISTRY_SERVICE.get_pptx_color_mapping(theme),
+        )
+
+    def build_ppt(
+        self, ppt_creator: PptxPresentationCreator, theme: Optional[dict]
+    ) -> Tuple[str, List[str]]:
+        """
+        Builds the presentation and returns the presentation and slide hashes
+        to save in the manifest once the package is written.
+        """
+        presentation_hash = get_presentation_hash(self.data.pptx_model, theme)
+        slide_hashes = get_slide_hashes(self.data.pptx_model)
+
+        # ? Re-exports reuse the last exported package and only rebuild the
+        # ? slides that changed since
+        manifest = PptxExportManifest.load(self.presentation_dir)
+        updated = False
+        if manifest and manifest.can_update(presentation_hash):
+            try:
+                n_rebuilt = ppt_creator.update_ppt(manifest.path, manifest.slide_hashes)
+                print(f"Rebuilt {n_rebuilt} of {len(slide_hashes)} slides")
+                updated = True
+            except Exception as e:
+                print(f"Could not update previous export, rebuilding: {e}")
+                ppt_creator.reset_ppt()
+        if not updated:
+            ppt_creator.create_ppt()
+
+        return presentation_hash, slide_hashes
+
+    def save_manifest(
+        self, path: str, presentation_hash: str, slide_hashes: List[str]
+    ):
+        PptxExportManifest.create(path, presentation_hash, slide_hashes).save(
+            self.presentation_dir
+        )
+
+    def create_and_save_ppt(
+        self, ppt_creator: PptxPresentationCreator, path: str, theme: Optional[dict]
+    ):
+        presentation_hash, slide_hashes = self.build_ppt(ppt_creator, theme)
+        ppt_creator.save(path)
+        self.save_manifest(path, presentation_hash, slide_hashes)
+
+    def update_presentation_file(self, path: str):
+        with get_sql_session() as sql_session:
+            presentation = sql_session.get(
+                PresentationSqlModel, self.data.presentation_id
+            )
+            presentation.file = path
+            sql_session.commit()
+
     async def post(self, logging_service: LoggingService, log_metadata: LogMetadata):
         logging_service.logger.info(
             logging_service.message(self.data.model_dump(mode="json")),
@@ -42,24 +120,17 @@ class ExportAsPptxHandler(FetchPresentationAssetsMixin):
                 PresentationSqlModel, self.data.presentation_id
             )
 
-        ppt_path = os.path.join(
-            self.presentation_dir,
-            sanitize_filename(f"{presentation.title}.pptx")
+        ppt_path = self.get_ppt_path(presentation)
+        ppt_creator = self.get_ppt_creator(presentation.theme)
+        # ? Export is CPU bound, keep it off the event loop
+        await asyncio.to_thread(
+            self.create_and_save_ppt, ppt_creator, ppt_path, presentation.theme
         )
-        ppt_creator = PptxPresentationCreator(self.data.pptx_model, self.temp_dir)
-        ppt_creator.create_ppt()
-        ppt_creator.save(ppt_path)
 
         response = PresentationAndPath(
             presentation_id=self.data.presentation_id, path=ppt_path
         )
-
-        with get_sql_session() as sql_session:
-            presentation = sql_session.get(
-                PresentationSqlModel, self.data.presentation_id
-            )
-            presentation.file = ppt_path
-            sql_session.commit()
+        self.update_presentation_file(ppt_path)
 
         logging_service.logger.info(
             logging_service.message(response.model_dump(mode="json")),
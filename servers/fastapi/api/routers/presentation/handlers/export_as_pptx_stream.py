@@ -0,0 +1,99 @@
+import asyncio
+import contextlib
+import os
+from typing import List, Optional
+from urllib.parse import quote
+
+from fastapi.responses import StreamingResponse
+
+from api.models import LogMetadata
+from api.routers.presentation.handlers.export_as_pptx import ExportAsPptxHandler
+from api.routers.presentation.models import ExportAsStreamRequest
+from api.services.database import get_sql_session
+from api.services.logging import LoggingService
+from api.sql_models import PresentationSqlModel
+from api.utils.stream_writer import QueueStreamWriter
+from ppt_generator.pptx_presentation_creator import PptxPresentationCreator
+
+PPTX_MEDIA_TYPE = (
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+)
+
+
+class ExportAsPptxStreamHandler(ExportAsPptxHandler):
+    """
+    Streams the exported package to the client while it is being written,
+    instead of saving it first and serving it in a second request.
+    """
+
+    def __init__(self, data: ExportAsStreamRequest):
+        super().__init__(data)
+
+    async def post(self, logging_service: LoggingService, log_metadata: LogMetadata):
+        logging_service.logger.info(
+            logging_service.message(self.data.model_dump(mode="json")),
+            extra=log_metadata.model_dump(),
+        )
+
+        await self.fetch_presentation_assets()
+
+        with get_sql_session() as sql_session:
+            presentation = sql_session.get(
+                PresentationSqlModel, self.data.presentation_id
+            )
+
+        ppt_path = self.get_ppt_path(presentation)
+        ppt_creator = self.get_ppt_creator(presentation.theme)
+        # ? Slides are built before responding, so build errors are still
+        # ? returned as errors instead of a broken download
+        presentation_hash, slide_hashes = await asyncio.to_thread(
+            self.build_ppt, ppt_creator, presentation.theme
+        )
+
+        filename = quote(os.path.basename(ppt_path))
+        return StreamingResponse(
+            self.get_stream(
+                ppt_creator,
+                ppt_path if self.data.save_to_disk else None,
+                presentation_hash,
+                slide_hashes,
+            ),
+            media_type=PPTX_MEDIA_TYPE,
+            headers={"Content-Disposition": f"attachment; filename*=UTF-8''{filename}"},
+        )
+
+    async def get_stream(
+        self,
+        ppt_creator: PptxPresentationCreator,
+        tee_path: Optional[str],
+        presentation_hash: str,
+        slide_hashes: List[str],
+    ):
+        writer = QueueStreamWriter(tee_path=tee_path)
+        save_task = asyncio.create_task(
+            asyncio.to_thread(self.save_ppt, ppt_creator, writer)
+        )
+        try:
+            async for chunk in writer.iter_chunks():
+                yield chunk
+            await save_task
+        finally:
+            writer.cancel()
+            # ? Once the client is gone the save fails writing to the
+            # ? cancelled writer, awaited so the error is not left unretrieved
+            with contextlib.suppress(OSError):
+                await save_task
+
+        if tee_path:
+            self.save_manifest(tee_path, presentation_hash, slide_hashes)
+            self.update_presentation_file(tee_path)
+
+    def save_ppt(self, ppt_creator: PptxPresentationCreator, writer: QueueStreamWriter):
+        failed = False
+        try:
+            ppt_creator.save(writer)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            writer.close(failed)
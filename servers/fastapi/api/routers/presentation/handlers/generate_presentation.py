@@ -1,7 +1,8 @@
 import json
-from typing import List
+from typing import Awaitable, Callable, List, Optional
 import uuid, aiohttp
 from fastapi import HTTPException
+from sqlmodel import delete
 from api.models import LogMetadata
 from api.routers.presentation.handlers.export_as_pptx import ExportAsPptxHandler
 from api.routers.presentation.handlers.upload_files import UploadFilesHandler
@@ -10,15 +11,20 @@ from api.routers.presentation.mixins.fetch_assets_on_generation import (
 )
 from api.routers.presentation.models import (
     ExportAsRequest,
-    GeneratePresentationRequest,
+    GeneratePresentationOptions,
     PresentationAndPath,
     PresentationPathAndEditPath,
 )
 from api.services.database import get_sql_session
-from api.services.instances import TEMP_FILE_SERVICE
+from api.services.instances import TEMP_FILE_SERVICE, THEME_REGISTRY_SERVICE
 from api.services.logging import LoggingService
-from api.sql_models import PresentationSqlModel, SlideSqlModel
-from api.utils.utils import get_presentation_dir
+from api.request_utils import RequestUtils
+from api.sql_models import (
+    GenerationJobSqlModel,
+    PresentationSqlModel,
+    SlideSqlModel,
+)
+from api.utils.utils import get_nextjs_url, get_presentation_dir
 from api.utils.model_utils import is_custom_llm_selected, is_ollama_selected
 from document_processor.loader import DocumentsLoader
 from ppt_config_generator.document_summary_generator import generate_document_summary
@@ -31,40 +37,111 @@ from ppt_generator.models.llm_models import (
 from ppt_generator.models.slide_model import SlideModel
 
 
+# (stage, stage output) -> None
+CheckpointCallback = Callable[[str, dict], Awaitable[None]]
+
+
 class GeneratePresentationHandler(FetchAssetsOnPresentationGenerationMixin):
 
-    def __init__(self, presentation_id: str, data: GeneratePresentationRequest):
+    def __init__(
+        self,
+        presentation_id: str,
+        data: GeneratePresentationOptions,
+        document_paths: Optional[List[str]] = None,
+    ):
         self.session = str(uuid.uuid4())
         self.presentation_id = presentation_id
         self.data = data
+        # Already uploaded documents, used when running as a background job
+        self.document_paths = document_paths
 
         self.temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
         self.presentation_dir = get_presentation_dir(self.presentation_id)
+        self.init_slide_assets_tasks()
 
     def __del__(self):
         TEMP_FILE_SERVICE.cleanup_temp_dir(self.temp_dir)
 
     async def post(self, logging_service: LoggingService, log_metadata: LogMetadata):
-        if is_ollama_selected() or is_custom_llm_selected():
-            raise HTTPException(
-                status_code=400,
-                detail="Ollama is not currently supported for this endpoint",
-            )
+        validate_llm_supports_presentation_generation()
+
+        if self.document_paths is None:
+            documents_and_images_path = await UploadFilesHandler(
+                documents=getattr(self.data, "documents", None),
+                images=None,
+            ).post(logging_service, log_metadata)
+            self.document_paths = documents_and_images_path.documents
+
+        return await self.run(logging_service, log_metadata)
 
-        documents_and_images_path = await UploadFilesHandler(
-            documents=self.data.documents,
-            images=None,
-        ).post(logging_service, log_metadata)
+    async def run(
+        self,
+        logging_service: LoggingService,
+        log_metadata: LogMetadata,
+        checkpoints: Optional[dict] = None,
+        on_checkpoint: Optional[CheckpointCallback] = None,
+    ) -> PresentationPathAndEditPath:
+        """
+        Runs every generation stage in order. Stages found in checkpoints are
+        restored instead of being run again, and the output of each finished
+        stage is passed to on_checkpoint.
+        """
+        checkpoints = checkpoints or {}
 
+        async def run_stage(stage: str, func: Callable[[], Awaitable[dict]]):
+            if stage in checkpoints:
+                print(f"Restoring stage {stage} from checkpoint")
+                return checkpoints[stage]
+            output = await func()
+            if on_checkpoint:
+                await on_checkpoint(stage, output)
+            return output
+
+        summary = (await run_stage("summary", self.generate_summary))["summary"]
+        presentation_content = PresentationMarkdownModel(
+            **await run_stage("outline", lambda: self.generate_outline(summary))
+        )
+        slides = (
+            await run_stage(
+                "presentation", lambda: self.generate_slides(presentation_content)
+            )
+        )["slides"]
+        self.theme = (await run_stage("theme", self.fetch_theme))["theme"]
+        slides = (
+            await run_stage(
+                "assets",
+                lambda: self.fetch_assets([SlideModel(**each) for each in slides]),
+            )
+        )["slides"]
+        await run_stage(
+            "save",
+            lambda: self.save_presentation(
+                summary,
+                presentation_content,
+                [SlideModel(**each) for each in slides],
+            ),
+        )
+        result = await run_stage(
+            "export",
+            lambda: self.export_presentation(
+                presentation_content.title, logging_service, log_metadata
+            ),
+        )
+        return PresentationPathAndEditPath(**result)
+
+    async def generate_summary(self) -> dict:
         summary = None
-        if documents_and_images_path.documents:
-            documents_loader = DocumentsLoader(documents_and_images_path.documents)
+        if self.document_paths:
+            documents_loader = DocumentsLoader(self.document_paths)
             await documents_loader.load_documents(self.temp_dir)
 
             print("-" * 40)
             print("Generating Document Summary")
             summary = await generate_document_summary(documents_loader.documents)
 
+        return {"summary": summary}
+
+    async def generate_outline(self, summary: Optional[str]) -> dict:
         print("-" * 40)
         print("Generating PPT Outline")
         presentation_content = await generate_ppt_content(
@@ -73,7 +150,11 @@ class GeneratePresentationHandler(FetchAssetsOnPresentationGenerationMixin):
             self.data.language,
             summary,
         )
+        return presentation_content.model_dump(mode="json")
 
+    async def generate_slides(
+        self, presentation_content: PresentationMarkdownModel
+    ) -> dict:
         print("-" * 40)
         print("Generating Presentation")
         presentation_text = await generate_presentation(
@@ -100,19 +181,25 @@ class GeneratePresentationHandler(FetchAssetsOnPresentationGenerationMixin):
             slide_model = SlideModel(**slide)
             slide_models.append(slide_model)
 
-        print("-" * 40)
-        print("Fetching Theme Colors")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"http://localhost/api/get-theme-from-name?theme={self.data.theme.value}",
-            ) as response:
-                self.theme = await response.json()
+        return {"slides": [each.model_dump(mode="json") for each in slide_models]}
 
+    async def fetch_theme(self) -> dict:
+        return {"theme": THEME_REGISTRY_SERVICE.get_theme(self.data.theme.value)}
+
+    async def fetch_assets(self, slide_models: List[SlideModel]) -> dict:
         print("-" * 40)
         print("Fetching Slide Assets")
         async for result in self.fetch_slide_assets(slide_models):
             print(result)
 
+        return {"slides": [each.model_dump(mode="json") for each in slide_models]}
+
+    async def save_presentation(
+        self,
+        summary: Optional[str],
+        presentation_content: PresentationMarkdownModel,
+        slide_models: List[SlideModel],
+    ) -> dict:
         slide_sql_models = [
             SlideSqlModel(**each.model_dump(mode="json")) for each in slide_models
         ]
@@ -130,21 +217,32 @@ class GeneratePresentationHandler(FetchAssetsOnPresentationGenerationMixin):
         )
 
         with get_sql_session() as sql_session:
-            sql_session.add(presentation)
+            # ? A resumed job may have saved before its checkpoint was stored
+            sql_session.exec(
+                delete(SlideSqlModel).where(
+                    SlideSqlModel.presentation == self.presentation_id
+                )
+            )
+            sql_session.merge(presentation)
             sql_session.add_all(slide_sql_models)
             sql_session.commit()
-            for each in slide_sql_models:
-                sql_session.refresh(each)
 
+        return {}
+
+    async def export_presentation(
+        self,
+        title: str,
+        logging_service: LoggingService,
+        log_metadata: LogMetadata,
+    ) -> dict:
         if self.data.export_as == "pptx":
             print("-" * 40)
             print("Fetching Slide Metadata for Export")
             async with aiohttp.ClientSession() as session:
                 async with session.post(
-                    f"http://localhost/api/slide-metadata",
+                    f"{get_nextjs_url()}/api/slide-metadata",
                     json={
                         "id": self.presentation_id,
-                       
                     },
                 ) as response:
                     export_request_body = await response.json()
@@ -165,10 +263,10 @@ class GeneratePresentationHandler(FetchAssetsOnPresentationGenerationMixin):
 
             async with aiohttp.ClientSession() as session:
                 async with session.post(
-                    f"http://localhost/api/export-as-pdf",
+                    f"{get_nextjs_url()}/api/export-as-pdf",
                     json={
                         "id": self.presentation_id,
-                        "title": presentation_content.title,
+                        "title": title,
                     },
                 ) as response:
                     response_json = await response.json()
@@ -182,4 +280,33 @@ class GeneratePresentationHandler(FetchAssetsOnPresentationGenerationMixin):
         return PresentationPathAndEditPath(
             **presentation_and_path.model_dump(),
             edit_path=f"/presentation?id={self.presentation_id}",
+        ).model_dump(mode="json")
+
+
+def validate_llm_supports_presentation_generation():
+    if is_ollama_selected() or is_custom_llm_selected():
+        raise HTTPException(
+            status_code=400,
+            detail="Ollama is not currently supported for this endpoint",
         )
+
+
+async def run_presentation_generation_job(
+    job: GenerationJobSqlModel, on_checkpoint: CheckpointCallback
+) -> dict:
+    request_utils = RequestUtils("/api/v1/ppt/generate/presentation/jobs")
+    logging_service, log_metadata = await request_utils.initialize_logger(
+        presentation_id=job.presentation_id,
+    )
+    handler = GeneratePresentationHandler(
+        job.presentation_id,
+        GeneratePresentationOptions(**job.request),
+        job.request.get("documents") or [],
+    )
+    result = await handler.run(
+        logging_service,
+        log_metadata,
+        checkpoints=job.checkpoints,
+        on_checkpoint=on_checkpoint,
+    )
+    return result.model_dump(mode="json")
@@ -0,0 +1,88 @@
+import asyncio
+import json
+import os
+import uuid
+
+from fastapi.responses import StreamingResponse
+
+from api.models import LogMetadata
+from api.routers.presentation.handlers.generate_presentation import (
+    GeneratePresentationHandler,
+    validate_llm_supports_presentation_generation,
+)
+from api.routers.presentation.models import (
+    GeneratePresentationBatchRequest,
+    GeneratePresentationOptions,
+)
+from api.services.logging import LoggingService
+
+# Shared by every batch request, so concurrent batches split the same budget
+BATCH_GENERATION_SEMAPHORE = asyncio.Semaphore(
+    max(1, int(os.getenv("BATCH_GENERATION_CONCURRENCY", "4")))
+)
+
+
+class GeneratePresentationBatchHandler:
+
+    def __init__(self, data: GeneratePresentationBatchRequest):
+        self.data = data
+
+    async def post(self, logging_service: LoggingService, log_metadata: LogMetadata):
+        validate_llm_supports_presentation_generation()
+
+        logging_service.logger.info(
+            logging_service.message(self.data.model_dump(mode="json")),
+            extra=log_metadata.model_dump(),
+        )
+
+        return StreamingResponse(
+            self.get_stream(logging_service, log_metadata),
+            media_type="application/x-ndjson",
+        )
+
+    async def get_stream(
+        self, logging_service: LoggingService, log_metadata: LogMetadata
+    ):
+        tasks = [
+            asyncio.create_task(
+                self.generate_item(index, each, logging_service, log_metadata)
+            )
+            for index, each in enumerate(self.data.items)
+        ]
+        try:
+            # Results are streamed in completion order, not request order
+            for task in asyncio.as_completed(tasks):
+                yield json.dumps(await task) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def generate_item(
+        self,
+        index: int,
+        data: GeneratePresentationOptions,
+        logging_service: LoggingService,
+        log_metadata: LogMetadata,
+    ) -> dict:
+        presentation_id = str(uuid.uuid4())
+        async with BATCH_GENERATION_SEMAPHORE:
+            try:
+                result = await GeneratePresentationHandler(
+                    presentation_id, data, []
+                ).run(logging_service, log_metadata)
+            except Exception as e:
+                error = getattr(e, "detail", None) or str(e)
+                print(f"Error generating batch item {index}: {error}")
+                return {
+                    "index": index,
+                    "presentation_id": presentation_id,
+                    "status": "failed",
+                    "error": str(error),
+                }
+
+        return {
+            "index": index,
+            "presentation_id": presentation_id,
+            "status": "completed",
+            "result": result.model_dump(mode="json"),
+        }
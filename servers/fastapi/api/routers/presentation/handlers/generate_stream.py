@@ -1,11 +1,19 @@
+import asyncio
 import json
+import os
 from typing import List
 
 from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
 from sqlmodel import delete
 
-from api.models import LogMetadata, SSECompleteResponse, SSEResponse, SSEStatusResponse
+from api.models import (
+    LogMetadata,
+    SSECompleteResponse,
+    SSEResponse,
+    SSESlideCompleteResponse,
+    SSEStatusResponse,
+)
 
 from api.routers.presentation.mixins.fetch_assets_on_generation import (
     FetchAssetsOnPresentationGenerationMixin,
@@ -26,10 +34,10 @@ from ppt_config_generator.models import (
 from ppt_generator.generator import generate_presentation_stream
 from ppt_generator.models.llm_models import (
     LLM_CONTENT_TYPE_MAPPING,
-    LLMPresentationModel,
     LLMSlideModel,
 )
 from ppt_generator.models.slide_model import SlideModel
+from ppt_generator.presentation_stream_parser import PresentationStreamParser
 from api.services.instances import TEMP_FILE_SERVICE
 
 from ppt_generator.slide_generator import get_slide_content_from_type_and_outline
@@ -43,6 +51,7 @@ class PresentationGenerateStreamHandler(FetchAssetsOnPresentationGenerationMixin
 
         self.temp_dir = TEMP_FILE_SERVICE.create_temp_dir(self.session)
         self.presentation_dir = get_presentation_dir(self.presentation_id)
+        self.init_slide_assets_tasks()
 
     def __del__(self):
         TEMP_FILE_SERVICE.cleanup_temp_dir(self.temp_dir)
@@ -96,27 +105,21 @@ class PresentationGenerateStreamHandler(FetchAssetsOnPresentationGenerationMixin
             event="response", data=json.dumps({"status": "Analyzing information 📊"})
         ).to_string()
 
-        self.presentation_json = None
+        # Filled slide by slide through on_slide_complete as the generator runs
+        self.slide_models: List[SlideModel] = []
 
-        # self.presentation_json will be mutated by the generator
         if is_ollama_selected() or is_custom_llm_selected():
-            async for result in self.generate_presentation_ollama_custom():
-                yield result
+            generator = self.generate_presentation_ollama_custom()
         else:
-            async for result in self.generate_presentation_openai_google():
+            generator = self.generate_presentation_openai_google()
+        try:
+            async for result in generator:
                 yield result
+        except BaseException:
+            self.cancel_fetching_slide_assets()
+            raise
 
-        slide_models: List[SlideModel] = []
-        for i, slide in enumerate(self.presentation_json["slides"]):
-            slide["index"] = i
-            slide["presentation"] = self.presentation.id
-            slide["content"] = (
-                LLM_CONTENT_TYPE_MAPPING[slide["type"]](**slide["content"])
-                .to_content()
-                .model_dump(mode="json")
-            )
-            slide_model = SlideModel(**slide)
-            slide_models.append(slide_model)
+        slide_models = self.slide_models
 
         async for result in self.fetch_slide_assets(slide_models):
             yield result
@@ -139,8 +142,24 @@ class PresentationGenerateStreamHandler(FetchAssetsOnPresentationGenerationMixin
 
         yield SSECompleteResponse(key="presentation", value=response).to_string()
 
+    def on_slide_complete(self, index: int, slide: dict) -> str:
+        slide["index"] = index
+        slide["presentation"] = self.presentation.id
+        slide["content"] = (
+            LLM_CONTENT_TYPE_MAPPING[slide["type"]](**slide["content"])
+            .to_content()
+            .model_dump(mode="json")
+        )
+        slide_model = SlideModel(**slide)
+        self.slide_models.append(slide_model)
+        self.start_fetching_slide_assets(slide_model)
+
+        return SSESlideCompleteResponse(
+            index=index, slide=slide_model.model_dump(mode="json")
+        ).to_string()
+
     async def generate_presentation_openai_google(self):
-        presentation_text = ""
+        parser = PresentationStreamParser()
         async for event in await generate_presentation_stream(
             PresentationMarkdownModel(
                 title=self.title,
@@ -153,55 +172,78 @@ class PresentationGenerateStreamHandler(FetchAssetsOnPresentationGenerationMixin
             if chunk is None:
                 continue
 
-            presentation_text += chunk
-
             yield SSEResponse(
                 event="response",
                 data=json.dumps({"type": "chunk", "chunk": chunk}),
             ).to_string()
 
-        self.presentation_json = json.loads(presentation_text)
+            for slide in parser.feed(chunk):
+                yield self.on_slide_complete(len(self.slide_models), slide)
+
+        # ? Parsing the full document also validates it, and picks up any
+        # ? slide that was not detected while streaming
+        slides = parser.parse()["slides"]
+        for slide in slides[len(self.slide_models) :]:
+            yield self.on_slide_complete(len(self.slide_models), slide)
 
     async def generate_presentation_ollama_custom(self):
         presentation_structure = PresentationStructureModel(
             **self.presentation.structure
         )
-        slide_models = []
         yield SSEResponse(
             event="response",
             data=json.dumps({"type": "chunk", "chunk": '{ "slides": [ '}),
         ).to_string()
         n_slides = len(presentation_structure.slides)
-        for i, slide_structure in enumerate(presentation_structure.slides):
-            # Informing about the start of the slide
-            # This is to make sure that the client renders slide n
-            # when it receives start chunk of slide n + 1
-            yield SSEResponse(
-                event="response",
-                data=json.dumps({"type": "chunk", "chunk": "{"}),
-            ).to_string()
 
-            slide_content = await get_slide_content_from_type_and_outline(
-                slide_structure.type, self.outlines[i]
-            )
-            slide_model = LLMSlideModel(
-                type=slide_structure.type,
-                content=slide_content.model_dump(mode="json"),
+        # ? Slides are generated concurrently but flushed in order, so a slide
+        # ? is sent as soon as it and every slide before it are ready
+        semaphore = asyncio.Semaphore(
+            max(1, int(os.getenv("SLIDE_GENERATION_CONCURRENCY", "4")))
+        )
+
+        async def generate_slide(slide_type: int, outline):
+            async with semaphore:
+                return await get_slide_content_from_type_and_outline(
+                    slide_type, outline
+                )
+
+        slide_tasks = [
+            asyncio.create_task(
+                generate_slide(slide_structure.type, self.outlines[i])
             )
-            slide_models.append(slide_model)
-            chunk = json.dumps(slide_model.model_dump(mode="json"))
+            for i, slide_structure in enumerate(presentation_structure.slides)
+        ]
+        try:
+            for i, slide_structure in enumerate(presentation_structure.slides):
+                # Informing about the start of the slide
+                # This is to make sure that the client renders slide n
+                # when it receives start chunk of slide n + 1
+                yield SSEResponse(
+                    event="response",
+                    data=json.dumps({"type": "chunk", "chunk": "{"}),
+                ).to_string()
+
+                slide_content = await slide_tasks[i]
+                slide_model = LLMSlideModel(
+                    type=slide_structure.type,
+                    content=slide_content.model_dump(mode="json"),
+                )
+                chunk = json.dumps(slide_model.model_dump(mode="json"))
+
+                if i < n_slides - 1:
+                    chunk += ","
+                yield SSEResponse(
+                    event="response",
+                    data=json.dumps({"type": "chunk", "chunk": chunk[1:]}),
+                ).to_string()
+                yield self.on_slide_complete(i, slide_model.model_dump(mode="json"))
+        finally:
+            # Stop pending slides if generation failed or the client went away
+            for task in slide_tasks:
+                task.cancel()
 
-            if i < n_slides - 1:
-                chunk += ","
-            yield SSEResponse(
-                event="response",
-                data=json.dumps({"type": "chunk", "chunk": chunk[1:]}),
-            ).to_string()
         yield SSEResponse(
             event="response",
             data=json.dumps({"type": "chunk", "chunk": " ] }"}),
         ).to_string()
-
-        self.presentation_json = LLMPresentationModel(
-            slides=slide_models,
-        ).model_dump(mode="json")
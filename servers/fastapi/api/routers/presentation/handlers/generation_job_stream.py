@@ -0,0 +1,46 @@
+import json
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from api.models import LogMetadata, SSECompleteResponse, SSEResponse
+from api.routers.presentation.models import GenerationJobResponse
+from api.services.generation_jobs import JOB_TERMINAL_STATUSES
+from api.services.instances import GENERATION_JOB_SERVICE
+from api.services.logging import LoggingService
+
+
+class GenerationJobStreamHandler:
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+
+    async def get(self, logging_service: LoggingService, log_metadata: LogMetadata):
+        job = GENERATION_JOB_SERVICE.get_job(self.job_id)
+        if not job:
+            raise HTTPException(404, "Job not found")
+
+        return StreamingResponse(self.get_stream(), media_type="text/event-stream")
+
+    async def get_stream(self):
+        queue = GENERATION_JOB_SERVICE.subscribe(self.job_id)
+        try:
+            # ? Subscribed before reading the current state so no update is missed
+            job = GENERATION_JOB_SERVICE.get_job(self.job_id)
+            while True:
+                response = GenerationJobResponse.from_sql_model(job)
+                if job.status in JOB_TERMINAL_STATUSES:
+                    yield SSECompleteResponse(
+                        key="job", value=response.model_dump(mode="json")
+                    ).to_string()
+                    break
+
+                yield SSEResponse(
+                    event="response",
+                    data=json.dumps(
+                        {"type": "progress", **response.model_dump(mode="json")}
+                    ),
+                ).to_string()
+                job = await queue.get()
+        finally:
+            GENERATION_JOB_SERVICE.unsubscribe(self.job_id, queue)
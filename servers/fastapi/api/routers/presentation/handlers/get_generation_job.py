@@ -0,0 +1,19 @@
+from fastapi import HTTPException
+
+from api.models import LogMetadata
+from api.routers.presentation.models import GenerationJobResponse
+from api.services.instances import GENERATION_JOB_SERVICE
+from api.services.logging import LoggingService
+
+
+class GetGenerationJobHandler:
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+
+    async def get(self, logging_service: LoggingService, log_metadata: LogMetadata):
+        job = GENERATION_JOB_SERVICE.get_job(self.job_id)
+        if not job:
+            raise HTTPException(404, "Job not found")
+
+        return GenerationJobResponse.from_sql_model(job)
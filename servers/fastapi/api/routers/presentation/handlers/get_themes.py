@@ -0,0 +1,12 @@
+from api.models import LogMetadata
+from api.services.instances import THEME_REGISTRY_SERVICE
+from api.services.logging import LoggingService
+
+
+class GetThemesHandler:
+
+    async def get(self, logging_service: LoggingService, log_metadata: LogMetadata):
+        return [
+            THEME_REGISTRY_SERVICE.get_theme(name)
+            for name in THEME_REGISTRY_SERVICE.get_themes()
+        ]
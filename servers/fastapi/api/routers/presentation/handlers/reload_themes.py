@@ -0,0 +1,17 @@
+from api.models import LogMetadata
+from api.services.instances import THEME_REGISTRY_SERVICE
+from api.services.logging import LoggingService
+from ppt_generator.icon_variants import get_icon_variant_cache
+
+
+class ReloadThemesHandler:
+
+    async def post(self, logging_service: LoggingService, log_metadata: LogMetadata):
+        themes = THEME_REGISTRY_SERVICE.reload()
+        get_icon_variant_cache().start_warming(THEME_REGISTRY_SERVICE.get_icon_colors())
+
+        logging_service.logger.info(
+            logging_service.message({"themes": themes}),
+            extra=log_metadata.model_dump(),
+        )
+        return themes
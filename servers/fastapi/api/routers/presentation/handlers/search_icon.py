@@ -1,13 +1,13 @@
-import uuid
+from fastapi import HTTPException
+
 from api.models import LogMetadata
 from api.routers.presentation.models import (
-    PresentationAndPaths,
+    IconSearchResponse,
     SearchIconRequest,
 )
 from api.services.logging import LoggingService
 from image_processor.icons_finder import get_icons
-from api.services.instances import TEMP_FILE_SERVICE
-from image_processor.icons_vectorstore_utils import get_icons_vectorstore
+from image_processor.icons_index import InvalidIconCursorError
 
 
 class SearchIconHandler:
@@ -15,9 +15,6 @@ class SearchIconHandler:
     def __init__(self, data: SearchIconRequest):
         self.data = data
 
-        self.session = str(uuid.uuid4())
-        self.temp_dir = TEMP_FILE_SERVICE.create_temp_dir(self.session)
-
     async def post(self, logging_service: LoggingService, log_metadata: LogMetadata):
 
         logging_service.logger.info(
@@ -25,19 +22,21 @@ class SearchIconHandler:
             extra=log_metadata.model_dump(),
         )
 
-        vector_store = get_icons_vectorstore()
-
-        icon_paths = await get_icons(
-            vector_store,
-            self.data.query or "",
-            self.data.page,
-            self.data.limit,
-            self.data.category,
-            self.temp_dir,
-        )
-
-        response = PresentationAndPaths(
-            presentation_id=self.data.presentation_id, paths=icon_paths
+        try:
+            icon_paths, next_cursor = await get_icons(
+                self.data.query or "",
+                self.data.limit,
+                self.data.category,
+                self.data.page,
+                self.data.cursor,
+            )
+        except InvalidIconCursorError as e:
+            raise HTTPException(400, str(e))
+
+        response = IconSearchResponse(
+            presentation_id=self.data.presentation_id,
+            paths=icon_paths,
+            next_cursor=next_cursor,
         )
 
         logging_service.logger.info(
@@ -1,58 +1,122 @@
 import asyncio
-from typing import List
+from typing import Dict, List, Tuple
 
-from api.models import SSEStatusResponse
+from api.models import SSEAssetFetchedResponse, SSEStatusResponse
+from api.services.instances import THEME_REGISTRY_SERVICE
 from api.utils.utils import get_presentation_images_dir
-from image_processor.icons_finder import get_icon
-from image_processor.icons_vectorstore_utils import get_icons_vectorstore
+from image_processor.icons_finder import get_icons_for_slides
 from image_processor.images_finder import generate_image
 from ppt_generator.models.slide_model import SlideModel
 from ppt_generator.slide_model_utils import SlideModelUtils
 
 
-class FetchAssetsOnPresentationGenerationMixin:
+async def get_batch_result(batch_task: asyncio.Task, *indices: int):
+    result = await batch_task
+    for index in indices:
+        result = result[index]
+    return result
 
-    async def fetch_slide_assets(self, slide_models: List[SlideModel]):
-        image_prompts = []
-        icon_queries = []
 
+class FetchAssetsOnPresentationGenerationMixin:
+
+    def init_slide_assets_tasks(self):
+        # slide index -> (image tasks, icon tasks)
+        self.slide_assets_tasks: Dict[
+            int, Tuple[List[asyncio.Task], List[asyncio.Task]]
+        ] = {}
+
+    def start_fetching_slide_assets(self, slide_model: SlideModel):
+        # ? Called as soon as a slide is complete, so assets are fetched
+        # ? while the rest of the presentation is still being generated
+        self.start_fetching_slides_assets([slide_model])
+
+    def start_fetching_slides_assets(self, slide_models: List[SlideModel]):
+        slide_models = [
+            each for each in slide_models if each.index not in self.slide_assets_tasks
+        ]
+
+        # slide index -> (image prompts, icon queries)
+        slide_assets = {}
+        theme_prompt = THEME_REGISTRY_SERVICE.get_prompt((self.theme or {}).get("name"))
         for each_slide_model in slide_models:
-            slide_model_utils = SlideModelUtils(self.theme, each_slide_model)
-            image_prompts.extend(slide_model_utils.get_image_prompts())
-            icon_queries.extend(slide_model_utils.get_icon_queries())
+            slide_model_utils = SlideModelUtils(
+                self.theme, each_slide_model, theme_prompt
+            )
+            slide_assets[each_slide_model.index] = (
+                slide_model_utils.get_image_prompts(),
+                slide_model_utils.get_icon_queries(),
+            )
 
-        if icon_queries:
-            icon_vector_store = get_icons_vectorstore()
+        slides_icon_queries = [each for _, each in slide_assets.values()]
+
+        # ? Icons of all these slides are searched as one batch, each icon
+        # ? still gets its own task for progress events
+        icons_task = None
+        if any(slides_icon_queries):
+            icons_task = asyncio.create_task(get_icons_for_slides(slides_icon_queries))
 
         images_directory = get_presentation_images_dir(self.presentation_id)
 
-        coroutines = [
-            generate_image(
-                each,
-                images_directory,
+        for slide_position, slide_index in enumerate(slide_assets):
+            image_prompts, slide_icon_queries = slide_assets[slide_index]
+            self.slide_assets_tasks[slide_index] = (
+                [
+                    asyncio.create_task(generate_image(each, images_directory))
+                    for each in image_prompts
+                ],
+                [
+                    asyncio.create_task(
+                        get_batch_result(icons_task, slide_position, index)
+                    )
+                    for index in range(len(slide_icon_queries))
+                ],
             )
-            for each in image_prompts
-        ] + [get_icon(icon_vector_store, each) for each in icon_queries]
-
-        assets_future = asyncio.gather(*coroutines)
-
-        while not assets_future.done():
-            status = SSEStatusResponse(status="Fetching slide assets").to_string()
-            yield status
-            await asyncio.sleep(5)
 
-        assets = await assets_future
+    def cancel_fetching_slide_assets(self):
+        for image_tasks, icon_tasks in self.slide_assets_tasks.values():
+            for task in image_tasks + icon_tasks:
+                task.cancel()
 
-        image_prompts_len = len(image_prompts)
-
-        images = assets[:image_prompts_len]
-        icons = assets[image_prompts_len:]
+    async def fetch_slide_assets(self, slide_models: List[SlideModel]):
+        self.start_fetching_slides_assets(slide_models)
 
+        # task -> (slide index, kind)
+        pending = {}
         for each_slide_model in slide_models:
-            each_slide_model.images = images[: each_slide_model.images_count]
-            images = images[each_slide_model.images_count :]
+            image_tasks, icon_tasks = self.slide_assets_tasks[each_slide_model.index]
+            for each in image_tasks:
+                pending[each] = (each_slide_model.index, "image")
+            for each in icon_tasks:
+                pending[each] = (each_slide_model.index, "icon")
+
+        total = len(pending)
+        done_count = 0
+        if total:
+            yield SSEStatusResponse(status="Fetching slide assets").to_string()
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    set(pending), return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    slide_index, kind = pending.pop(task)
+                    # Raise asset errors here, like gather would
+                    task.result()
+                    done_count += 1
+                    yield SSEAssetFetchedResponse(
+                        slide_index=slide_index,
+                        kind=kind,
+                        done=done_count,
+                        total=total,
+                    ).to_string()
+        except BaseException:
+            self.cancel_fetching_slide_assets()
+            raise
 
-            each_slide_model.icons = icons[: each_slide_model.icons_count]
-            icons = icons[each_slide_model.icons_count :]
+        for each_slide_model in slide_models:
+            image_tasks, icon_tasks = self.slide_assets_tasks[each_slide_model.index]
+            each_slide_model.images = [each.result() for each in image_tasks]
+            each_slide_model.icons = [each.result() for each in icon_tasks]
 
         yield SSEStatusResponse(status="Slide assets fetched").to_string()
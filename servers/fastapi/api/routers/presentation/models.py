@@ -6,13 +6,20 @@ from pydantic import BaseModel, Field
 
 from api.models import OllamaModelMetadata
 from ppt_config_generator.models import SlideMarkdownModel
-from ppt_generator.models.pptx_models import PptxPresentationModel
+from ppt_generator.models.pptx_models import (
+    PptxPresentationModel,
+    PptxRendererEnum,
+)
 from ppt_generator.models.query_and_prompt_models import (
     IconCategoryEnum,
     ImagePromptWithThemeAndAspectRatio,
 )
 from ppt_generator.models.slide_model import SlideModel
-from api.sql_models import PresentationSqlModel, SlideSqlModel
+from api.sql_models import (
+    GenerationJobSqlModel,
+    PresentationSqlModel,
+    SlideSqlModel,
+)
 from ollama._types import ModelDetails
 
 
@@ -79,6 +86,8 @@ class SearchIconRequest(BaseModel):
     category: Optional[IconCategoryEnum] = None
     page: int = 1
     limit: int = 10
+    # Returned as next_cursor by the previous page, takes precedence over page
+    cursor: Optional[str] = None
 
 
 class SlideEditRequest(BaseModel):
@@ -106,6 +115,12 @@ class UpdatePresentationThemeRequest(BaseModel):
 class ExportAsRequest(BaseModel):
     presentation_id: str
     pptx_model: PptxPresentationModel
+    renderer: PptxRendererEnum = PptxRendererEnum.PYTHON_PPTX
+
+
+class ExportAsStreamRequest(ExportAsRequest):
+    # Also writes the package to the presentation directory while streaming
+    save_to_disk: bool = False
 
 
 class DecomposeDocumentsResponse(BaseModel):
@@ -149,6 +164,10 @@ class PresentationAndPaths(BaseModel):
     paths: List[str]
 
 
+class IconSearchResponse(PresentationAndPaths):
+    next_cursor: Optional[str] = None
+
+
 class PresentationPathAndEditPath(PresentationAndPath):
     edit_path: str
 
@@ -158,15 +177,46 @@ class UpdatePresentationTitlesRequest(BaseModel):
     titles: List[str]
 
 
-class GeneratePresentationRequest(BaseModel):
+class GeneratePresentationOptions(BaseModel):
     prompt: str
     n_slides: int = Field(default=8, ge=5, le=15)
     language: str = Field(default="English")
     theme: ThemeEnum = Field(default=ThemeEnum.LIGHT)
-    documents: Optional[List[UploadFile]] = None
     export_as: Literal["pptx", "pdf"] = Field(default="pptx")
 
 
+class GeneratePresentationRequest(GeneratePresentationOptions):
+    documents: Optional[List[UploadFile]] = None
+
+
+class GeneratePresentationBatchRequest(BaseModel):
+    items: List[GeneratePresentationOptions] = Field(min_length=1)
+
+
+class GenerationJobResponse(BaseModel):
+    id: str
+    status: str
+    stage: Optional[str] = None
+    presentation_id: str
+    result: Optional[PresentationPathAndEditPath] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_sql_model(cls, job: GenerationJobSqlModel):
+        return cls(
+            id=job.id,
+            status=job.status,
+            stage=job.stage,
+            presentation_id=job.presentation_id,
+            result=job.result,
+            error=job.error,
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+        )
+
+
 class OllamaModelStatusResponse(BaseModel):
     name: str
     size: Optional[int] = None
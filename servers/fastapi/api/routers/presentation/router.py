@@ -12,7 +12,13 @@ from api.routers.presentation.handlers.delete_presentation import (
 )
 from api.routers.presentation.handlers.delete_slide import DeleteSlideHandler
 from api.routers.presentation.handlers.edit import PresentationEditHandler
+from api.routers.presentation.handlers.enqueue_generation_job import (
+    EnqueueGenerationJobHandler,
+)
 from api.routers.presentation.handlers.export_as_pptx import ExportAsPptxHandler
+from api.routers.presentation.handlers.export_as_pptx_stream import (
+    ExportAsPptxStreamHandler,
+)
 from api.routers.presentation.handlers.generate_data import (
     PresentationGenerateDataHandler,
 )
@@ -20,6 +26,9 @@ from api.routers.presentation.handlers.generate_image import GenerateImageHandle
 from api.routers.presentation.handlers.generate_presentation import (
     GeneratePresentationHandler,
 )
+from api.routers.presentation.handlers.generate_presentation_batch import (
+    GeneratePresentationBatchHandler,
+)
 from api.routers.presentation.handlers.generate_presentation_requirements import (
     GeneratePresentationRequirementsHandler,
 )
@@ -29,11 +38,18 @@ from api.routers.presentation.handlers.generate_research_report import (
 from api.routers.presentation.handlers.generate_stream import (
     PresentationGenerateStreamHandler,
 )
+from api.routers.presentation.handlers.generation_job_stream import (
+    GenerationJobStreamHandler,
+)
 from api.routers.presentation.handlers.generate_outlines import (
     PresentationOutlinesGenerateHandler,
 )
+from api.routers.presentation.handlers.get_generation_job import (
+    GetGenerationJobHandler,
+)
 from api.routers.presentation.handlers.get_presentation import GetPresentationHandler
 from api.routers.presentation.handlers.get_presentations import GetPresentationsHandler
+from api.routers.presentation.handlers.get_themes import GetThemesHandler
 from api.routers.presentation.handlers.list_available_custom_models import (
     ListAvailableCustomModelsHandler,
 )
@@ -44,6 +60,7 @@ from api.routers.presentation.handlers.list_supported_ollama_models import (
     ListSupportedOllamaModelsHandler,
 )
 from api.routers.presentation.handlers.pull_ollama_model import PullOllamaModelHandler
+from api.routers.presentation.handlers.reload_themes import ReloadThemesHandler
 from api.routers.presentation.handlers.search_icon import SearchIconHandler
 from api.routers.presentation.handlers.search_image import SearchImageHandler
 from api.routers.presentation.handlers.update_parsed_document import (
@@ -65,16 +82,20 @@ from api.routers.presentation.models import (
     DocumentsAndImagesPath,
     EditPresentationSlideRequest,
     ExportAsRequest,
+    ExportAsStreamRequest,
     GenerateImageRequest,
+    GeneratePresentationBatchRequest,
     GeneratePresentationRequest,
     GeneratePresentationRequirementsRequest,
     GenerateResearchReportRequest,
+    GenerationJobResponse,
     OllamaModelStatusResponse,
     OllamaSupportedModelsResponse,
     PresentationAndPath,
     PresentationAndPaths,
     PresentationAndSlides,
     GenerateOutlinesRequest,
+    IconSearchResponse,
     PresentationAndUrls,
     PresentationGenerateRequest,
     PresentationPathAndEditPath,
@@ -217,6 +238,22 @@ async def presentation_generation_stream(presentation_id: str, session: str):
     )
 
 
+@presentation_router.get("/themes", response_model=List[dict])
+async def get_themes():
+    request_utils = RequestUtils(f"{route_prefix}/themes")
+    logging_service, log_metadata = await request_utils.initialize_logger()
+    return await handle_errors(GetThemesHandler().get, logging_service, log_metadata)
+
+
+@presentation_router.post("/themes/reload", response_model=List[str])
+async def reload_themes():
+    request_utils = RequestUtils(f"{route_prefix}/themes/reload")
+    logging_service, log_metadata = await request_utils.initialize_logger()
+    return await handle_errors(
+        ReloadThemesHandler().post, logging_service, log_metadata
+    )
+
+
 @presentation_router.post("/presentation/thumbnail", response_model=PresentationAndPath)
 async def update_presentation(
     presentation_id: Annotated[str, Body()],
@@ -294,7 +331,7 @@ async def search_image(data: SearchImageRequest):
     )
 
 
-@presentation_router.post("/icon/search", response_model=PresentationAndPaths)
+@presentation_router.post("/icon/search", response_model=IconSearchResponse)
 async def search_icon(data: SearchIconRequest):
     request_utils = RequestUtils(f"{route_prefix}/icon/search")
     logging_service, log_metadata = await request_utils.initialize_logger(
@@ -318,6 +355,17 @@ async def export_as_pptx(data: ExportAsRequest):
     )
 
 
+@presentation_router.post("/presentation/export_as_pptx/stream")
+async def export_as_pptx_stream(data: ExportAsStreamRequest):
+    request_utils = RequestUtils(f"{route_prefix}/presentation/export_as_pptx/stream")
+    logging_service, log_metadata = await request_utils.initialize_logger(
+        presentation_id=data.presentation_id,
+    )
+    return await handle_errors(
+        ExportAsPptxStreamHandler(data).post, logging_service, log_metadata
+    )
+
+
 @presentation_router.delete("/delete", status_code=204)
 async def delete_presentation(presentation_id: str):
     request_utils = RequestUtils(f"{route_prefix}/delete")
@@ -357,6 +405,56 @@ async def generate_presentation(data: Annotated[GeneratePresentationRequest, For
     )
 
 
+@presentation_router.post("/generate/presentation/batch")
+async def generate_presentation_batch(data: GeneratePresentationBatchRequest):
+    request_utils = RequestUtils(f"{route_prefix}/generate/presentation/batch")
+    logging_service, log_metadata = await request_utils.initialize_logger()
+    return await handle_errors(
+        GeneratePresentationBatchHandler(data).post,
+        logging_service,
+        log_metadata,
+    )
+
+
+@presentation_router.post(
+    "/generate/presentation/jobs", response_model=GenerationJobResponse
+)
+async def enqueue_presentation_generation(
+    data: Annotated[GeneratePresentationRequest, Form()],
+):
+    presentation_id = str(uuid.uuid4())
+
+    request_utils = RequestUtils(f"{route_prefix}/generate/presentation/jobs")
+    logging_service, log_metadata = await request_utils.initialize_logger(
+        presentation_id=presentation_id,
+    )
+    return await handle_errors(
+        EnqueueGenerationJobHandler(presentation_id, data).post,
+        logging_service,
+        log_metadata,
+    )
+
+
+@presentation_router.get(
+    "/generate/presentation/jobs/{job_id}", response_model=GenerationJobResponse
+)
+async def get_presentation_generation_job(job_id: str):
+    request_utils = RequestUtils(f"{route_prefix}/generate/presentation/jobs")
+    logging_service, log_metadata = await request_utils.initialize_logger()
+    return await handle_errors(
+        GetGenerationJobHandler(job_id).get, logging_service, log_metadata
+    )
+
+
+@presentation_router.get("/generate/presentation/jobs/{job_id}/stream")
+async def presentation_generation_job_stream(job_id: str):
+    request_utils = RequestUtils(f"{route_prefix}/generate/presentation/jobs/stream")
+    logging_service, log_metadata = await request_utils.initialize_logger()
+    return await handle_errors(
+        GenerationJobStreamHandler(job_id).get, logging_service, log_metadata
+    )
+
+
 # Ollama Support
 @presentation_router.get(
     "/ollama/list-supported-models", response_model=OllamaSupportedModelsResponse
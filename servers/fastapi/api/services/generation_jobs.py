@@ -0,0 +1,158 @@
+import asyncio
+import os
+import shutil
+import traceback
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from api.services import database
+from api.sql_models import GenerationJobSqlModel
+
+
+JOB_TERMINAL_STATUSES = ("completed", "failed")
+
+# (job, checkpoint callback) -> result
+GenerationJobRunner = Callable[
+    [GenerationJobSqlModel, Callable[[str, dict], Awaitable[None]]], Awaitable[dict]
+]
+
+
+class GenerationJobService:
+    """
+    Persistent queue and bounded worker pool for presentation generation.
+
+    Jobs are stored in the database and every finished stage is saved as a
+    checkpoint, so jobs left queued or running when the server stopped are
+    picked up again on startup and continue from their last checkpoint.
+    """
+
+    def __init__(self, sql_engine: Optional[Engine] = None):
+        self.sql_engine = sql_engine or database.sql_engine
+        self.workers_count = max(1, int(os.getenv("GENERATION_WORKERS", "2")))
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._runner: Optional[GenerationJobRunner] = None
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+    def get_sql_session(self) -> Session:
+        return Session(self.sql_engine)
+
+    @staticmethod
+    def get_jobs_dir() -> str:
+        jobs_dir = os.path.join(os.getenv("APP_DATA_DIRECTORY"), "jobs")
+        os.makedirs(jobs_dir, exist_ok=True)
+        return jobs_dir
+
+    def get_job_dir(self, job_id: str) -> str:
+        job_dir = os.path.join(self.get_jobs_dir(), job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        return job_dir
+
+    async def start(self, runner: GenerationJobRunner):
+        self._runner = runner
+        self._queue = asyncio.Queue()
+
+        with self.get_sql_session() as sql_session:
+            interrupted = sql_session.exec(
+                select(GenerationJobSqlModel)
+                .where(GenerationJobSqlModel.status.in_(["queued", "running"]))
+                .order_by(GenerationJobSqlModel.created_at)
+            ).all()
+        for job in interrupted:
+            print(f"Resuming generation job {job.id} from stage {job.stage}")
+            self._queue.put_nowait(job.id)
+
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self.workers_count)
+        ]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def create_job(self, job_id: str, presentation_id: str, request: dict):
+        job = GenerationJobSqlModel(
+            id=job_id, presentation_id=presentation_id, request=request
+        )
+        with self.get_sql_session() as sql_session:
+            sql_session.add(job)
+            sql_session.commit()
+            sql_session.refresh(job)
+
+        self._queue.put_nowait(job.id)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[GenerationJobSqlModel]:
+        with self.get_sql_session() as sql_session:
+            return sql_session.get(GenerationJobSqlModel, job_id)
+
+    def update_job(self, job_id: str, **fields) -> GenerationJobSqlModel:
+        with self.get_sql_session() as sql_session:
+            job = sql_session.get(GenerationJobSqlModel, job_id)
+            for key, value in fields.items():
+                setattr(job, key, value)
+            job.updated_at = datetime.now()
+            sql_session.add(job)
+            sql_session.commit()
+            sql_session.refresh(job)
+
+        self._publish(job)
+        return job
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, []).append(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(job_id, [])
+        if queue in subscribers:
+            subscribers.remove(queue)
+        if not subscribers:
+            self._subscribers.pop(job_id, None)
+
+    def _publish(self, job: GenerationJobSqlModel):
+        for queue in self._subscribers.get(job.id, []):
+            queue.put_nowait(job)
+
+    async def _work(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except Exception:
+                # ? A broken job must not take its worker down with it
+                print(f"Error running generation job {job_id}")
+                traceback.print_exc()
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str):
+        checkpoints = {}
+
+        async def save_checkpoint(stage: str, data: dict):
+            checkpoints[stage] = data
+            self.update_job(job_id, stage=stage, checkpoints=dict(checkpoints))
+
+        try:
+            job = self.update_job(job_id, status="running")
+            checkpoints.update(job.checkpoints or {})
+
+            result = await self._runner(job, save_checkpoint)
+            self.update_job(job_id, status="completed", result=result)
+            shutil.rmtree(self.get_job_dir(job_id), ignore_errors=True)
+        except asyncio.CancelledError:
+            # ? Shutting down, the job stays running and resumes on startup
+            raise
+        except Exception as e:
+            traceback.print_exc()
+            error = getattr(e, "detail", None) or str(e)
+            try:
+                self.update_job(job_id, status="failed", error=str(error))
+            except Exception as e:
+                print(f"Could not mark generation job {job_id} as failed: {e}")
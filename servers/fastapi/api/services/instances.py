@@ -1,6 +1,16 @@
+from api.services.generation_jobs import GenerationJobService
+from api.services.llm_cache import LLMResponseCacheService
+from api.services.llm_client import LLMClientService
+from api.services.llm_scheduler import LLMSchedulerService
 from api.services.redis import RedisService
 from api.services.temp_file import TempFileService
+from api.services.theme_registry import ThemeRegistryService
 
 
 TEMP_FILE_SERVICE = TempFileService()
 REDIS_SERVICE = RedisService()
+LLM_CLIENT_SERVICE = LLMClientService()
+LLM_RESPONSE_CACHE_SERVICE = LLMResponseCacheService(REDIS_SERVICE)
+LLM_SCHEDULER_SERVICE = LLMSchedulerService()
+GENERATION_JOB_SERVICE = GenerationJobService()
+THEME_REGISTRY_SERVICE = ThemeRegistryService()
@@ -0,0 +1,280 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from api.services.redis import RedisService
+
+
+class LLMCacheBackend(ABC):
+    """
+    Blocking cache storage, LLMResponseCacheService calls it from a thread.
+    Errors are raised to the service, which counts them.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: int):
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class SqliteLLMCacheBackend(LLMCacheBackend):
+
+    def __init__(self, db_path: str, max_entries: int):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # ? Opened lazily because APP_DATA_DIRECTORY is created on startup
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_last_access "
+                "ON llm_cache (last_access)"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            connection = self._get_connection()
+            row = connection.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+            connection.commit()
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: int):
+        now = time.time()
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now),
+            )
+            connection.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            # Least recently used entries go first once the cache is full
+            connection.execute(
+                """
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY last_access DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            connection.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            connection = self._get_connection()
+            return connection.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute("DELETE FROM llm_cache")
+            connection.commit()
+
+
+class RedisLLMCacheBackend(LLMCacheBackend):
+    prefix = "llm_cache"
+
+    def __init__(self, redis_service: RedisService, max_entries: int):
+        # ? The client is used directly, RedisService swallows errors and
+        # ? has no pipelines
+        self.client = redis_service.client
+        self.max_entries = max_entries
+        self.lru_key = f"{self.prefix}/lru"
+        # ? Expiry times of the keys, redis expires the values but not the
+        # ? members of the lru set
+        self.expiry_key = f"{self.prefix}/expiry"
+
+    def get_value_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}"
+
+    def get(self, key: str) -> Optional[str]:
+        pipeline = self.client.pipeline()
+        pipeline.get(self.get_value_key(key))
+        # ? Only touches keys that are still in the lru set
+        pipeline.zadd(self.lru_key, {key: time.time()}, xx=True)
+        value, _ = pipeline.execute()
+
+        if value is None:
+            pipeline = self.client.pipeline()
+            pipeline.zrem(self.lru_key, key)
+            pipeline.zrem(self.expiry_key, key)
+            pipeline.execute()
+        return value
+
+    def set(self, key: str, value: str, ttl: int):
+        now = time.time()
+        pipeline = self.client.pipeline()
+        pipeline.set(self.get_value_key(key), value, ex=ttl)
+        pipeline.zadd(self.lru_key, {key: now})
+        pipeline.zadd(self.expiry_key, {key: now + ttl})
+        pipeline.zrangebyscore(self.expiry_key, "-inf", now)
+        pipeline.zcard(self.lru_key)
+        *_, expired, size = pipeline.execute()
+
+        overflow = size - len(expired) - self.max_entries
+        if not expired and overflow <= 0:
+            return
+
+        pipeline = self.client.pipeline()
+        if expired:
+            pipeline.zrem(self.lru_key, *expired)
+            pipeline.zrem(self.expiry_key, *expired)
+        if overflow > 0:
+            # Least recently used entries go first once the cache is full
+            pipeline.zrange(self.lru_key, 0, overflow - 1)
+        evicted = pipeline.execute()[-1] if overflow > 0 else []
+
+        if evicted:
+            pipeline = self.client.pipeline()
+            pipeline.delete(*[self.get_value_key(each) for each in evicted])
+            pipeline.zrem(self.lru_key, *evicted)
+            pipeline.zrem(self.expiry_key, *evicted)
+            pipeline.execute()
+
+    def count(self) -> int:
+        now = time.time()
+        expired = self.client.zrangebyscore(self.expiry_key, "-inf", now)
+        pipeline = self.client.pipeline()
+        if expired:
+            pipeline.zrem(self.lru_key, *expired)
+            pipeline.zrem(self.expiry_key, *expired)
+        pipeline.zcard(self.lru_key)
+        return pipeline.execute()[-1]
+
+    def clear(self):
+        keys = self.client.zrange(self.lru_key, 0, -1)
+        pipeline = self.client.pipeline()
+        if keys:
+            pipeline.delete(*[self.get_value_key(each) for each in keys])
+        pipeline.delete(self.lru_key, self.expiry_key)
+        pipeline.execute()
+
+
+class LLMResponseCacheService:
+    """
+    Content-addressed cache for LLM responses.
+
+    Keys are a hash of the full request (provider, model, messages,
+    temperature, response schema), so only byte-identical requests share an
+    entry. The backend is selected with LLM_CACHE_BACKEND (sqlite, redis or
+    disabled).
+    """
+
+    def __init__(self, redis_service: RedisService):
+        self.backend_name = os.getenv("LLM_CACHE_BACKEND", "sqlite").lower()
+        self.ttl = int(os.getenv("LLM_CACHE_TTL", "86400"))
+        self.max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+        self.backend: Optional[LLMCacheBackend] = None
+        if self.backend_name == "sqlite":
+            self.backend = SqliteLLMCacheBackend(
+                os.getenv("LLM_CACHE_PATH")
+                or os.path.join(os.getenv("APP_DATA_DIRECTORY") or "", "llm_cache.db"),
+                self.max_entries,
+            )
+        elif self.backend_name == "redis":
+            self.backend = RedisLLMCacheBackend(redis_service, self.max_entries)
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def get_key(**request) -> str:
+        serialized = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        try:
+            # ? Backends do blocking I/O, keep it off the event loop
+            value = await asyncio.to_thread(self.backend.get, key)
+        except Exception as e:
+            print(f"Error reading LLM cache: {e}")
+            self.errors += 1
+            return None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str):
+        if not self.enabled:
+            return
+        try:
+            await asyncio.to_thread(self.backend.set, key, value, self.ttl)
+        except Exception as e:
+            print(f"Error writing LLM cache: {e}")
+            self.errors += 1
+
+    async def clear(self):
+        if self.enabled:
+            await asyncio.to_thread(self.backend.clear)
+
+    async def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        entries = None
+        if self.enabled:
+            try:
+                entries = await asyncio.to_thread(self.backend.count)
+            except Exception:
+                pass
+        return {
+            "backend": self.backend_name,
+            "ttl": self.ttl,
+            "max_entries": self.max_entries,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
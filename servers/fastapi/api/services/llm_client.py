@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import os
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+
+# (provider, base_url, api_key)
+LLMClientKey = Tuple[str, str, str]
+
+
+class LLMClientService:
+    """
+    Process-wide registry of long-lived AsyncOpenAI clients.
+
+    Clients are keyed by (provider, base_url, api_key) so every caller shares
+    the same httpx connection pool. When the credentials of a provider change
+    (e.g. update_env_with_user_config picked up a new key) the next lookup
+    builds a fresh client and the old one is closed after a grace period, so
+    in-flight requests are allowed to finish.
+    """
+
+    def __init__(self):
+        self.max_connections = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100"))
+        self.max_keepalive_connections = int(
+            os.getenv("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")
+        )
+        self.keepalive_expiry = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "60"))
+        self.http2 = os.getenv("LLM_HTTP2", "false").lower() == "true"
+        self.retire_grace_seconds = float(
+            os.getenv("LLM_CLIENT_RETIRE_GRACE_SECONDS", "600")
+        )
+
+        self._clients: Dict[LLMClientKey, AsyncOpenAI] = {}
+        self._created_at: Dict[LLMClientKey, float] = {}
+        self._lookups: Dict[LLMClientKey, int] = {}
+        self._retired: List[AsyncOpenAI] = []
+        self._built_count = 0
+
+    def get_client(self, provider: str, base_url: str, api_key: str) -> AsyncOpenAI:
+        key = (provider, base_url, api_key)
+        client = self._clients.get(key)
+        if client is None:
+            self._retire_stale_clients(provider, key)
+            client = self._build_client(base_url, api_key)
+            self._clients[key] = client
+            self._created_at[key] = time.time()
+            self._lookups[key] = 0
+            self._built_count += 1
+
+        self._lookups[key] += 1
+        return client
+
+    def _build_client(self, base_url: str, api_key: str) -> AsyncOpenAI:
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            http2=self.http2,
+        )
+        return AsyncOpenAI(base_url=base_url, api_key=api_key, http_client=http_client)
+
+    def _retire_stale_clients(self, provider: str, current_key: LLMClientKey):
+        # A provider only ever has one set of active credentials
+        stale_keys = [
+            key for key in self._clients if key[0] == provider and key != current_key
+        ]
+        for key in stale_keys:
+            client = self._clients.pop(key)
+            self._created_at.pop(key, None)
+            self._lookups.pop(key, None)
+            self._retire_client(client)
+
+    def _retire_client(self, client: AsyncOpenAI):
+        self._retired.append(client)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # ? No running loop, client will be closed on shutdown
+            return
+        loop.call_later(
+            self.retire_grace_seconds,
+            lambda: loop.create_task(self._close_retired_client(client)),
+        )
+
+    async def _close_retired_client(self, client: AsyncOpenAI):
+        if client in self._retired:
+            self._retired.remove(client)
+            await client.close()
+
+    async def close(self):
+        clients = list(self._clients.values()) + self._retired
+        self._clients.clear()
+        self._created_at.clear()
+        self._lookups.clear()
+        self._retired = []
+        for client in clients:
+            await client.close()
+
+    def get_stats(self) -> dict:
+        clients = []
+        for key, client in self._clients.items():
+            provider, base_url, api_key = key
+            clients.append(
+                {
+                    "provider": provider,
+                    "base_url": base_url,
+                    # Never expose the key itself
+                    "api_key_hash": hashlib.sha256(api_key.encode()).hexdigest()[:8],
+                    "created_at": self._created_at[key],
+                    "lookups": self._lookups[key],
+                    **self._get_pool_stats(client),
+                }
+            )
+
+        return {
+            "limits": {
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive_connections,
+                "keepalive_expiry": self.keepalive_expiry,
+                "http2": self.http2,
+            },
+            "clients_built": self._built_count,
+            "clients_retired_pending_close": len(self._retired),
+            "clients": clients,
+        }
+
+    def _get_pool_stats(self, client: AsyncOpenAI) -> dict:
+        # httpx does not expose pool stats publicly, so read them from the
+        # underlying httpcore pool if it is available
+        pool = getattr(getattr(client._client, "_transport", None), "_pool", None)
+        if pool is None:
+            return {}
+
+        connections = list(getattr(pool, "connections", []))
+        idle = len([each for each in connections if each.is_idle()])
+        requests = list(getattr(pool, "_requests", []))
+        return {
+            "connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle,
+            "queued_requests": len([each for each in requests if each.is_queued()]),
+        }
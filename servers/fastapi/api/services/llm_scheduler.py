@@ -0,0 +1,252 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import openai
+
+
+T = TypeVar("T")
+
+# Default limits per lane, overridable with LLM_<LANE>_RPM, LLM_<LANE>_TPM
+# and LLM_<LANE>_MAX_CONCURRENCY. 0 means unlimited.
+DEFAULT_LANE_LIMITS = {
+    "openai": {"rpm": 0, "tpm": 0, "max_concurrency": 16},
+    "google": {"rpm": 0, "tpm": 0, "max_concurrency": 16},
+    "custom": {"rpm": 0, "tpm": 0, "max_concurrency": 8},
+    # Local Ollama serves requests from a single queue, flooding it only
+    # increases latency for every request
+    "ollama": {"rpm": 0, "tpm": 0, "max_concurrency": 2},
+    "openai_images": {"rpm": 0, "tpm": 0, "max_concurrency": 4},
+    "google_images": {"rpm": 0, "tpm": 0, "max_concurrency": 4},
+    "pexels": {"rpm": 0, "tpm": 0, "max_concurrency": 8},
+}
+
+
+def estimate_tokens(messages: List[dict]) -> int:
+    # ~4 characters per token is close enough for rate accounting
+    return sum(len(str(each.get("content") or "")) for each in messages) // 4
+
+
+class TokenBucket:
+
+    def __init__(self, rate_per_minute: float):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = rate_per_minute
+        self.tokens = rate_per_minute
+        self.updated_at = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate_per_minute <= 0
+
+    def _refill(self, rate_multiplier: float):
+        now = time.monotonic()
+        refill_rate = self.rate_per_minute * rate_multiplier / 60
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * refill_rate
+        )
+        self.updated_at = now
+
+    def time_until_available(self, amount: float, rate_multiplier: float) -> float:
+        if self.unlimited:
+            return 0
+        self._refill(rate_multiplier)
+        # Requests larger than the bucket only wait for a full bucket
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0
+        return (amount - self.tokens) / (self.rate_per_minute * rate_multiplier / 60)
+
+    def consume(self, amount: float):
+        if not self.unlimited:
+            self.tokens -= min(amount, self.capacity)
+
+
+class LaneLimiter:
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+    ):
+        self.name = name
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.semaphore = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+        )
+        self.lock = asyncio.Lock()
+
+        # Shrinks on 429 responses and slowly recovers on success
+        self.rate_multiplier = 1.0
+        self.blocked_until = 0.0
+
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.rate_limited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def acquire(self, tokens: int):
+        started_at = time.monotonic()
+        self.queue_depth += 1
+        try:
+            if self.semaphore:
+                await self.semaphore.acquire()
+            try:
+                async with self.lock:
+                    while True:
+                        delay = max(
+                            self.blocked_until - time.monotonic(),
+                            self.request_bucket.time_until_available(
+                                1, self.rate_multiplier
+                            ),
+                            self.token_bucket.time_until_available(
+                                tokens, self.rate_multiplier
+                            ),
+                        )
+                        if delay <= 0:
+                            break
+                        await asyncio.sleep(delay)
+                    self.request_bucket.consume(1)
+                    self.token_bucket.consume(tokens)
+            except BaseException:
+                if self.semaphore:
+                    self.semaphore.release()
+                raise
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - started_at
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.requests += 1
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+        if self.semaphore:
+            self.semaphore.release()
+
+    def on_success(self):
+        self.rate_multiplier = min(1.0, self.rate_multiplier * 1.1)
+
+    def on_rate_limited(self, retry_after: Optional[float]):
+        self.rate_limited += 1
+        self.rate_multiplier = max(0.1, self.rate_multiplier / 2)
+        # Without Retry-After back off exponentially on consecutive 429s
+        backoff = retry_after if retry_after is not None else 1 / self.rate_multiplier
+        self.blocked_until = max(self.blocked_until, time.monotonic() + backoff)
+
+    def get_stats(self) -> dict:
+        return {
+            "requests_per_minute": self.request_bucket.rate_per_minute,
+            "tokens_per_minute": self.token_bucket.rate_per_minute,
+            "max_concurrency": self.max_concurrency,
+            "rate_multiplier": self.rate_multiplier,
+            "blocked_for": max(0.0, self.blocked_until - time.monotonic()),
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "average_wait": self.total_wait / self.requests if self.requests else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+
+class LLMSchedulerService:
+    """
+    Central scheduler for every outgoing LLM and image generation request.
+
+    Each lane (a provider or image backend) has its own request and token
+    buckets plus a concurrency cap. 429 responses block the lane for the
+    Retry-After period and halve its rate until requests succeed again.
+    """
+
+    def __init__(self):
+        self.max_retries = int(os.getenv("LLM_RATE_LIMIT_MAX_RETRIES", "3"))
+        self._limiters: Dict[str, LaneLimiter] = {}
+
+    def get_limiter(self, lane: str) -> LaneLimiter:
+        limiter = self._limiters.get(lane)
+        if limiter is None:
+            defaults = DEFAULT_LANE_LIMITS.get(
+                lane, {"rpm": 0, "tpm": 0, "max_concurrency": 8}
+            )
+            env_prefix = f"LLM_{lane.upper()}"
+            limiter = LaneLimiter(
+                lane,
+                int(os.getenv(f"{env_prefix}_RPM", defaults["rpm"])),
+                int(os.getenv(f"{env_prefix}_TPM", defaults["tpm"])),
+                int(
+                    os.getenv(
+                        f"{env_prefix}_MAX_CONCURRENCY", defaults["max_concurrency"]
+                    )
+                ),
+            )
+            self._limiters[lane] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def slot(self, lane: str, tokens: int = 0):
+        limiter = self.get_limiter(lane)
+        await limiter.acquire(tokens)
+        try:
+            yield limiter
+        finally:
+            limiter.release()
+
+    async def run(
+        self, lane: str, func: Callable[[], Awaitable[T]], tokens: int = 0
+    ) -> T:
+        for attempt in range(self.max_retries + 1):
+            async with self.slot(lane, tokens) as limiter:
+                try:
+                    result = await func()
+                except openai.RateLimitError as e:
+                    limiter.on_rate_limited(self.get_retry_after(e))
+                    if attempt == self.max_retries:
+                        raise
+                    continue
+                limiter.on_success()
+                return result
+
+    async def stream(
+        self,
+        lane: str,
+        func: Callable[[], Awaitable[AsyncIterator[T]]],
+        tokens: int = 0,
+    ) -> AsyncIterator[T]:
+        # ? The slot is held until the stream is consumed so concurrency caps
+        # ? also apply to long running streams
+        for attempt in range(self.max_retries + 1):
+            async with self.slot(lane, tokens) as limiter:
+                try:
+                    stream = await func()
+                except openai.RateLimitError as e:
+                    limiter.on_rate_limited(self.get_retry_after(e))
+                    if attempt == self.max_retries:
+                        raise
+                    continue
+                limiter.on_success()
+                async for each in stream:
+                    yield each
+                return
+
+    @staticmethod
+    def get_retry_after(error: openai.RateLimitError) -> Optional[float]:
+        try:
+            return float(error.response.headers.get("retry-after"))
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def get_stats(self) -> dict:
+        return {
+            lane: limiter.get_stats() for lane, limiter in self._limiters.items()
+        }
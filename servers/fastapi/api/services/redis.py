@@ -96,6 +96,32 @@ class RedisService:
         except RedisError:
             return 0
 
+    def add_to_sorted_set(self, name: str, mapping: dict) -> int:
+        try:
+            return self.client.zadd(name, mapping)
+        except RedisError:
+            return 0
+
+    def get_sorted_set_range(
+        self, name: str, start: int = 0, end: int = -1
+    ) -> Optional[list]:
+        try:
+            return self.client.zrange(name, start, end)
+        except RedisError:
+            return None
+
+    def get_sorted_set_size(self, name: str) -> int:
+        try:
+            return self.client.zcard(name)
+        except RedisError:
+            return 0
+
+    def remove_from_sorted_set(self, name: str, *values: str) -> int:
+        try:
+            return self.client.zrem(name, *values)
+        except RedisError:
+            return 0
+
     def clear(self) -> bool:
         try:
             return self.client.flushdb()
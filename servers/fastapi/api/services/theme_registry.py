@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from api.utils.utils import get_resource
+
+
+# Theme colors used for each slot of the pptx color scheme
+PPTX_THEME_COLOR_SLOTS = {
+    "dk1": "slideTitle",
+    "lt1": "slideBg",
+    "dk2": "slideHeading",
+    "lt2": "slideBox",
+}
+
+
+class ThemeRegistryService:
+    """
+    In-memory registry of the built-in presentation themes.
+
+    Themes are read from assets/themes.json (or THEMES_PATH), which mirrors
+    defaultColors in the Next.js theme store. Call reload() after the file
+    changes.
+    """
+
+    def __init__(self, themes_path: Optional[str] = None):
+        self.themes_path = (
+            themes_path or os.getenv("THEMES_PATH") or get_resource("assets/themes.json")
+        )
+        self._lock = threading.Lock()
+        self._themes: Optional[Dict[str, dict]] = None
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        # ? Theme names are used as both royal-blue and royal_blue
+        return name.strip().lower().replace("-", "_").replace(" ", "_")
+
+    def load(self) -> Dict[str, dict]:
+        with open(self.themes_path, "r") as f:
+            themes = json.load(f)["themes"]
+
+        with self._lock:
+            self._themes = {
+                self.normalize_name(name): theme for name, theme in themes.items()
+            }
+        return self._themes
+
+    def reload(self) -> List[str]:
+        return list(self.load().keys())
+
+    def get_themes(self) -> Dict[str, dict]:
+        if self._themes is None:
+            self.load()
+        return self._themes
+
+    def get_theme(self, name: Optional[str]) -> dict:
+        """
+        Returns the theme in the same shape as /api/get-theme-from-name,
+        falling back to the light theme for unknown names.
+        """
+        name = self.normalize_name(name or "light")
+        themes = self.get_themes()
+        theme = themes.get(name) or themes["light"]
+        return {"name": name, "colors": dict(theme["colors"])}
+
+    def get_prompt(self, name: Optional[str]) -> str:
+        if not name:
+            return ""
+        theme = self.get_themes().get(self.normalize_name(name))
+        return theme.get("prompt", "") if theme else ""
+
+    def get_pptx_color_mapping(self, theme: Optional[dict]) -> Dict[str, str]:
+        """
+        Maps a theme to pptx color scheme slots, e.g. {"dk1": "000000"}.
+        Saved themes carry their own colors, which take precedence.
+        """
+        if not theme:
+            return {}
+        colors = theme.get("colors") or self.get_theme(theme.get("name"))["colors"]
+
+        mapping = {}
+        for slot, color_name in PPTX_THEME_COLOR_SLOTS.items():
+            if colors.get(color_name):
+                mapping[slot] = colors[color_name]
+        for index, color in enumerate((colors.get("chartColors") or [])[:6]):
+            mapping[f"accent{index + 1}"] = color
+
+        return {slot: color.lstrip("#").upper() for slot, color in mapping.items()}
+
+    def get_icon_colors(self) -> List[str]:
+        """
+        Colors the themes draw icons in, white on the icon background and
+        the icon background color itself, e.g. ["1F1F2D", "FFFFFF"].
+        """
+        colors = {"FFFFFF"}
+        for theme in self.get_themes().values():
+            icon_color = (theme.get("colors") or {}).get("iconBg")
+            if icon_color:
+                colors.add(icon_color.lstrip("#").upper())
+        return sorted(colors)
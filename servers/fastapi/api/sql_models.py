@@ -76,3 +76,19 @@ class FlyerSqlModel(SQLModel, table=True):
     steps: Optional[List[dict]] = Field(sa_column=Column(JSON, nullable=True), default=None)
     design: Optional[str] = None
     image_url: Optional[str] = None
+
+
+class GenerationJobSqlModel(SQLModel, table=True):
+    id: str = Field(default_factory=get_random_uuid, primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+    presentation_id: str = Field(index=True)
+    status: str = Field(default="queued", index=True)
+    stage: Optional[str] = None
+    request: dict = Field(sa_column=Column(JSON, nullable=False), default=None)
+    # Output of every finished stage, used to resume interrupted jobs
+    checkpoints: Optional[dict] = Field(
+        sa_column=Column(JSON, nullable=True), default=None
+    )
+    result: Optional[dict] = Field(sa_column=Column(JSON, nullable=True), default=None)
+    error: Optional[str] = None
@@ -1,14 +1,22 @@
 import json
 import os
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, AsyncIterator, List, Optional, Type
 
 import aiohttp
 from fastapi import HTTPException
 from openai import AsyncOpenAI
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 import openai
+from pydantic import BaseModel
 
 from api.models import SelectedLLMProvider
 from api.routers.presentation.models import OllamaModelStatusResponse
+from api.services.instances import (
+    LLM_CLIENT_SERVICE,
+    LLM_RESPONSE_CACHE_SERVICE,
+    LLM_SCHEDULER_SERVICE,
+)
+from api.services.llm_scheduler import estimate_tokens
 
 
 def is_ollama_selected() -> bool:
@@ -76,12 +84,106 @@ def get_llm_api_key():
         raise ValueError(f"Invalid LLM API key")
 
 
-def get_llm_client():
-    client = AsyncOpenAI(
+def get_llm_client() -> AsyncOpenAI:
+    # ? Clients are pooled and rebuilt automatically when provider credentials change
+    return LLM_CLIENT_SERVICE.get_client(
+        get_selected_llm_provider().value,
+        get_model_base_url(),
+        get_llm_api_key(),
+    )
+
+
+def get_llm_cache_key(**request) -> str:
+    return LLM_RESPONSE_CACHE_SERVICE.get_key(
+        provider=get_selected_llm_provider().value,
         base_url=get_model_base_url(),
-        api_key=get_llm_api_key(),
+        **request,
+    )
+
+
+async def parse_chat_completion(
+    model: str,
+    messages: List[dict],
+    response_format: Type[BaseModel],
+    temperature: Optional[float] = None,
+    use_cache: bool = True,
+) -> BaseModel:
+    request = {"model": model, "messages": messages}
+    if temperature is not None:
+        request["temperature"] = temperature
+
+    cache_key = None
+    if use_cache:
+        cache_key = get_llm_cache_key(
+            **request, response_format=response_format.model_json_schema()
+        )
+        cached = await LLM_RESPONSE_CACHE_SERVICE.get(cache_key)
+        if cached is not None:
+            return response_format.model_validate_json(cached)
+
+    client = get_llm_client()
+    response = await LLM_SCHEDULER_SERVICE.run(
+        get_selected_llm_provider().value,
+        lambda: client.beta.chat.completions.parse(
+            **request, response_format=response_format
+        ),
+        tokens=estimate_tokens(messages),
+    )
+    parsed = response.choices[0].message.parsed
+
+    if cache_key and parsed is not None:
+        await LLM_RESPONSE_CACHE_SERVICE.set(cache_key, parsed.model_dump_json())
+    return parsed
+
+
+async def create_chat_completion_content(
+    model: str,
+    messages: List[dict],
+    temperature: Optional[float] = None,
+    response_format: Optional[dict] = None,
+    use_cache: bool = True,
+) -> str:
+    request = {"model": model, "messages": messages}
+    if temperature is not None:
+        request["temperature"] = temperature
+    if response_format is not None:
+        request["response_format"] = response_format
+
+    cache_key = None
+    if use_cache:
+        cache_key = get_llm_cache_key(**request)
+        cached = await LLM_RESPONSE_CACHE_SERVICE.get(cache_key)
+        if cached is not None:
+            return cached
+
+    client = get_llm_client()
+    response = await LLM_SCHEDULER_SERVICE.run(
+        get_selected_llm_provider().value,
+        lambda: client.chat.completions.create(**request),
+        tokens=estimate_tokens(messages),
+    )
+    content = response.choices[0].message.content
+
+    if cache_key and content is not None:
+        await LLM_RESPONSE_CACHE_SERVICE.set(cache_key, content)
+    return content
+
+
+def stream_chat_completion(
+    model: str,
+    messages: List[dict],
+    response_format: Optional[dict] = None,
+) -> AsyncIterator[ChatCompletionChunk]:
+    request = {"model": model, "messages": messages, "stream": True}
+    if response_format is not None:
+        request["response_format"] = response_format
+
+    client = get_llm_client()
+    return LLM_SCHEDULER_SERVICE.stream(
+        get_selected_llm_provider().value,
+        lambda: client.chat.completions.create(**request),
+        tokens=estimate_tokens(messages),
     )
-    return client
 
 
 def get_large_model():
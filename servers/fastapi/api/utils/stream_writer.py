@@ -0,0 +1,99 @@
+import asyncio
+import os
+import queue
+import threading
+from typing import AsyncIterator, Optional
+
+
+class QueueStreamWriter:
+    """
+    Write-only, non-seekable file object that hands written bytes to an
+    async reader in chunks.
+
+    The writer runs in a worker thread (e.g. zipfile writing a package) and
+    blocks once max_chunks chunks are waiting, so at most about
+    max_chunks * chunk_size bytes are held in memory. Written bytes can be
+    teed to tee_path, which is only created once the writer is closed
+    without errors.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 64 * 1024,
+        max_chunks: int = 16,
+        tee_path: Optional[str] = None,
+    ):
+        self.chunk_size = chunk_size
+        self.tee_path = tee_path
+
+        self._queue = queue.Queue(maxsize=max_chunks)
+        self._buffer = bytearray()
+        self._cancelled = threading.Event()
+        self._tee_file = None
+        if tee_path:
+            self._tee_partial_path = f"{tee_path}.partial"
+            self._tee_file = open(self._tee_partial_path, "wb")
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def write(self, data: bytes) -> int:
+        if self._cancelled.is_set():
+            raise OSError("Stream was closed by the reader")
+        if self._tee_file:
+            self._tee_file.write(data)
+        self._buffer += data
+        if len(self._buffer) >= self.chunk_size:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self, failed: bool = False):
+        """
+        Called by the writer once it is done. The tee file is kept only if
+        writing finished without errors.
+        """
+        try:
+            if not failed and self._buffer:
+                self._put(bytes(self._buffer))
+            self._buffer.clear()
+        finally:
+            if self._tee_file:
+                self._tee_file.close()
+                self._tee_file = None
+                if failed or self._cancelled.is_set():
+                    os.remove(self._tee_partial_path)
+                else:
+                    os.replace(self._tee_partial_path, self.tee_path)
+            self._put(None, force=True)
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _put(self, chunk: Optional[bytes], force: bool = False):
+        # ? Waits in short steps, so a reader that went away never leaves
+        # ? the writer thread blocked
+        while force or not self._cancelled.is_set():
+            try:
+                self._queue.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                if force and self._cancelled.is_set():
+                    return
+        raise OSError("Stream was closed by the reader")
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        try:
+            while True:
+                chunk = await asyncio.to_thread(self._queue.get)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            self.cancel()
@@ -28,6 +28,11 @@ def get_presentation_images_dir(presentation_id: str) -> str:
     return presentation_images_dir
 
 
+def get_nextjs_url() -> str:
+    # Slide metadata and PDF export need the browser side renderer
+    return os.getenv("NEXTJS_URL", "http://localhost").rstrip("/")
+
+
 def get_user_config():
     user_config_path = os.getenv("USER_CONFIG_PATH")
 
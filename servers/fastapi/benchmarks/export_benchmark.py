@@ -0,0 +1,323 @@
+"""
+End to end benchmark for PPTX export with synthetic decks.
+
+Builds text heavy, picture heavy and mixed decks of 10, 100 and 500 slides
+and drives PptxPresentationCreator through every export stage, recording
+time, peak RSS and output size per stage as JSON. Each deck runs in its own
+process so peak RSS is not shared between decks.
+
+RSS is a peak so far, it never goes down between stages. Pictures are
+processed in worker processes, whose peak is reported separately as the
+largest worker so far (Linux only, read from /proc).
+
+Run from servers/fastapi:
+
+    python -m benchmarks.export_benchmark [--sizes 10 100] [--decks text]
+        [--renderers lxml] [--output results.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+from PIL import Image
+
+
+DECKS = ["text", "picture", "mixed"]
+SIZES = [10, 100, 500]
+RENDERERS = ["python-pptx", "lxml"]
+
+N_SOURCE_IMAGES = 6
+SOURCE_IMAGE_SIZE = (1280, 720)
+
+PARAGRAPH_TEXT = (
+    "Quarterly revenue grew **18%** year over year, driven by __enterprise__ "
+    "expansion and ***record retention***. Operating costs stayed flat while "
+    "headcount grew in sales and support. "
+)
+
+
+def get_peak_rss_mb() -> float:
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ? ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    if sys.platform == "darwin":
+        return peak_rss / (1024 * 1024)
+    return peak_rss / 1024
+
+
+def get_workers_peak_rss_mb() -> float:
+    # ? Read from the live workers, RUSAGE_CHILDREN only counts exited ones
+    # ? and includes the memory of this process at the time of the fork
+    peak_rss = 0
+    for worker in multiprocessing.active_children():
+        try:
+            with open(f"/proc/{worker.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        peak_rss = max(peak_rss, int(line.split()[1]))
+        except OSError:
+            continue
+    return peak_rss / 1024
+
+
+def create_source_images(images_dir: str) -> List[str]:
+    image_paths = []
+    for index in range(N_SOURCE_IMAGES):
+        image = Image.effect_noise(SOURCE_IMAGE_SIZE, 64 + index * 16).convert("RGB")
+        image_path = os.path.join(images_dir, f"source_{index}.jpg")
+        image.save(image_path, quality=90)
+        image_paths.append(image_path)
+    return image_paths
+
+
+def get_text_shapes(slide_index: int) -> List[dict]:
+    font = {"name": "Inter", "size": 18, "color": "1F2937"}
+    shapes = [
+        {
+            "position": {"left": 60, "top": 40, "width": 1160, "height": 80},
+            "paragraphs": [
+                {
+                    "font": {**font, "size": 36, "bold": True},
+                    "text": f"Slide {slide_index + 1}: **Business review**",
+                }
+            ],
+        }
+    ]
+    for row in range(4):
+        shapes.append(
+            {
+                "position": {"left": 60, "top": 150 + row * 130, "width": 1160, "height": 120},
+                "margin": {"top": 4, "bottom": 4},
+                "paragraphs": [
+                    {
+                        "spacing": {"top": 2, "bottom": 4},
+                        "font": font,
+                        "text": PARAGRAPH_TEXT * 2,
+                    }
+                    for _ in range(3)
+                ],
+            }
+        )
+    return shapes
+
+
+def get_picture_shapes(slide_index: int, image_paths: List[str]) -> List[dict]:
+    picture_options = [
+        {"border_radius": [16, 16, 16, 16]},
+        {"object_fit": {"fit": "cover", "focus": [50, 50]}},
+        {"shape": "circle"},
+        {"overlay": "5E8CF0", "object_fit": {"fit": "contain"}},
+    ]
+    shapes = []
+    for index, options in enumerate(picture_options):
+        shapes.append(
+            {
+                "position": {
+                    "left": 60 + (index % 2) * 600,
+                    "top": 60 + (index // 2) * 330,
+                    "width": 560,
+                    "height": 300,
+                },
+                "picture": {
+                    "is_network": False,
+                    "path": image_paths[(slide_index + index) % len(image_paths)],
+                },
+                **options,
+            }
+        )
+    return shapes
+
+
+def get_mixed_shapes(slide_index: int, image_paths: List[str]) -> List[dict]:
+    font = {"name": "Inter", "size": 16, "color": "111827"}
+    shapes = get_text_shapes(slide_index)[:2]
+    shapes += get_picture_shapes(slide_index, image_paths)[:1]
+    for index in range(3):
+        shapes.append(
+            {
+                "type": 5,
+                "position": {"left": 60 + index * 400, "top": 520, "width": 360, "height": 140},
+                "fill": {"color": "EEF2FF"},
+                "stroke": {"color": "6366F1", "thickness": 1},
+                "shadow": {"radius": 8, "offset": 2, "opacity": 0.2, "angle": 90},
+                "border_radius": 12,
+                "paragraphs": [{"font": font, "text": f"**Metric {index + 1}**"}],
+            }
+        )
+    shapes.append(
+        {
+            "position": {"left": 60, "top": 500, "width": 1160, "height": 0},
+            "thickness": 1,
+            "color": "D1D5DB",
+        }
+    )
+    return shapes
+
+
+def get_deck(deck: str, n_slides: int, image_paths: List[str]) -> dict:
+    slides = []
+    for slide_index in range(n_slides):
+        if deck == "text":
+            shapes = get_text_shapes(slide_index)
+        elif deck == "picture":
+            shapes = get_picture_shapes(slide_index, image_paths)
+        else:
+            shapes = get_mixed_shapes(slide_index, image_paths)
+        slides.append({"shapes": shapes})
+    return {"background_color": "FFFFFF", "slides": slides}
+
+
+def run_case(deck: str, n_slides: int, renderer: str) -> dict:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # ? A cold picture cache per case, so picture processing is measured
+        os.environ["PPTX_PICTURE_CACHE_DIR"] = os.path.join(temp_dir, "cache")
+        # ? Set before importing the exporter, so nothing it imports touches
+        # ? the app data or temp directories of the developer
+        for name in ["APP_DATA_DIRECTORY", "TEMP_DIRECTORY"]:
+            os.environ[name] = os.path.join(temp_dir, name.lower())
+            os.makedirs(os.environ[name], exist_ok=True)
+
+        from api.services.theme_registry import ThemeRegistryService
+        from ppt_generator.models.pptx_models import PptxPresentationModel
+        from ppt_generator.picture_processing import shutdown_picture_process_pool
+        from ppt_generator.pptx_presentation_creator import (
+            PptxPresentationCreator,
+            get_slide_hashes,
+        )
+        from ppt_generator.pptx_xml_presentation_creator import (
+            PptxXmlPresentationCreator,
+        )
+
+        image_paths = create_source_images(temp_dir)
+        ppt_creator_class = (
+            PptxXmlPresentationCreator if renderer == "lxml" else PptxPresentationCreator
+        )
+        theme_colors = ThemeRegistryService().get_pptx_color_mapping({"name": "light"})
+        ppt_path = os.path.join(temp_dir, "deck.pptx")
+        stages = {}
+        workers_peak_rss_mb = 0.0
+
+        def run_stage(name: str, func):
+            nonlocal workers_peak_rss_mb
+            started_at = time.perf_counter()
+            result = func()
+            seconds = time.perf_counter() - started_at
+            workers_peak_rss_mb = max(workers_peak_rss_mb, get_workers_peak_rss_mb())
+            stages[name] = {
+                "seconds": seconds,
+                "peak_rss_so_far_mb": get_peak_rss_mb(),
+                "worker_peak_rss_so_far_mb": workers_peak_rss_mb,
+            }
+            return result
+
+        deck_json = get_deck(deck, n_slides, image_paths)
+        ppt_model = run_stage(
+            "build_model", lambda: PptxPresentationModel(**deck_json)
+        )
+        slide_hashes = run_stage("hash_slides", lambda: get_slide_hashes(ppt_model))
+
+        ppt_creator = ppt_creator_class(ppt_model, temp_dir, theme_colors)
+        run_stage("theme", ppt_creator.set_presentation_theme)
+        run_stage(
+            "process_pictures", lambda: ppt_creator.preprocess_pictures(ppt_model.slides)
+        )
+        run_stage(
+            "assemble_slides",
+            lambda: [
+                ppt_creator.add_and_populate_slide(slide_model)
+                for slide_model in ppt_model.slides
+            ],
+        )
+        run_stage("save", lambda: ppt_creator.save(ppt_path))
+        stages["save"]["output_bytes"] = os.path.getsize(ppt_path)
+
+        # Re-export after editing the first slide
+        edited_json = get_deck(deck, n_slides, image_paths)
+        edited_json["slides"][0]["shapes"].pop()
+        edited_model = PptxPresentationModel(**edited_json)
+        ppt_creator = ppt_creator_class(edited_model, temp_dir, theme_colors)
+        updated_path = os.path.join(temp_dir, "updated.pptx")
+        run_stage(
+            "update_one_slide",
+            lambda: (
+                ppt_creator.update_ppt(ppt_path, slide_hashes),
+                ppt_creator.save(updated_path),
+            ),
+        )
+        stages["update_one_slide"]["output_bytes"] = os.path.getsize(updated_path)
+
+        shutdown_picture_process_pool()
+
+    return {
+        "deck": deck,
+        "slides": n_slides,
+        "renderer": renderer,
+        "total_seconds": sum(
+            stage["seconds"] for name, stage in stages.items() if name != "update_one_slide"
+        ),
+        "output_bytes": stages["save"]["output_bytes"],
+        "stages": stages,
+    }
+
+
+def run_case_in_process(deck: str, n_slides: int, renderer: str) -> dict:
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.export_benchmark",
+            "--case",
+            json.dumps([deck, n_slides, renderer]),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    # Exporter logs go to stdout as well, the result is the last line
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run(decks: List[str], sizes: List[int], renderers: List[str]) -> dict:
+    results = []
+    for deck in decks:
+        for n_slides in sizes:
+            for renderer in renderers:
+                print(f"Exporting {deck} deck, {n_slides} slides, {renderer}", file=sys.stderr)
+                results.append(run_case_in_process(deck, n_slides, renderer))
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "pptx_export_workers": os.getenv("PPTX_EXPORT_WORKERS"),
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--decks", nargs="+", choices=DECKS, default=DECKS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--renderers", nargs="+", choices=RENDERERS, default=RENDERERS)
+    parser.add_argument("--output", help="Also write the results to this file")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(*json.loads(args.case))))
+        sys.exit(0)
+
+    results = run(args.decks, args.sizes, args.renderers)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
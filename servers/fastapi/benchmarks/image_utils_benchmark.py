@@ -0,0 +1,162 @@
+"""
+Micro-benchmark for the image helpers used during PPTX export.
+
+Compares change_image_color, round_image_corners and create_circle_image
+against their previous implementations across common picture sizes.
+
+Run from servers/fastapi:
+
+    python -m benchmarks.image_utils_benchmark [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import timeit
+
+from PIL import Image, ImageDraw
+
+from ppt_generator.utils import (
+    change_image_color,
+    create_circle_image,
+    round_image_corners,
+)
+
+
+SIZES = [(64, 64), (256, 256), (512, 512), (1024, 1024), (1920, 1080)]
+
+
+def change_image_color_per_pixel(img: Image.Image, color: str) -> Image.Image:
+    # Previous implementation, kept as the baseline
+    if color.startswith("#"):
+        color = color[1:]
+    r_new = int(color[:2], 16)
+    g_new = int(color[2:4], 16)
+    b_new = int(color[4:], 16)
+
+    new_data = []
+    for r, g, b, a in img.getdata():
+        if a != 0:
+            new_data.append((r_new, g_new, b_new, a))
+        else:
+            new_data.append((0, 0, 0, 0))
+
+    new_img = Image.new("RGBA", img.size)
+    new_img.putdata(new_data)
+    return new_img
+
+
+def round_image_corners_uncached(image: Image.Image, radii) -> Image.Image:
+    # Previous implementation, kept as the baseline
+    w, h = image.size
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+
+    rounded_mask = Image.new("L", image.size, 0)
+    rectangular_mask = Image.new("L", image.size, 255)
+    for i, radius in enumerate(radii):
+        if radius > 0:
+            circle = Image.new("L", (radius * 2, radius * 2), 0)
+            draw = ImageDraw.Draw(circle)
+            draw.ellipse((0, 0, radius * 2 - 1, radius * 2 - 1), fill=255)
+            if i == 0:
+                rounded_mask.paste(circle.crop((0, 0, radius, radius)), (0, 0))
+                rectangular_mask.paste(0, (0, 0, radius, radius))
+            elif i == 1:
+                rounded_mask.paste(
+                    circle.crop((radius, 0, radius * 2, radius)), (w - radius, 0)
+                )
+                rectangular_mask.paste(0, (w - radius, 0, w, radius))
+            elif i == 2:
+                rounded_mask.paste(
+                    circle.crop((radius, radius, radius * 2, radius * 2)),
+                    (w - radius, h - radius),
+                )
+                rectangular_mask.paste(0, (w - radius, h - radius, w, h))
+            else:
+                rounded_mask.paste(
+                    circle.crop((0, radius, radius, radius * 2)), (0, h - radius)
+                )
+                rectangular_mask.paste(0, (0, h - radius, radius, h))
+
+    original_alpha = image.getchannel("A")
+    corner_mask = Image.composite(rounded_mask, rectangular_mask, rounded_mask)
+    final_alpha = Image.composite(
+        original_alpha, Image.new("L", image.size, 0), corner_mask
+    )
+    result = Image.new("RGBA", image.size)
+    result.paste(image.convert("RGB"), (0, 0))
+    result.putalpha(final_alpha)
+    return result
+
+
+def create_circle_image_uncached(image: Image.Image) -> Image.Image:
+    # Previous implementation, kept as the baseline
+    img = image.convert("RGBA")
+    size = img.size
+    circle_size = min(size)
+    mask = Image.new("RGBA", size, color=(0, 0, 0, 0))
+    draw = ImageDraw.Draw(mask)
+    center_x = size[0] // 2
+    center_y = size[1] // 2
+    radius = circle_size // 2
+    draw.ellipse(
+        (
+            center_x - radius,
+            center_y - radius,
+            center_x + radius,
+            center_y + radius,
+        ),
+        fill=(255, 255, 255, 255),
+    )
+    return Image.composite(img, mask, mask)
+
+
+def get_test_image(size) -> Image.Image:
+    return Image.frombytes("RGBA", size, os.urandom(size[0] * size[1] * 4))
+
+
+def time_function(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def run(repeat: int) -> list:
+    results = []
+    for size in SIZES:
+        image = get_test_image(size)
+        radii = [size[1] // 8] * 4
+        cases = {
+            "change_image_color": (
+                lambda: change_image_color_per_pixel(image, "#5E8CF0"),
+                lambda: change_image_color(image, "#5E8CF0"),
+            ),
+            "round_image_corners": (
+                lambda: round_image_corners_uncached(image, radii),
+                lambda: round_image_corners(image, radii),
+            ),
+            "create_circle_image": (
+                lambda: create_circle_image_uncached(image),
+                lambda: create_circle_image(image),
+            ),
+        }
+        for name, (baseline_func, current_func) in cases.items():
+            baseline = time_function(baseline_func, repeat)
+            current = time_function(current_func, repeat)
+            results.append(
+                {
+                    "function": name,
+                    "size": f"{size[0]}x{size[1]}",
+                    "baseline_seconds": baseline,
+                    "current_seconds": current,
+                    "speedup": baseline / current if current else None,
+                }
+            )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.repeat), indent=2))
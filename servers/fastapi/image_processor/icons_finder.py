@@ -1,37 +1,148 @@
-from typing import List, Optional
+import asyncio
+import os
+import re
+from typing import List, Optional, Tuple
 
 from api.utils.utils import get_resource
 from ppt_generator.models.query_and_prompt_models import (
     IconCategoryEnum,
     IconQueryCollectionWithData,
 )
-from fastembed_vectorstore import FastembedVectorstore
+from image_processor.icons_index import IconsIndex, InvalidIconCursorError
+from image_processor.icons_vectorstore import IconsVectorStore, get_distinct_best
+from image_processor.icons_vectorstore_utils import (
+    get_icon_path,
+    get_icons_index,
+    get_icons_vectorstore,
+)
+
+
+# Separators of several icon queries packed into one
+ICON_QUERY_SEPARATORS = re.compile(r"[,;|/]|\bor\b")
 
 
 async def get_icon(
-    vector_store: FastembedVectorstore,
     input: IconQueryCollectionWithData,
+    vector_store: Optional[IconsVectorStore] = None,
 ) -> str:
+    return (await get_icons_for_queries([input], vector_store))[0]
+
+
+def get_icon_query_candidates(icon_query: str) -> List[str]:
+    """
+    Returns the queries an icon is matched with. The LLM is asked for a
+    specific, a generic and a simplest query, which may come packed in one
+    string. Each part and its last word, usually the generic noun ("led
+    bulb" -> "bulb"), become candidates.
+    """
+    candidates = []
+    seen = set()
+    for part in [icon_query] + ICON_QUERY_SEPARATORS.split(icon_query):
+        words = part.split()
+        for each in [" ".join(words), words[-1] if words else ""]:
+            if each and each.lower() not in seen:
+                seen.add(each.lower())
+                candidates.append(each)
+    return candidates or [icon_query]
+
+
+def match_slides_icons(
+    vector_store: Optional[IconsVectorStore],
+    slides_icon_queries: List[List[IconQueryCollectionWithData]],
+) -> List[List[str]]:
+    # ? Loaded at startup, this only loads it again when that failed
+    vector_store = vector_store or get_icons_vectorstore()
+
+    # Candidates of every icon of every slide are scored in one pass
+    candidate_groups = [
+        get_icon_query_candidates(each.icon_query)
+        for slide_icon_queries in slides_icon_queries
+        for each in slide_icon_queries
+    ]
+    scores = vector_store.get_fused_scores(
+        candidate_groups, os.getenv("ICON_QUERY_FUSION", "rrf")
+    )
+
+    slides_icons = []
+    offset = 0
+    for slide_icon_queries in slides_icon_queries:
+        slide_scores = scores[offset : offset + len(slide_icon_queries)]
+        offset += len(slide_icon_queries)
+        slides_icons.append(
+            [vector_store.names[each] for each in get_distinct_best(slide_scores)]
+            if len(slide_scores)
+            else []
+        )
+    return slides_icons
+
+
+async def get_icons_for_slides(
+    slides_icon_queries: List[List[IconQueryCollectionWithData]],
+    vector_store: Optional[IconsVectorStore] = None,
+) -> List[List[str]]:
+    """
+    Finds icons for the icon queries of every slide, never using the same
+    icon twice on a slide. All slides are searched as one batch, in a
+    thread so the embedding does not block the event loop. Uses the shared
+    icon store by default, and the placeholder icon if searching fails.
+    """
+    if not any(slides_icon_queries):
+        return [[] for _ in slides_icon_queries]
     try:
-        query = input.icon_query
-        results = vector_store.search(query, 1)
-        icon_name = results[0][0].split("||")[0]
-        return get_resource(f"assets/icons/bold/{icon_name}.png")
+        slides_icons = await asyncio.to_thread(
+            match_slides_icons, vector_store, slides_icon_queries
+        )
+        return [[get_icon_path(each) for each in icons] for icons in slides_icons]
     except Exception as e:
-        print("Error finding icon: ", e)
-        return get_resource("assets/icons/placeholder.png")
+        print("Error finding icons: ", e)
+        return [
+            [get_resource("assets/icons/placeholder.png")] * len(each)
+            for each in slides_icon_queries
+        ]
 
 
-async def get_icons(
-    vector_store: FastembedVectorstore,
+async def get_icons_for_queries(
+    inputs: List[IconQueryCollectionWithData],
+    vector_store: Optional[IconsVectorStore] = None,
+) -> List[str]:
+    # Icon queries of a single slide
+    return (await get_icons_for_slides([inputs], vector_store))[0]
+
+
+def search_icons(
+    icons_index: Optional[IconsIndex],
     query: str,
-    page: int,
     limit: int,
     category: Optional[IconCategoryEnum],
-    temp_dir: str,
-) -> List[str]:
+    page: int = 1,
+    cursor: Optional[str] = None,
+) -> Tuple[List[str], Optional[str]]:
+    # ? Loaded at startup, this only loads it again when that failed
+    icons_index = icons_index or get_icons_index()
+    return icons_index.search(query, category, limit, page, cursor)
 
-    results = vector_store.search(query, limit)
-    icon_names = [result[0].split("||")[0] for result in results]
 
-    return [get_resource(f"assets/icons/bold/{each}.png") for each in icon_names]
+async def get_icons(
+    query: str,
+    limit: int,
+    category: Optional[IconCategoryEnum],
+    page: int = 1,
+    cursor: Optional[str] = None,
+    icons_index: Optional[IconsIndex] = None,
+) -> Tuple[List[str], Optional[str]]:
+    """
+    Searches the shared icon index by default. Everything, including
+    loading the index, runs in a thread so the event loop is never blocked.
+    Returns the placeholder icon if searching fails, invalid cursors raise
+    InvalidIconCursorError.
+    """
+    try:
+        icon_names, next_cursor = await asyncio.to_thread(
+            search_icons, icons_index, query, limit, category, page, cursor
+        )
+    except InvalidIconCursorError:
+        raise
+    except Exception as e:
+        print("Error searching icons: ", e)
+        return [get_resource("assets/icons/placeholder.png")], None
+    return [get_icon_path(each) for each in icon_names], next_cursor
@@ -0,0 +1,197 @@
+import base64
+import hashlib
+import json
+import math
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from image_processor.icons_vectorstore import IconsVectorStore
+from ppt_generator.models.query_and_prompt_models import IconCategoryEnum
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class InvalidIconCursorError(ValueError):
+    pass
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class IconsIndex:
+    """
+    Hybrid search over the icons of a vector store.
+
+    BM25 scores over icon names and tags are combined with the cosine
+    similarity of the query embedding. Category partitions and BM25 term
+    weights are computed up front, and the full ranking of recent queries is
+    kept in an LRU cache, so paging and popular queries skip the embedding.
+    """
+
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+
+    def __init__(
+        self,
+        vector_store: IconsVectorStore,
+        documents: List[str],
+        categories: List[Optional[IconCategoryEnum]],
+        vector_weight: float = 0.7,
+        cache_size: int = 256,
+    ):
+        self.vector_store = vector_store
+        self.vector_weight = vector_weight
+        self.cache_size = cache_size
+
+        n_icons = len(vector_store.names)
+        self._all_icons = np.arange(n_icons)
+        self._partitions: Dict[IconCategoryEnum, np.ndarray] = {
+            each: np.flatnonzero([category == each for category in categories])
+            for each in IconCategoryEnum
+        }
+
+        # token -> {icon index: term frequency}
+        term_frequencies = defaultdict(lambda: defaultdict(int))
+        document_lengths = np.zeros(n_icons, dtype=np.float32)
+        for index, document in enumerate(documents):
+            tokens = tokenize(document)
+            document_lengths[index] = len(tokens)
+            for token in tokens:
+                term_frequencies[token][index] += 1
+        average_length = float(document_lengths.mean()) if n_icons else 0.0
+
+        # token -> (icon indices, bm25 weights)
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for token, frequencies in term_frequencies.items():
+            indices = np.fromiter(frequencies.keys(), dtype=np.int64)
+            tf = np.fromiter(frequencies.values(), dtype=np.float32)
+            idf = math.log(
+                1 + (n_icons - len(indices) + 0.5) / (len(indices) + 0.5)
+            )
+            length_norm = 1 - self.BM25_B + self.BM25_B * (
+                document_lengths[indices] / (average_length or 1.0)
+            )
+            weights = (
+                idf * tf * (self.BM25_K1 + 1) / (tf + self.BM25_K1 * length_norm)
+            )
+            self._postings[token] = (indices, weights.astype(np.float32))
+
+        self._lock = threading.Lock()
+        self._rankings: OrderedDict = OrderedDict()
+
+    def get_partition(self, category: Optional[IconCategoryEnum]) -> np.ndarray:
+        if category is None:
+            return self._all_icons
+        partition = self._partitions.get(category)
+        # ? Categories whose icon set is not shipped search all icons
+        if partition is None or not len(partition):
+            return self._all_icons
+        return partition
+
+    def get_bm25_scores(self, tokens: List[str]) -> np.ndarray:
+        scores = np.zeros(len(self._all_icons), dtype=np.float32)
+        for token in tokens:
+            if token in self._postings:
+                indices, weights = self._postings[token]
+                scores[indices] += weights
+        return scores
+
+    def get_ranking(
+        self, query: str, category: Optional[IconCategoryEnum]
+    ) -> np.ndarray:
+        """
+        Returns indices of all icons in the category, best match first. Ties
+        are broken by icon order, so rankings and pages are stable.
+        """
+        query = query.strip().lower()
+        key = (query, category)
+        with self._lock:
+            if key in self._rankings:
+                self._rankings.move_to_end(key)
+                return self._rankings[key]
+
+        partition = self.get_partition(category)
+        tokens = tokenize(query)
+        if not tokens:
+            ranking = partition
+        else:
+            bm25_scores = self.get_bm25_scores(tokens)[partition]
+            max_bm25_score = bm25_scores.max(initial=0.0)
+            if max_bm25_score > 0:
+                bm25_scores /= max_bm25_score
+            vector_scores = self.vector_store.get_scores(
+                self.vector_store.embed_queries([query])
+            )[0][partition]
+            scores = (
+                self.vector_weight * vector_scores
+                + (1 - self.vector_weight) * bm25_scores
+            )
+            ranking = partition[np.lexsort((partition, -scores))]
+
+        with self._lock:
+            self._rankings[key] = ranking
+            while len(self._rankings) > self.cache_size:
+                self._rankings.popitem(last=False)
+        return ranking
+
+    @staticmethod
+    def get_query_key(query: str, category: Optional[IconCategoryEnum]) -> str:
+        content = json.dumps(
+            [query.strip().lower(), category.value if category else None]
+        )
+        return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+    def encode_cursor(
+        self, offset: int, query: str, category: Optional[IconCategoryEnum]
+    ) -> str:
+        cursor = f"{offset}:{self.get_query_key(query, category)}"
+        return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+    def decode_cursor(
+        self, cursor: str, query: str, category: Optional[IconCategoryEnum]
+    ) -> int:
+        try:
+            offset, query_key = (
+                base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+            )
+            offset = int(offset)
+        except Exception:
+            raise InvalidIconCursorError("Invalid icon search cursor")
+        if offset < 0 or query_key != self.get_query_key(query, category):
+            raise InvalidIconCursorError(
+                "Icon search cursor belongs to a different search"
+            )
+        return offset
+
+    def search(
+        self,
+        query: str,
+        category: Optional[IconCategoryEnum],
+        limit: int,
+        page: int = 1,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[str], Optional[str]]:
+        """
+        Returns a page of icon names and the cursor of the next page, which
+        is None after the last page. The cursor takes precedence over page.
+        """
+        ranking = self.get_ranking(query, category)
+        if cursor:
+            offset = self.decode_cursor(cursor, query, category)
+        else:
+            offset = (max(page, 1) - 1) * limit
+
+        names = [
+            self.vector_store.names[each] for each in ranking[offset : offset + limit]
+        ]
+        next_offset = offset + limit
+        next_cursor = None
+        if limit > 0 and next_offset < len(ranking):
+            next_cursor = self.encode_cursor(next_offset, query, category)
+        return names, next_cursor
@@ -0,0 +1,174 @@
+import os
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+
+# int8 embeddings are unit vectors scaled to this range
+INT8_SCALE = 127
+
+# Reciprocal rank fusion constant, as in the original paper
+RRF_K = 60
+
+
+def get_distinct_best(scores: np.ndarray) -> np.ndarray:
+    """
+    Picks the best column of every row without picking a column twice.
+    Rows with the most confident match pick first.
+    """
+    n_rows, n_columns = scores.shape
+    # ? The k best columns of a row always hold one that is still free
+    k = min(n_rows, n_columns)
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+
+    best = top[:, 0].copy()
+    used = set()
+    for row in np.argsort(-top_scores.max(axis=1), kind="stable"):
+        free = [each for each in top[row] if each not in used]
+        if free:
+            best[row] = free[0]
+        used.add(best[row])
+    return best
+
+
+class IconsVectorStore:
+    """
+    Read-only vector store of icon embeddings.
+
+    Embeddings are kept in a .npy matrix with one unit vector per row,
+    stored as float32 or int8, and loaded memory-mapped so processes share
+    the pages. Row i belongs to the icon on line i of the names file.
+    """
+
+    def __init__(self, embeddings: np.ndarray, names: List[str], embedding_model):
+        if len(embeddings) != len(names):
+            raise ValueError(
+                f"Icon embeddings have {len(embeddings)} rows for {len(names)} names"
+            )
+        self.embeddings = embeddings
+        self.names = names
+        self.embedding_model = embedding_model
+
+    @staticmethod
+    def get_names_path(embeddings_path: str) -> str:
+        return f"{os.path.splitext(embeddings_path)[0]}.names.txt"
+
+    @classmethod
+    def load(cls, embeddings_path: str, embedding_model) -> "IconsVectorStore":
+        embeddings = np.load(embeddings_path, mmap_mode="r")
+        with open(cls.get_names_path(embeddings_path), "r") as f:
+            names = f.read().splitlines()
+        return cls(embeddings, names, embedding_model)
+
+    @classmethod
+    def save(
+        cls,
+        embeddings_path: str,
+        embeddings: Iterable[np.ndarray],
+        names: List[str],
+        dtype: str = "float32",
+    ):
+        embeddings = np.asarray(list(embeddings), dtype=np.float32)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        if dtype == "int8":
+            embeddings = np.round(embeddings * INT8_SCALE).astype(np.int8)
+        elif dtype != "float32":
+            raise ValueError(f"Unsupported embeddings dtype: {dtype}")
+
+        os.makedirs(os.path.dirname(os.path.abspath(embeddings_path)), exist_ok=True)
+        # ? Written under temporary names and renamed, so a running server
+        # ? never maps a partially written matrix
+        temp_embeddings_path = f"{embeddings_path}.partial"
+        with open(temp_embeddings_path, "wb") as f:
+            np.save(f, embeddings)
+        names_path = cls.get_names_path(embeddings_path)
+        with open(f"{names_path}.partial", "w") as f:
+            f.write("\n".join(names))
+        os.replace(f"{names_path}.partial", names_path)
+        os.replace(temp_embeddings_path, embeddings_path)
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        # ? fastembed embeds the whole list as one onnx batch
+        query_vectors = np.asarray(
+            list(self.embedding_model.query_embed(queries)), dtype=np.float32
+        )
+        norms = np.linalg.norm(query_vectors, axis=1, keepdims=True)
+        return query_vectors / np.where(norms == 0, 1.0, norms)
+
+    def get_scores(self, query_vectors: np.ndarray) -> np.ndarray:
+        # One matrix multiply scores every query against every icon
+        scores = query_vectors @ self.embeddings.T
+        if self.embeddings.dtype == np.int8:
+            scores = scores / INT8_SCALE
+        return scores
+
+    def search_by_vectors(
+        self, query_vectors: np.ndarray, limit: int
+    ) -> List[List[Tuple[str, float]]]:
+        scores = self.get_scores(query_vectors)
+
+        limit = min(limit, scores.shape[1])
+        if limit <= 0:
+            return [[] for _ in range(len(scores))]
+        top = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        return [
+            [
+                (self.names[index], float(score))
+                for index, score in zip(each_top, each_scores)
+            ]
+            for each_top, each_scores in zip(top, top_scores)
+        ]
+
+    def get_fused_scores(
+        self, candidate_groups: List[List[str]], fusion: str = "rrf"
+    ) -> np.ndarray:
+        """
+        Scores every icon for every group of candidate queries, fusing the
+        scores of a group by their maximum ("max") or by reciprocal rank
+        ("rrf"). All candidates are embedded and scored in one batch.
+        """
+        group_sizes = [len(each) for each in candidate_groups]
+        if not group_sizes or min(group_sizes) == 0:
+            raise ValueError("Every group needs at least one candidate query")
+        scores = self.get_scores(
+            self.embed_queries([each for group in candidate_groups for each in group])
+        )
+        group_starts = np.cumsum([0] + group_sizes[:-1])
+
+        if fusion == "max":
+            return np.maximum.reduceat(scores, group_starts, axis=0)
+        if fusion == "rrf":
+            ranks = np.empty_like(scores, dtype=np.int64)
+            np.put_along_axis(
+                ranks,
+                np.argsort(-scores, axis=1, kind="stable"),
+                np.arange(scores.shape[1]),
+                axis=1,
+            )
+            # ? Averaged, so groups with more candidates are not more confident
+            rrf_scores = np.add.reduceat(
+                1.0 / (RRF_K + ranks + 1), group_starts, axis=0
+            )
+            return rrf_scores / np.asarray(group_sizes)[:, None]
+        raise ValueError(f"Unsupported score fusion: {fusion}")
+
+    def search_batch(
+        self, queries: List[str], limit: int
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Searches all queries at once. Returns, for each query, (icon name,
+        cosine similarity) pairs of the closest icons, best first.
+        """
+        if not queries:
+            return []
+        return self.search_by_vectors(self.embed_queries(queries), limit)
+
+    def search(self, query: str, limit: int) -> List[Tuple[str, float]]:
+        return self.search_batch([query], limit)[0]
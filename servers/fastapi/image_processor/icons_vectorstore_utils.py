@@ -1,26 +1,180 @@
+"""
+Icon embeddings are built once at image build time:
+
+    python -m image_processor.icons_vectorstore_utils [--dtype int8]
+
+The server loads them at startup and shares one store across requests.
+"""
+
+import argparse
 import json
 import os
+import threading
+from typing import Dict, List, Optional
 
 from api.utils.utils import get_resource
-from fastembed_vectorstore import FastembedVectorstore, FastembedEmbeddingModel
+from image_processor.icons_index import IconsIndex
+from image_processor.icons_vectorstore import IconsVectorStore
+from ppt_generator.models.query_and_prompt_models import IconCategoryEnum
+
+
+ICONS_EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"
+
+
+def get_icons_embeddings_path() -> str:
+    return os.getenv("ICONS_EMBEDDINGS_PATH") or get_resource(
+        "assets/icons_embeddings.npy"
+    )
+
+
+def get_embedding_model():
+    # ? Imported here, onnxruntime is slow to import and only the loader
+    # ? and the build step need it
+    from fastembed import TextEmbedding
+
+    # ? FASTEMBED_CACHE_PATH points the model files into the image, so the
+    # ? model is not downloaded again at startup
+    return TextEmbedding(
+        ICONS_EMBEDDING_MODEL, cache_dir=os.getenv("FASTEMBED_CACHE_PATH")
+    )
+
+
+# Icon set of each category, relative to assets/icons
+ICON_CATEGORY_DIRS = {
+    IconCategoryEnum.solid: "bold",
+    IconCategoryEnum.semi_solid: "duotone",
+    IconCategoryEnum.outline: "regular",
+}
+
+
+def get_icon_names() -> List[str]:
+    """
+    Returns icon names as paths relative to assets/icons without the
+    extension, e.g. bold/acorn-bold, for every icon set that is present.
+    """
+    icon_names = []
+    for icons_dir in ICON_CATEGORY_DIRS.values():
+        icons_path = get_resource(f"assets/icons/{icons_dir}")
+        if not os.path.isdir(icons_path):
+            continue
+        icon_names += [
+            f"{icons_dir}/{os.path.splitext(each)[0]}"
+            for each in os.listdir(icons_path)
+            if each.endswith(".png")
+        ]
+    return sorted(icon_names)
+
+
+def get_icon_path(icon_name: str) -> str:
+    return get_resource(f"assets/icons/{icon_name}.png")
+
+
+def get_icon_tags() -> Dict[str, List[str]]:
+    # ? assets/icons.json is optional, icons are still found by name without it
+    icons_json_path = get_resource("assets/icons.json")
+    if not os.path.exists(icons_json_path):
+        return {}
+    with open(icons_json_path, "r") as f:
+        icons = json.load(f)["icons"]
+
+    icon_tags = {}
+    for each in icons:
+        tags = each.get("tags") or []
+        if isinstance(tags, str):
+            tags = [tag.strip() for tag in tags.split(",") if tag.strip()]
+        icon_tags[each["name"]] = tags
+    return icon_tags
+
+
+def get_icon_category(icon_name: str) -> Optional[IconCategoryEnum]:
+    icons_dir = icon_name.rpartition("/")[0]
+    for category, each in ICON_CATEGORY_DIRS.items():
+        if each == icons_dir:
+            return category
+    return None
+
+
+def get_icon_document(
+    icon_name: str, icon_tags: Optional[Dict[str, List[str]]] = None
+) -> str:
+    # bold/address-book-tabs-bold -> address book tabs, followed by its tags
+    icons_dir, _, file_name = icon_name.rpartition("/")
+    words = file_name.split("-")
+    if icons_dir and words[-1] == icons_dir:
+        words = words[:-1]
+    return " ".join(words + (icon_tags or {}).get(file_name, []))
+
+
+def build_icons_embeddings(
+    embeddings_path: Optional[str] = None,
+    dtype: str = "float32",
+    embedding_model=None,
+):
+    embeddings_path = embeddings_path or get_icons_embeddings_path()
+    embedding_model = embedding_model or get_embedding_model()
+
+    icon_names = get_icon_names()
+    icon_tags = get_icon_tags()
+    embeddings = embedding_model.passage_embed(
+        [get_icon_document(each, icon_tags) for each in icon_names]
+    )
+    IconsVectorStore.save(embeddings_path, embeddings, icon_names, dtype)
+    return embeddings_path
+
+
+_ICONS_VECTORSTORE: Optional[IconsVectorStore] = None
+_ICONS_VECTORSTORE_LOCK = threading.Lock()
+
+
+def get_icons_vectorstore() -> IconsVectorStore:
+    """
+    Returns the shared icon vector store, loading it on the first call.
+    The server calls this at startup, so requests never pay for loading.
+    """
+    global _ICONS_VECTORSTORE
+    if _ICONS_VECTORSTORE is not None:
+        return _ICONS_VECTORSTORE
+
+    with _ICONS_VECTORSTORE_LOCK:
+        if _ICONS_VECTORSTORE is None:
+            embeddings_path = get_icons_embeddings_path()
+            embedding_model = get_embedding_model()
+            if not os.path.exists(embeddings_path):
+                # ? Only happens when running from source without the build step
+                print("Icon embeddings not found, building them at ", embeddings_path)
+                build_icons_embeddings(embeddings_path, embedding_model=embedding_model)
+            _ICONS_VECTORSTORE = IconsVectorStore.load(embeddings_path, embedding_model)
+    return _ICONS_VECTORSTORE
+
+
+_ICONS_INDEX: Optional[IconsIndex] = None
 
 
-def get_icons_vectorstore():
-    vector_store_path = get_resource("assets/icons_vectorstore.json")
-    embedding_model = FastembedEmbeddingModel.BGESmallENV15
+def get_icons_index() -> IconsIndex:
+    """
+    Returns the shared hybrid icon index over the icon vector store.
+    """
+    global _ICONS_INDEX
+    if _ICONS_INDEX is not None:
+        return _ICONS_INDEX
 
-    if os.path.exists(vector_store_path):
-        return FastembedVectorstore.load(embedding_model, vector_store_path)
+    vector_store = get_icons_vectorstore()
+    with _ICONS_VECTORSTORE_LOCK:
+        if _ICONS_INDEX is None:
+            icon_tags = get_icon_tags()
+            _ICONS_INDEX = IconsIndex(
+                vector_store,
+                [get_icon_document(each, icon_tags) for each in vector_store.names],
+                [get_icon_category(each) for each in vector_store.names],
+                cache_size=int(os.getenv("ICON_SEARCH_CACHE_SIZE", "256")),
+            )
+    return _ICONS_INDEX
 
-    vector_store = FastembedVectorstore(embedding_model)
-    with open(get_resource("assets/icons.json"), "r") as f:
-        icons = json.load(f)
-    documents = []
-    for each in icons["icons"]:
-        if each["name"].split("-")[-1] == "bold":
-            documents.append(f"{each['name']}||{each['tags']}")
 
-    vector_store.embed_documents(documents)
-    vector_store.save(vector_store_path)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the icon embeddings")
+    parser.add_argument("--output", help="Defaults to assets/icons_embeddings.npy")
+    parser.add_argument("--dtype", choices=["float32", "int8"], default="float32")
+    args = parser.parse_args()
 
-    return vector_store
+    print("Saved icon embeddings to ", build_icons_embeddings(args.output, args.dtype))
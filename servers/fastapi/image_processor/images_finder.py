@@ -8,6 +8,7 @@ from google.genai.types import GenerateContentConfig
 from ppt_generator.models.query_and_prompt_models import (
     ImagePromptWithThemeAndAspectRatio,
 )
+from api.services.instances import LLM_SCHEDULER_SERVICE
 from api.utils.utils import download_file, get_resource
 from api.utils.model_utils import (
     get_llm_client,
@@ -31,16 +32,15 @@ async def generate_image(
     print(f"Request - Generating Image for {image_prompt}")
 
     try:
-        image_gen_func = (
-            get_image_from_pexels
-            if is_ollama or is_custom_llm
-            else (
-                generate_image_openai
-                if os.getenv("LLM") == "openai"
-                else generate_image_google
-            )
+        if is_ollama or is_custom_llm:
+            image_gen_func, lane = get_image_from_pexels, "pexels"
+        elif os.getenv("LLM") == "openai":
+            image_gen_func, lane = generate_image_openai, "openai_images"
+        else:
+            image_gen_func, lane = generate_image_google, "google_images"
+        image_path = await LLM_SCHEDULER_SERVICE.run(
+            lane, lambda: image_gen_func(image_prompt, output_directory)
         )
-        image_path = await image_gen_func(image_prompt, output_directory)
         if image_path and os.path.exists(image_path):
             return image_path
         raise Exception(f"Image not found at {image_path}")
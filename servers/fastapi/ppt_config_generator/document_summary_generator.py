@@ -1,8 +1,7 @@
 import asyncio
 from typing import List
-from openai.types.chat.chat_completion import ChatCompletion
 
-from api.utils.model_utils import get_llm_client, get_nano_model
+from api.utils.model_utils import create_chat_completion_content, get_nano_model
 
 sysmte_prompt = """
 Generate a blog-style summary of the provided document in **more than 2000 words**.
@@ -21,24 +20,22 @@ Maintain as much information as possible.
 """
 
 
-async def generate_document_summary(documents: List[str]):
-    client = get_llm_client()
+async def generate_document_summary(documents: List[str], use_cache: bool = True):
     model = get_nano_model()
 
     coroutines = []
     for document in documents:
         truncated_text = document[:200000]
-        coroutine = client.chat.completions.create(
+        coroutine = create_chat_completion_content(
             model=model,
             messages=[
                 {"role": "system", "content": sysmte_prompt},
                 {"role": "user", "content": truncated_text},
             ],
+            use_cache=use_cache,
         )
         coroutines.append(coroutine)
 
-    completions: List[ChatCompletion] = await asyncio.gather(*coroutines)
-    combined = "\n\n\n\n".join(
-        [completion.choices[0].message.content for completion in completions]
-    )
+    summaries: List[str] = await asyncio.gather(*coroutines)
+    combined = "\n\n\n\n".join(summaries)
     return combined
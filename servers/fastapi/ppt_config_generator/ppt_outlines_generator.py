@@ -1,6 +1,6 @@
 from typing import Optional
 
-from api.utils.model_utils import get_large_model, get_llm_client
+from api.utils.model_utils import get_large_model, parse_chat_completion
 from api.utils.variable_length_models import (
     get_presentation_markdown_model_with_n_slides,
 )
@@ -53,15 +53,15 @@ async def generate_ppt_content(
     n_slides: int,
     language: Optional[str] = None,
     content: Optional[str] = None,
+    use_cache: bool = True,
 ) -> PresentationMarkdownModel:
-    client = get_llm_client()
     model = get_large_model()
     response_model = get_presentation_markdown_model_with_n_slides(n_slides)
 
-    response = await client.beta.chat.completions.parse(
+    return await parse_chat_completion(
         model=model,
         temperature=0.2,
         messages=get_prompt_template(prompt, n_slides, language, content),
         response_format=response_model,
+        use_cache=use_cache,
     )
-    return response.choices[0].message.parsed
@@ -1,4 +1,4 @@
-from api.utils.model_utils import get_llm_client, get_small_model
+from api.utils.model_utils import get_small_model, parse_chat_completion
 from api.utils.variable_length_models import (
     get_presentation_structure_model_with_n_slides,
 )
@@ -54,20 +54,20 @@ def get_prompt(n_slides: int, data: str):
 
 async def generate_presentation_structure(
     presentation_outline: PresentationMarkdownModel,
+    use_cache: bool = True,
 ) -> PresentationStructureModel:
 
-    client = get_llm_client()
     model = get_small_model()
     response_model = get_presentation_structure_model_with_n_slides(
         len(presentation_outline.slides)
     )
 
-    response = await client.beta.chat.completions.parse(
+    return await parse_chat_completion(
         model=model,
         temperature=0.2,
         messages=get_prompt(
             len(presentation_outline.slides), presentation_outline.to_string()
         ),
         response_format=response_model,
+        use_cache=use_cache,
     )
-    return response.choices[0].message.parsed
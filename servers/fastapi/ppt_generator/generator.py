@@ -1,10 +1,12 @@
-from openai import AsyncStream
+from typing import AsyncIterator
+
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 from api.models import SelectedLLMProvider
 from api.utils.model_utils import (
+    create_chat_completion_content,
     get_large_model,
-    get_llm_client,
     get_selected_llm_provider,
+    stream_chat_completion,
 )
 from ppt_config_generator.models import PresentationMarkdownModel
 from ppt_generator.models.llm_models_with_validations import (
@@ -60,11 +62,10 @@ CREATE_PRESENTATION_PROMPT = """
         - Descriptions should be clear and to the point.
         - Descriptions should not use words like "This slide", "This presentation".
         - If **body** contains items, *choose number of items randomly between mentioned constraints.*
-        - **Icon queries** must be a generic **single word noun**.
-        - Provide 3 icon query for each icon where,
+        - Provide 3 icon queries for each icon, separated by commas in **icon_query**, like "Led bulb, bulb, light", where,
             - First one should be specific like "Led bulb".
-            - Second one should be more generic that first like "bulb".
-            - Third one should be simplest like "light".
+            - Second one should be a more generic noun than first like "bulb".
+            - Third one should be the simplest single word like "light".
 
     **Follow the all the length constraints provided in the schema and notes.**
     **Go through notes and steps and make sure they are all followed. Rule breaks are strictly not allowed.**
@@ -103,54 +104,36 @@ def get_response_format():
     )
 
 
+def get_messages(presentation_outline: PresentationMarkdownModel):
+    return [
+        {
+            "role": "system",
+            "content": get_system_prompt(),
+        },
+        {
+            "role": "user",
+            "content": presentation_outline.to_string(),
+        },
+    ]
+
+
 async def generate_presentation_stream(
     presentation_outline: PresentationMarkdownModel,
-) -> AsyncStream[ChatCompletionChunk]:
-    client = get_llm_client()
-    model = get_large_model()
-
-    response_format = get_response_format()
-
-    response = await client.chat.completions.create(
-        model=model,
-        messages=[
-            {
-                "role": "system",
-                "content": get_system_prompt(),
-            },
-            {
-                "role": "user",
-                "content": presentation_outline.to_string(),
-            },
-        ],
-        response_format=response_format,
-        stream=True,
+) -> AsyncIterator[ChatCompletionChunk]:
+    return stream_chat_completion(
+        model=get_large_model(),
+        messages=get_messages(presentation_outline),
+        response_format=get_response_format(),
     )
 
-    return response
-
 
 async def generate_presentation(
     presentation_outline: PresentationMarkdownModel,
+    use_cache: bool = True,
 ) -> str:
-    client = get_llm_client()
-    model = get_large_model()
-
-    response_format = get_response_format()
-
-    response = await client.chat.completions.create(
-        model=model,
-        messages=[
-            {
-                "role": "system",
-                "content": get_system_prompt(),
-            },
-            {
-                "role": "user",
-                "content": presentation_outline.to_string(),
-            },
-        ],
-        response_format=response_format,
+    return await create_chat_completion_content(
+        model=get_large_model(),
+        messages=get_messages(presentation_outline),
+        response_format=get_response_format(),
+        use_cache=use_cache,
     )
-
-    return response.choices[0].message.content
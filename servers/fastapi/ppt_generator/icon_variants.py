@@ -0,0 +1,201 @@
+import os
+import re
+import threading
+import uuid
+from typing import Iterable, List, Optional
+
+from PIL import Image
+
+from api.utils.utils import get_resource
+from ppt_generator.models.pptx_models import (
+    PptxObjectFitEnum,
+    PptxObjectFitModel,
+    PptxPictureBoxModel,
+)
+from ppt_generator.utils import change_image_color, fit_image
+
+
+# Variants are rendered at the smallest of these sizes that covers the
+# picture box, the bundled icons are 256px
+ICON_VARIANT_SIZES = [32, 64, 128, 256]
+
+HEX_COLOR_PATTERN = re.compile(r"^#?([0-9a-fA-F]{6})$")
+
+
+def normalize_color(color: Optional[str]) -> Optional[str]:
+    match = HEX_COLOR_PATTERN.match(color.strip()) if color else None
+    return match.group(1).lower() if match else None
+
+
+def is_inside(path: str, directory: str) -> bool:
+    return os.path.commonpath([path, directory]) == directory
+
+
+def get_icon_variant_size(width: float, height: float) -> int:
+    box_size = max(width, height)
+    for size in ICON_VARIANT_SIZES:
+        if size >= box_size:
+            return size
+    return ICON_VARIANT_SIZES[-1]
+
+
+class IconVariantCache:
+    """
+    Pre-colored icons on disk, keyed by icon name, color and size.
+
+    Icons recolored with an overlay are rendered once per color and size
+    bucket and exported as is, instead of being recolored on every export
+    and every slide. Variants live under APP_DATA_DIRECTORY/icon_variants
+    (or ICON_VARIANTS_DIR) and can be warmed for the theme palettes up front.
+    """
+
+    def __init__(
+        self, icons_dir: Optional[str] = None, cache_dir: Optional[str] = None
+    ):
+        self.icons_dir = os.path.realpath(icons_dir or get_resource("assets/icons"))
+        # ? Not next to the bundled icons, which may be read-only or a
+        # ? temporary directory when bundled
+        self.cache_dir = os.path.realpath(
+            cache_dir
+            or os.getenv("ICON_VARIANTS_DIR")
+            or os.path.join(os.getenv("APP_DATA_DIRECTORY") or "", "icon_variants")
+        )
+        self._warm_lock = threading.Lock()
+
+    def get_icon_name(self, icon_path: str) -> Optional[str]:
+        """
+        Returns the name of a bundled icon, e.g. bold/acorn-bold, or None if
+        the path is not a bundled icon.
+        """
+        icon_path = os.path.realpath(icon_path)
+        if (
+            not icon_path.endswith(".png")
+            or not is_inside(icon_path, self.icons_dir)
+            or is_inside(icon_path, self.cache_dir)
+        ):
+            return None
+        # ? Only icons of an icon set, model logos live in assets/icons itself
+        if os.path.dirname(icon_path) == self.icons_dir:
+            return None
+        return os.path.relpath(icon_path, self.icons_dir)[: -len(".png")]
+
+    def get_path(self, icon_name: str, color: str, size: int) -> str:
+        return os.path.join(self.cache_dir, color, str(size), f"{icon_name}.png")
+
+    def render(self, icon_name: str, color: str, size: int) -> str:
+        path = self.get_path(icon_name, color, size)
+        with Image.open(os.path.join(self.icons_dir, f"{icon_name}.png")) as icon:
+            image = fit_image(
+                icon.convert("RGBA"),
+                size,
+                size,
+                PptxObjectFitModel(fit=PptxObjectFitEnum.CONTAIN),
+            )
+        image = change_image_color(image, color)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # ? Written under a temporary name and renamed, so concurrent exports
+        # ? never read a partially written variant
+        temp_path = os.path.join(os.path.dirname(path), f".{uuid.uuid4()}.png")
+        image.save(temp_path, format="PNG", optimize=True)
+        os.replace(temp_path, path)
+        return path
+
+    def get(self, icon_name: str, color: str, size: int) -> str:
+        path = self.get_path(icon_name, color, size)
+        if os.path.exists(path):
+            return path
+        return self.render(icon_name, color, size)
+
+    def get_for_picture(self, picture_model: PptxPictureBoxModel) -> Optional[str]:
+        """
+        Returns the pre-colored variant for a recolored icon whose other
+        transforms would not change it, so it can be added without any
+        processing. Returns None for every other picture.
+        """
+        color = normalize_color(picture_model.overlay)
+        if (
+            not color
+            or picture_model.shape
+            or any(picture_model.border_radius or [])
+        ):
+            return None
+        object_fit = picture_model.object_fit
+        if object_fit and object_fit.fit not in (None, PptxObjectFitEnum.CONTAIN):
+            return None
+        # ? Icons are square, clipping or fitting them into a square box
+        # ? only resizes them, which the pptx does on its own
+        width, height = picture_model.position.width, picture_model.position.height
+        if not width or abs(width - height) > 1:
+            return None
+
+        icon_name = self.get_icon_name(picture_model.picture.path)
+        if not icon_name:
+            return None
+        try:
+            return self.get(icon_name, color, get_icon_variant_size(width, height))
+        except OSError as e:
+            print(f"Could not create icon variant for {icon_name}: {e}")
+            return None
+
+    def get_icon_names(self) -> List[str]:
+        icon_names = []
+        for root, dirs, files in os.walk(self.icons_dir):
+            dirs[:] = [
+                each for each in dirs if os.path.join(root, each) != self.cache_dir
+            ]
+            for each in files:
+                icon_name = self.get_icon_name(os.path.join(root, each))
+                if icon_name:
+                    icon_names.append(icon_name)
+        return sorted(icon_names)
+
+    def warm(self, colors: Iterable[str], sizes: Iterable[int]) -> int:
+        """
+        Renders every missing variant of the bundled icons in the given
+        colors and sizes. Returns the number of rendered variants.
+        """
+        colors = sorted({normalize_color(each) for each in colors} - {None})
+        rendered = 0
+        with self._warm_lock:
+            for icon_name in self.get_icon_names():
+                for color in colors:
+                    for size in sizes:
+                        if os.path.exists(self.get_path(icon_name, color, size)):
+                            continue
+                        try:
+                            self.render(icon_name, color, size)
+                            rendered += 1
+                        except OSError as e:
+                            print(f"Could not create icon variant for {icon_name}: {e}")
+        return rendered
+
+    def start_warming(self, colors: Iterable[str]) -> Optional[threading.Thread]:
+        """
+        Warms the variants of the given colors in the background, in the
+        sizes listed in ICON_VARIANT_WARM_SIZES, e.g. 32,64. Warming renders
+        every bundled icon in every color, so it is off unless sizes are set,
+        and variants are otherwise rendered on first use.
+        """
+        sizes = [
+            int(each)
+            for each in os.getenv("ICON_VARIANT_WARM_SIZES", "").split(",")
+            if each.strip()
+        ]
+        if not sizes:
+            return None
+        thread = threading.Thread(
+            target=self.warm, args=(list(colors), sizes), daemon=True
+        )
+        thread.start()
+        return thread
+
+
+_ICON_VARIANT_CACHE: Optional[IconVariantCache] = None
+
+
+def get_icon_variant_cache() -> IconVariantCache:
+    global _ICON_VARIANT_CACHE
+    if _ICON_VARIANT_CACHE is None:
+        _ICON_VARIANT_CACHE = IconVariantCache()
+    return _ICON_VARIANT_CACHE
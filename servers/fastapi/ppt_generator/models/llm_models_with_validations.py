@@ -86,9 +86,9 @@ class LLMHeadingModelWithImagePromptWithValidation(LLMHeadingModelWithImagePromp
 
 class LLMHeadingModelWithIconQueryWithValidation(LLMHeadingModelWithIconQuery):
     icon_query: str = Field(
-        description="Item icon query in about 4 words",
-        min_length=10,
-        max_length=40,
+        description="3 comma separated item icon queries, specific to simplest",
+        min_length=3,
+        max_length=80,
     )
 
 
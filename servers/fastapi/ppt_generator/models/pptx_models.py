@@ -12,6 +12,11 @@ class PptxBoxShapeEnum(Enum):
     CIRCLE = "circle"
 
 
+class PptxRendererEnum(Enum):
+    PYTHON_PPTX = "python-pptx"
+    LXML = "lxml"
+
+
 class PptxObjectFitEnum(Enum):
     CONTAIN = "contain"
     COVER = "cover"
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import uuid
+from typing import Optional
+
+from ppt_generator.models.pptx_models import PptxPictureBoxModel
+
+
+# Bump when picture transforms change output, so stale entries are not reused
+PICTURE_CACHE_VERSION = 2
+
+
+class PictureCache:
+    """
+    Persistent cache of transformed export pictures.
+
+    Entries are keyed by the source file content hash and the transform
+    parameters of the picture, so the same picture is only processed once
+    across exports. File modification times are used for LRU eviction,
+    which keeps the cache safe to share between worker processes.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir or os.getenv("PPTX_PICTURE_CACHE_DIR")
+        if not self.cache_dir and os.getenv("APP_DATA_DIRECTORY"):
+            self.cache_dir = os.path.join(
+                os.getenv("APP_DATA_DIRECTORY"), "cache", "pictures"
+            )
+        if max_bytes is None:
+            max_bytes = int(os.getenv("PPTX_PICTURE_CACHE_MAX_MB", "512")) * 1024 * 1024
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.cache_dir) and self.max_bytes > 0
+
+    @staticmethod
+    def get_file_hash(file_path: str) -> str:
+        file_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                file_hash.update(block)
+        return file_hash.hexdigest()
+
+    @staticmethod
+    def get_transform_params(picture_model: PptxPictureBoxModel) -> dict:
+        # ? Position offsets and margin do not change the processed image
+        return {
+            "version": PICTURE_CACHE_VERSION,
+            "width": picture_model.position.width,
+            "height": picture_model.position.height,
+            "clip": picture_model.clip,
+            "border_radius": picture_model.border_radius,
+            "shape": picture_model.shape.value if picture_model.shape else None,
+            "overlay": picture_model.overlay,
+            "object_fit": (
+                picture_model.object_fit.model_dump(mode="json")
+                if picture_model.object_fit
+                else None
+            ),
+        }
+
+    def get_key(self, picture_model: PptxPictureBoxModel) -> Optional[str]:
+        try:
+            source_hash = self.get_file_hash(picture_model.picture.path)
+        except OSError:
+            return None
+        params = json.dumps(self.get_transform_params(picture_model), sort_keys=True)
+        return hashlib.sha256(f"{source_hash}:{params}".encode()).hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.picture")
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self.get_path(key)
+        try:
+            with open(path, "rb") as f:
+                picture = f.read()
+            # Marks the entry as recently used
+            os.utime(path)
+        except OSError:
+            return None
+        return picture
+
+    def set(self, key: str, picture: bytes) -> str:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.get_path(key)
+        # ? Written under a temporary name and renamed, so other processes
+        # ? never see a partially written picture
+        temp_path = os.path.join(self.cache_dir, f".{uuid.uuid4()}.picture")
+        with open(temp_path, "wb") as f:
+            f.write(picture)
+        os.replace(temp_path, path)
+        return path
+
+    def get_size(self) -> int:
+        return sum(size for _, _, size in self._get_entries())
+
+    def evict(self) -> int:
+        """
+        Removes least recently used entries until the cache fits in
+        max_bytes. Returns the number of removed entries.
+        """
+        if not self.enabled:
+            return 0
+        entries = sorted(self._get_entries(), key=lambda entry: entry[1])
+        total_size = sum(size for _, _, size in entries)
+
+        removed = 0
+        for path, _, size in entries:
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+            removed += 1
+        return removed
+
+    def _get_entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.startswith(".") or not entry.name.endswith(".picture"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.path, stat.st_mtime, stat.st_size))
+        return entries
+
+
+_PICTURE_CACHE: Optional[PictureCache] = None
+
+
+def get_picture_cache() -> PictureCache:
+    # ? Created per process, worker processes read the same environment
+    global _PICTURE_CACHE
+    if _PICTURE_CACHE is None:
+        _PICTURE_CACHE = PictureCache()
+    return _PICTURE_CACHE
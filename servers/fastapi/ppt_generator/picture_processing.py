@@ -0,0 +1,166 @@
+import multiprocessing
+import os
+from io import BytesIO
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+from PIL import Image
+
+from ppt_generator.models.pptx_models import PptxBoxShapeEnum, PptxPictureBoxModel
+from ppt_generator.picture_cache import get_picture_cache
+from ppt_generator.utils import (
+    change_image_color,
+    clip_image,
+    create_circle_image,
+    fit_image,
+    round_image_corners,
+)
+
+
+_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def get_picture_workers_count() -> int:
+    return int(os.getenv("PPTX_EXPORT_WORKERS", str(os.cpu_count() or 1)))
+
+
+def get_picture_process_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Returns the shared process pool for picture processing, or None when
+    PPTX_EXPORT_WORKERS is 0 and pictures should be processed inline.
+    """
+    global _PROCESS_POOL
+    workers_count = get_picture_workers_count()
+    if workers_count <= 0:
+        return None
+    if _PROCESS_POOL is None:
+        # ? Spawned, forking a process that runs the event loop and threads
+        # ? is not safe
+        _PROCESS_POOL = ProcessPoolExecutor(
+            max_workers=workers_count,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _PROCESS_POOL
+
+
+def shutdown_picture_process_pool():
+    global _PROCESS_POOL
+    if _PROCESS_POOL is not None:
+        _PROCESS_POOL.shutdown(wait=False, cancel_futures=True)
+        _PROCESS_POOL = None
+
+
+def needs_processing(picture_model: PptxPictureBoxModel) -> bool:
+    return bool(
+        picture_model.clip
+        or picture_model.border_radius
+        or picture_model.overlay
+        or picture_model.object_fit
+        or picture_model.shape
+    )
+
+
+def transform_picture(
+    image: Image.Image, picture_model: PptxPictureBoxModel
+) -> Image.Image:
+    image = image.convert("RGBA")
+    # ? Applying border radius twice to support both clip and object fit
+    if picture_model.border_radius:
+        image = round_image_corners(image, picture_model.border_radius)
+    if picture_model.object_fit:
+        image = fit_image(
+            image,
+            picture_model.position.width,
+            picture_model.position.height,
+            picture_model.object_fit,
+        )
+    elif picture_model.clip:
+        image = clip_image(
+            image,
+            picture_model.position.width,
+            picture_model.position.height,
+        )
+    if picture_model.border_radius:
+        image = round_image_corners(image, picture_model.border_radius)
+    if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
+        image = create_circle_image(image)
+    if picture_model.overlay:
+        image = change_image_color(image, picture_model.overlay)
+    return image
+
+
+def encode_picture(image: Image.Image) -> bytes:
+    """
+    Encodes a processed picture for the pptx. Pictures with transparency are
+    saved as optimized PNG and opaque pictures as JPEG, which is much smaller
+    for photos. WebP is not used as pptx does not support it.
+    """
+    buffer = BytesIO()
+    if image.mode == "RGBA" and image.getchannel("A").getextrema()[0] < 255:
+        image.save(buffer, format="PNG", optimize=True)
+    else:
+        image.convert("RGB").save(
+            buffer,
+            format="JPEG",
+            quality=int(os.getenv("PPTX_EXPORT_JPEG_QUALITY", "90")),
+            optimize=True,
+        )
+    return buffer.getvalue()
+
+
+def process_picture(picture_model: dict) -> Optional[bytes]:
+    """
+    Applies the picture transforms and returns the encoded picture, reusing
+    the picture cache when it is enabled. Takes and returns plain values so
+    it can run in a worker process. Returns None if the image can not be
+    opened.
+    """
+    picture_model = PptxPictureBoxModel(**picture_model)
+    image_path = picture_model.picture.path
+
+    picture_cache = get_picture_cache()
+    cache_key = picture_cache.get_key(picture_model) if picture_cache.enabled else None
+    if cache_key:
+        cached_picture = picture_cache.get(cache_key)
+        if cached_picture:
+            return cached_picture
+
+    try:
+        image = Image.open(image_path)
+    except:
+        print(f"Could not open image: {image_path}")
+        return None
+
+    picture = encode_picture(transform_picture(image, picture_model))
+    if cache_key:
+        picture_cache.set(cache_key, picture)
+    return picture
+
+
+def process_pictures(
+    picture_models: List[PptxPictureBoxModel],
+    executor: Optional[Executor] = None,
+) -> Dict[int, Optional[bytes]]:
+    """
+    Processes every picture that needs transforms, in parallel when an
+    executor is given. Returns encoded pictures keyed by id(picture_model).
+    """
+    picture_models = [each for each in picture_models if needs_processing(each)]
+    if executor is None or len(picture_models) < 2:
+        return {
+            id(each): process_picture(each.model_dump(mode="json"))
+            for each in picture_models
+        }
+
+    try:
+        futures = {
+            id(each): executor.submit(process_picture, each.model_dump(mode="json"))
+            for each in picture_models
+        }
+        return {key: future.result() for key, future in futures.items()}
+    except BrokenProcessPool:
+        print("Picture process pool is broken, processing pictures inline")
+        if executor is _PROCESS_POOL:
+            shutdown_picture_process_pool()
+        return process_pictures(picture_models)
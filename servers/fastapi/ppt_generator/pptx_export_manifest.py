@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from ppt_generator.models.pptx_models import (
+    PptxPictureBoxModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+
+
+# Bump when the exporter changes its output, so old packages are rebuilt
+PPTX_EXPORT_VERSION = 2
+
+EXPORT_MANIFEST_FILENAME = "export_manifest.json"
+
+
+def get_file_signature(file_path: str) -> Optional[List[int]]:
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def get_slide_hash(slide_model: PptxSlideModel) -> str:
+    """
+    Hashes the slide model together with the size and modification time of
+    its pictures, so a picture replaced in place also changes the hash.
+    """
+    pictures = [
+        get_file_signature(shape_model.picture.path)
+        for shape_model in slide_model.shapes
+        if type(shape_model) is PptxPictureBoxModel
+    ]
+    content = json.dumps(
+        [slide_model.model_dump(mode="json"), pictures], sort_keys=True
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def get_presentation_hash(ppt_model: PptxPresentationModel, theme: Optional[dict]) -> str:
+    # Everything that is shared by all slides, a change here rebuilds all of them
+    content = json.dumps(
+        [
+            PPTX_EXPORT_VERSION,
+            ppt_model.background_color,
+            [each.model_dump(mode="json") for each in ppt_model.shapes or []],
+            theme,
+        ],
+        sort_keys=True,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class PptxExportManifest(BaseModel):
+    """
+    Describes the last exported package of a presentation, with the content
+    hash of every slide it was built from.
+    """
+
+    path: str
+    signature: List[int]
+    presentation_hash: str
+    slide_hashes: List[str]
+
+    @classmethod
+    def get_manifest_path(cls, presentation_dir: str) -> str:
+        return os.path.join(presentation_dir, EXPORT_MANIFEST_FILENAME)
+
+    @classmethod
+    def load(cls, presentation_dir: str) -> Optional["PptxExportManifest"]:
+        try:
+            with open(cls.get_manifest_path(presentation_dir), "r") as f:
+                return cls(**json.load(f))
+        except Exception:
+            return None
+
+    @classmethod
+    def create(
+        cls, path: str, presentation_hash: str, slide_hashes: List[str]
+    ) -> "PptxExportManifest":
+        return cls(
+            path=path,
+            signature=get_file_signature(path),
+            presentation_hash=presentation_hash,
+            slide_hashes=slide_hashes,
+        )
+
+    def save(self, presentation_dir: str):
+        with open(self.get_manifest_path(presentation_dir), "w") as f:
+            json.dump(self.model_dump(mode="json"), f)
+
+    def can_update(self, presentation_hash: str) -> bool:
+        """
+        Whether the exported package can be reused, which is when nothing
+        shared by all slides changed and the file was not modified since.
+        """
+        return (
+            self.presentation_hash == presentation_hash
+            and get_file_signature(self.path) == self.signature
+        )
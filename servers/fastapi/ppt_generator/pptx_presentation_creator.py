@@ -1,6 +1,5 @@
-import os
-from typing import List, Optional
-import uuid
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
 from lxml import etree
 
 from pptx import Presentation
@@ -9,13 +8,11 @@ from pptx.slide import Slide
 from pptx.text.text import _Paragraph, TextFrame, Font, _Run
 from pptx.opc.constants import RELATIONSHIP_TYPE as RT
 from lxml.etree import fromstring, tostring
-from PIL import Image
 
 from pptx.util import Pt
 from pptx.dml.color import RGBColor
 from ppt_generator.models.pptx_models import (
     PptxAutoShapeBoxModel,
-    PptxBoxShapeEnum,
     PptxConnectorModel,
     PptxFillModel,
     PptxFontModel,
@@ -30,32 +27,112 @@ from ppt_generator.models.pptx_models import (
     PptxTextBoxModel,
     PptxTextRunModel,
 )
-from ppt_generator.utils import (
-    clip_image,
-    fit_image,
-    round_image_corners,
-    create_circle_image,
-    change_image_color,
+from ppt_generator.icon_variants import get_icon_variant_cache
+from ppt_generator.picture_cache import get_picture_cache
+from ppt_generator.pptx_export_manifest import get_slide_hash
+from ppt_generator.picture_processing import (
+    get_picture_process_pool,
+    needs_processing,
+    process_picture,
+    process_pictures,
 )
 
 BLANK_SLIDE_LAYOUT = 6
 
 
+# Markers in the order they are matched, with the font changes they apply
+MARKDOWN_MARKERS = {
+    "***": {"bold": True, "italic": True},
+    "**": {"bold": True},
+    "__": {"italic": True},
+}
+
+
+def tokenize_markdown_line(line: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    Splits a line into (text, marker) tokens in a single pass, where marker
+    is the markdown marker around the text or None for plain text.
+
+    A marker only opens a span when the same marker closes it later in the
+    line, otherwise it is kept as plain text. Empty spans are kept.
+    """
+    tokens = []
+    # marker -> (searched from, found at), reused while it is still valid
+    found_markers: Dict[str, Tuple[int, int]] = {}
+
+    def find_marker(marker: str, start: int) -> int:
+        searched_from, found_at = found_markers.get(marker, (None, None))
+        if searched_from is None or not (
+            searched_from <= start and (found_at == -1 or found_at >= start)
+        ):
+            found_at = line.find(marker, start)
+            found_markers[marker] = (start, found_at)
+        return found_at
+
+    position = 0
+    line_length = len(line)
+    while position < line_length:
+        unclosed_length = 1
+        for marker in MARKDOWN_MARKERS:
+            if not line.startswith(marker, position):
+                continue
+            unclosed_length = max(unclosed_length, len(marker))
+            content_start = position + len(marker)
+            end_position = find_marker(marker, content_start)
+            if end_position != -1:
+                tokens.append((line[content_start:end_position], marker))
+                position = end_position + len(marker)
+                break
+        else:
+            # Plain text up to the next marker, an unclosed marker at the
+            # current position is part of the text
+            end_position = line_length
+            for marker in MARKDOWN_MARKERS:
+                marker_position = find_marker(marker, position + unclosed_length)
+                if marker_position != -1 and marker_position < end_position:
+                    end_position = marker_position
+            tokens.append((line[position:end_position], None))
+            position = end_position
+
+    return tokens
+
+
+def get_slide_hashes(ppt_model: PptxPresentationModel) -> List[str]:
+    return [get_slide_hash(slide_model) for slide_model in ppt_model.slides]
+
+
 class PptxPresentationCreator:
 
-    def __init__(self, ppt_model: PptxPresentationModel, temp_dir: str):
+    def __init__(
+        self,
+        ppt_model: PptxPresentationModel,
+        temp_dir: str,
+        theme_colors: Optional[Dict[str, str]] = None,
+    ):
         self._temp_dir = temp_dir
+        # pptx color scheme slots, e.g. {"dk1": "000000"}
+        self._theme_colors = theme_colors
 
         self._ppt_model = ppt_model
         self._slide_models = ppt_model.slides
 
+        self.reset_ppt()
+
+        self._slide_fill = PptxFillModel(color=ppt_model.background_color)
+        self._processed_pictures = {}
+        self._icon_variants: Dict[int, str] = {}
+        self._font_variants: Dict[tuple, PptxFontModel] = {}
+
+    def reset_ppt(self):
         self._ppt = Presentation()
         self._ppt.slide_width = Pt(1280)
         self._ppt.slide_height = Pt(720)
 
-        self._slide_fill = PptxFillModel(color=ppt_model.background_color)
-
     def create_ppt(self):
+        if self._theme_colors:
+            self.set_presentation_theme()
+
+        self.preprocess_pictures(self._slide_models)
 
         for slide_model in self._slide_models:
             # Adding global shapes to slide
@@ -64,6 +141,63 @@ class PptxPresentationCreator:
 
             self.add_and_populate_slide(slide_model)
 
+        get_picture_cache().evict()
+
+    def update_ppt(self, previous_path: str, previous_slide_hashes: List[str]) -> int:
+        """
+        Builds the presentation from a previous export of the same deck,
+        rebuilding only the slides whose hash changed. The theme, background
+        and global shapes must be unchanged. Returns the number of rebuilt
+        slides.
+        """
+        self._ppt = Presentation(previous_path)
+
+        n_previous_slides = len(self._ppt.slides)
+        for index in reversed(range(len(self._slide_models), n_previous_slides)):
+            self.remove_slide(index)
+
+        changed_indexes = [
+            index
+            for index, slide_hash in enumerate(get_slide_hashes(self._ppt_model))
+            if index >= len(previous_slide_hashes)
+            or index >= n_previous_slides
+            or previous_slide_hashes[index] != slide_hash
+        ]
+        self.preprocess_pictures([self._slide_models[i] for i in changed_indexes])
+
+        for index in changed_indexes:
+            slide_model = self._slide_models[index]
+            # Adding global shapes to slide
+            if self._ppt_model.shapes:
+                slide_model.shapes.append(self._ppt_model.shapes)
+
+            if index < n_previous_slides:
+                slide = self._ppt.slides[index]
+                self.clear_slide(slide)
+                self.populate_slide(slide, slide_model)
+            else:
+                self.add_and_populate_slide(slide_model)
+
+        get_picture_cache().evict()
+        return len(changed_indexes)
+
+    def remove_slide(self, index: int):
+        slide_ids = self._ppt.slides._sldIdLst
+        slide_id = slide_ids[index]
+        slide_ids.remove(slide_id)
+        self._ppt.part.drop_rel(slide_id.rId)
+
+    def clear_slide(self, slide: Slide):
+        shape_tree = slide.shapes._spTree
+        # ? First two children are the group properties of the shape tree
+        for shape_element in list(shape_tree)[2:]:
+            shape_tree.remove(shape_element)
+
+        # Pictures are the only shapes with relationships
+        for rId, relationship in list(slide.part.rels.items()):
+            if relationship.reltype == RT.IMAGE:
+                slide.part.drop_rel(rId)
+
     def set_presentation_theme(self):
         slide_master = self._ppt.slide_master
         slide_master_part = slide_master.part
@@ -71,22 +205,29 @@ class PptxPresentationCreator:
         theme_part = slide_master_part.part_related_by(RT.THEME)
         theme = fromstring(theme_part.blob)
 
-        theme_colors = self._theme.colors.theme_color_mapping
         nsmap = {"a": "http://schemas.openxmlformats.org/drawingml/2006/main"}
 
-        for color_name, hex_value in theme_colors.items():
-            if color_name:
-                color_element = theme.xpath(
-                    f"a:themeElements/a:clrScheme/a:{color_name}/a:srgbClr",
-                    namespaces=nsmap,
-                )[0]
-                color_element.set("val", hex_value.encode("utf-8"))
+        for color_name, hex_value in self._theme_colors.items():
+            slot_elements = theme.xpath(
+                f"a:themeElements/a:clrScheme/a:{color_name}", namespaces=nsmap
+            )
+            if not slot_elements:
+                continue
+            # ? Default template uses sysClr for dk1 and lt1, replace with srgbClr
+            slot_element = slot_elements[0]
+            for child in list(slot_element):
+                slot_element.remove(child)
+            etree.SubElement(
+                slot_element, f"{{{nsmap['a']}}}srgbClr", val=hex_value
+            )
 
         theme_part._blob = tostring(theme)
 
     def add_and_populate_slide(self, slide_model: PptxSlideModel):
         slide = self._ppt.slides.add_slide(self._ppt.slide_layouts[BLANK_SLIDE_LAYOUT])
+        self.populate_slide(slide, slide_model)
 
+    def populate_slide(self, slide: Slide, slide_model: PptxSlideModel):
         if self._slide_fill:
             self.apply_fill_to_shape(slide.background, self._slide_fill)
 
@@ -114,52 +255,48 @@ class PptxPresentationCreator:
         connector_shape.line.width = Pt(connector_model.thickness)
         connector_shape.line.color.rgb = RGBColor.from_string(connector_model.color)
 
+    def preprocess_pictures(self, slide_models: List[PptxSlideModel]):
+        # ? Image transforms are CPU bound, run them all up front on the
+        # ? process pool so slide assembly only picks up finished files
+        picture_models = []
+        icon_variant_cache = get_icon_variant_cache()
+        for slide_model in slide_models:
+            for shape_model in slide_model.shapes:
+                if type(shape_model) is not PptxPictureBoxModel:
+                    continue
+                # Recolored icons are added from their pre-colored variant
+                icon_variant = icon_variant_cache.get_for_picture(shape_model)
+                if icon_variant:
+                    self._icon_variants[id(shape_model)] = icon_variant
+                else:
+                    picture_models.append(shape_model)
+        self._processed_pictures = process_pictures(
+            picture_models, get_picture_process_pool()
+        )
+
     def add_picture(self, slide: Slide, picture_model: PptxPictureBoxModel):
-        image_path = picture_model.picture.path
-        if (
-            picture_model.clip
-            or picture_model.border_radius
-            or picture_model.overlay
-            or picture_model.object_fit
-            or picture_model.shape
-        ):
-            try:
-                image = Image.open(image_path)
-            except:
-                print(f"Could not open image: {image_path}")
+        image_file = picture_model.picture.path
+        icon_variant = self._icon_variants.get(
+            id(picture_model)
+        ) or get_icon_variant_cache().get_for_picture(picture_model)
+        if icon_variant:
+            image_file = icon_variant
+        elif needs_processing(picture_model):
+            # ? Processed pictures stay in memory and are added without a
+            # ? round trip through the temp directory
+            if id(picture_model) in self._processed_pictures:
+                picture = self._processed_pictures[id(picture_model)]
+            else:
+                picture = process_picture(picture_model.model_dump(mode="json"))
+            if picture is None:
                 return
-
-            image = image.convert("RGBA")
-            # ? Applying border radius twice to support both clip and object fit
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.object_fit:
-                image = fit_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
-                    picture_model.object_fit,
-                )
-            elif picture_model.clip:
-                image = clip_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
-                )
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
-                image = create_circle_image(image)
-            if picture_model.overlay:
-                image = change_image_color(image, picture_model.overlay)
-            image_path = os.path.join(self._temp_dir, f"{str(uuid.uuid4())}.png")
-            image.save(image_path)
+            image_file = BytesIO(picture)
 
         margined_position = self.get_margined_position(
             picture_model.position, picture_model.margin
         )
 
-        slide.shapes.add_picture(image_path, *margined_position.to_pt_list())
+        slide.shapes.add_picture(image_file, *margined_position.to_pt_list())
 
     def add_autoshape(self, slide: Slide, autoshape_box_model: PptxAutoShapeBoxModel):
         position = autoshape_box_model.position
@@ -225,73 +362,39 @@ class PptxPresentationCreator:
             text_run = paragraph.add_run()
             self.populate_text_run(text_run, text_run_model)
 
+    def get_font_variant(self, font: PptxFontModel, marker: str) -> PptxFontModel:
+        # ? Shared by every run with the same font and marker, runs only read it
+        key = (
+            font.name,
+            font.size,
+            font.bold,
+            font.italic,
+            font.color,
+            marker,
+        )
+        font_variant = self._font_variants.get(key)
+        if font_variant is None:
+            font_variant = font.model_copy(update=MARKDOWN_MARKERS[marker])
+            self._font_variants[key] = font_variant
+        return font_variant
+
     def parse_markdown_text_to_text_runs(self, font: PptxFontModel, text: str):
         text_runs = []
-        for line in text.split("\n"):
-            current_pos = 0
-            while current_pos < len(line):
-                # Check for bold and italic (***text***)
-                if (
-                    line[current_pos:].startswith("***")
-                    and "***" in line[current_pos + 3 :]
-                ):
-                    end_pos = line.find("***", current_pos + 3)
-                    text_content = line[current_pos + 3 : end_pos]
-                    font_json = font.model_dump()
-                    font_json["bold"] = True
-                    font_json["italic"] = True
-                    text_runs.append(
-                        PptxTextRunModel(
-                            text=text_content, font=PptxFontModel(**font_json)
-                        )
-                    )
-                    current_pos = end_pos + 3
-                # Check for bold (**text**)
-                elif (
-                    line[current_pos:].startswith("**")
-                    and "**" in line[current_pos + 2 :]
-                ):
-                    end_pos = line.find("**", current_pos + 2)
-                    text_content = line[current_pos + 2 : end_pos]
-                    font_json = font.model_dump()
-                    font_json["bold"] = True
-                    text_runs.append(
-                        PptxTextRunModel(
-                            text=text_content, font=PptxFontModel(**font_json)
-                        )
-                    )
-                    current_pos = end_pos + 2
-                # Check for italic (*text*)
-                elif (
-                    line[current_pos:].startswith("__")
-                    and "__" in line[current_pos + 2 :]
-                ):
-                    end_pos = line.find("__", current_pos + 2)
-                    text_content = line[current_pos + 2 : end_pos]
-                    font_json = font.model_dump()
-                    font_json["italic"] = True
+        lines = text.split("\n")
+        last_line = lines[-1]
+        for line in lines:
+            for text_content, marker in tokenize_markdown_line(line):
+                if marker:
                     text_runs.append(
                         PptxTextRunModel(
-                            text=text_content, font=PptxFontModel(**font_json)
+                            text=text_content, font=self.get_font_variant(font, marker)
                         )
                     )
-                    current_pos = end_pos + 2
                 else:
-                    # Find the next formatting marker or end of line
-                    next_marker = float("inf")
-                    for marker in ["***", "**", "__"]:
-                        pos = line.find(marker, current_pos)
-                        if pos != -1:
-                            next_marker = min(next_marker, pos)
-
-                    end_pos = next_marker if next_marker != float("inf") else len(line)
-                    text_content = line[current_pos:end_pos]
-                    if text_content:  # Only add non-empty text
-                        text_runs.append(PptxTextRunModel(text=text_content, font=font))
-                    current_pos = end_pos
+                    text_runs.append(PptxTextRunModel(text=text_content, font=font))
 
             # Add newline if not the last line
-            if line != text.split("\n")[-1]:
+            if line != last_line:
                 text_runs.append(PptxTextRunModel(text="\n"))
 
         return text_runs
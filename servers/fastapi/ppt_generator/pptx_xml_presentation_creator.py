@@ -0,0 +1,361 @@
+from copy import deepcopy
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE, MSO_CONNECTOR_TYPE
+from pptx.enum.text import PP_ALIGN
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+from pptx.oxml.shapes.autoshape import CT_Shape
+from pptx.oxml.shapes.connector import CT_Connector
+from pptx.oxml.text import CT_RegularTextRun
+from pptx.shapes.autoshape import AdjustmentCollection, AutoShapeType
+from pptx.slide import Slide
+from pptx.util import Pt
+
+from ppt_generator.models.pptx_models import (
+    PptxAutoShapeBoxModel,
+    PptxConnectorModel,
+    PptxFillModel,
+    PptxFontModel,
+    PptxParagraphModel,
+    PptxPictureBoxModel,
+    PptxShadowModel,
+    PptxSpacingModel,
+    PptxStrokeModel,
+    PptxTextBoxModel,
+    PptxTextRunModel,
+)
+from ppt_generator.pptx_presentation_creator import PptxPresentationCreator
+
+
+@lru_cache(maxsize=None)
+def get_textbox_template() -> CT_Shape:
+    return CT_Shape.new_textbox_sp(0, "", 0, 0, 0, 0)
+
+
+@lru_cache(maxsize=None)
+def get_autoshape_template(prst: str) -> CT_Shape:
+    return CT_Shape.new_autoshape_sp(0, "", prst, 0, 0, 0, 0)
+
+
+@lru_cache(maxsize=None)
+def get_connector_template(prst: str, flipH: bool, flipV: bool) -> CT_Connector:
+    return CT_Connector.new_cxnSp(0, "", prst, 0, 0, 0, 0, flipH, flipV)
+
+
+@lru_cache(maxsize=None)
+def get_autoshape_type(autoshape_type: MSO_AUTO_SHAPE_TYPE) -> Tuple[str, str]:
+    autoshape_type = AutoShapeType(autoshape_type)
+    return autoshape_type.basename, autoshape_type.prst
+
+
+@lru_cache(maxsize=1024)
+def get_rgb(color: str) -> str:
+    return str(RGBColor.from_string(color))
+
+
+def new_solid_fill(color: str) -> etree._Element:
+    solid_fill = etree.Element(qn("a:solidFill"))
+    etree.SubElement(solid_fill, qn("a:srgbClr"), val=get_rgb(color))
+    return solid_fill
+
+
+class PptxXmlPresentationCreator(PptxPresentationCreator):
+    """
+    Presentation creator that writes text boxes, auto shapes and connectors
+    straight into the slide XML.
+
+    The python-pptx object API resolves every property through proxy
+    objects and XPath lookups, which dominates export time for text heavy
+    decks. This creator deep copies cached element templates instead, and
+    produces the same XML as PptxPresentationCreator. Slides, backgrounds,
+    pictures and the theme still go through python-pptx.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._font_templates: Dict[Tuple[str, tuple], etree._Element] = {}
+        self._shape_id_slide: Optional[Slide] = None
+        self._last_shape_id = 0
+
+    def get_next_shape_id(self, slide: Slide) -> int:
+        # ? Same ids as python-pptx, which scans the slide for the max id on
+        # ? every shape, but the slide is only scanned once
+        if self._shape_id_slide is not slide:
+            self._shape_id_slide = slide
+            self._last_shape_id = slide.shapes._spTree.max_shape_id
+        self._last_shape_id += 1
+        return self._last_shape_id
+
+    def insert_shape_element(self, slide: Slide, element: etree._Element):
+        slide.shapes._spTree.insert_element_before(element, "p:extLst")
+
+    def add_picture(self, slide: Slide, picture_model: PptxPictureBoxModel):
+        super().add_picture(slide, picture_model)
+        # Picture ids are assigned by python-pptx
+        self._shape_id_slide = None
+
+    def add_connector(self, slide: Slide, connector_model: PptxConnectorModel):
+        if connector_model.thickness == 0:
+            return
+        begin_x, begin_y, end_x, end_y = connector_model.position.to_pt_xyxy()
+        flipH, flipV = begin_x > end_x, begin_y > end_y
+
+        shape_id = self.get_next_shape_id(slide)
+        connector = deepcopy(
+            get_connector_template(
+                MSO_CONNECTOR_TYPE.to_xml(connector_model.type), flipH, flipV
+            )
+        )
+        self.set_shape_frame(
+            connector,
+            shape_id,
+            f"Connector {shape_id - 1}",
+            min(begin_x, end_x),
+            min(begin_y, end_y),
+            abs(end_x - begin_x),
+            abs(end_y - begin_y),
+        )
+
+        line = etree.SubElement(
+            connector[1], qn("a:ln"), w=str(Pt(connector_model.thickness))
+        )
+        line.append(new_solid_fill(connector_model.color))
+
+        self.insert_shape_element(slide, connector)
+
+    def add_autoshape(self, slide: Slide, autoshape_box_model: PptxAutoShapeBoxModel):
+        position = autoshape_box_model.position
+        if autoshape_box_model.margin:
+            position = self.get_margined_position(position, autoshape_box_model.margin)
+
+        basename, prst = get_autoshape_type(autoshape_box_model.type)
+        shape_id = self.get_next_shape_id(slide)
+        autoshape = deepcopy(get_autoshape_template(prst))
+        self.set_shape_frame(
+            autoshape, shape_id, f"{basename} {shape_id - 1}", *position.to_pt_list()
+        )
+
+        shape_properties = autoshape[1]
+        body_properties = autoshape[3][0]
+        self.set_body_properties(
+            body_properties, autoshape_box_model.text_wrap, autoshape_box_model.margin
+        )
+        self.append_fill(shape_properties, autoshape_box_model.fill)
+        self.append_stroke(shape_properties, autoshape_box_model.stroke)
+        self.append_shadow(shape_properties, autoshape_box_model.shadow)
+        self.apply_border_radius_to_autoshape(
+            autoshape, position.width, position.height, autoshape_box_model.border_radius
+        )
+
+        if autoshape_box_model.paragraphs:
+            self.append_paragraphs(autoshape[3], autoshape_box_model.paragraphs)
+
+        self.insert_shape_element(slide, autoshape)
+
+    def add_textbox(self, slide: Slide, textbox_model: PptxTextBoxModel):
+        position = textbox_model.position
+        shape_id = self.get_next_shape_id(slide)
+        textbox = deepcopy(get_textbox_template())
+        self.set_shape_frame(
+            textbox,
+            shape_id,
+            f"TextBox {shape_id - 1}",
+            Pt(position.left),
+            Pt(position.top),
+            Pt(position.width) + Pt(2),
+            Pt(position.height),
+        )
+
+        if textbox_model.fill:
+            # Template has noFill in place of the fill
+            shape_properties = textbox[1]
+            shape_properties.replace(
+                shape_properties[2], new_solid_fill(textbox_model.fill.color)
+            )
+        self.set_body_properties(
+            textbox[2][0], textbox_model.text_wrap, textbox_model.margin
+        )
+        self.append_paragraphs(textbox[2], textbox_model.paragraphs)
+
+        self.insert_shape_element(slide, textbox)
+
+    def set_shape_frame(
+        self,
+        shape: etree._Element,
+        shape_id: int,
+        name: str,
+        x: int,
+        y: int,
+        cx: int,
+        cy: int,
+    ):
+        non_visual_properties = shape[0][0]
+        non_visual_properties.set("id", str(shape_id))
+        non_visual_properties.set("name", name)
+
+        transform = shape[1][0]
+        transform[0].set("x", str(x))
+        transform[0].set("y", str(y))
+        transform[1].set("cx", str(cx))
+        transform[1].set("cy", str(cy))
+
+    def set_body_properties(
+        self,
+        body_properties: etree._Element,
+        text_wrap: bool,
+        margin: Optional[PptxSpacingModel],
+    ):
+        body_properties.set("wrap", "square" if text_wrap else "none")
+        body_properties.set("lIns", str(Pt(margin.left if margin else 0)))
+        body_properties.set("rIns", str(Pt(margin.right if margin else 0)))
+        body_properties.set("tIns", str(Pt(margin.top if margin else 0)))
+        body_properties.set("bIns", str(Pt(margin.bottom if margin else 0)))
+
+    def append_fill(
+        self, shape_properties: etree._Element, fill: Optional[PptxFillModel]
+    ):
+        if not fill:
+            etree.SubElement(shape_properties, qn("a:noFill"))
+        else:
+            shape_properties.append(new_solid_fill(fill.color))
+
+    def append_stroke(
+        self, shape_properties: etree._Element, stroke: Optional[PptxStrokeModel]
+    ):
+        if not stroke or stroke.thickness == 0:
+            line = etree.SubElement(shape_properties, qn("a:ln"))
+            etree.SubElement(line, qn("a:noFill"))
+        else:
+            line = etree.SubElement(
+                shape_properties, qn("a:ln"), w=str(Pt(stroke.thickness))
+            )
+            line.append(new_solid_fill(stroke.color))
+
+    def append_shadow(
+        self, shape_properties: etree._Element, shadow: Optional[PptxShadowModel]
+    ):
+        if not shadow:
+            return
+        effect_list = etree.SubElement(shape_properties, qn("a:effectLst"))
+        outer_shadow = etree.SubElement(
+            effect_list,
+            qn("a:outerShdw"),
+            {
+                "blurRad": f"{Pt(shadow.radius)}",
+                "dir": f"{shadow.angle * 1000}",
+                "dist": f"{Pt(shadow.offset)}",
+                "rotWithShape": "0",
+            },
+        )
+        color_element = etree.SubElement(
+            outer_shadow, qn("a:srgbClr"), {"val": f"{shadow.color}"}
+        )
+        etree.SubElement(
+            color_element, qn("a:alpha"), {"val": f"{int(shadow.opacity * 100000)}"}
+        )
+
+    def apply_border_radius_to_autoshape(
+        self,
+        autoshape: CT_Shape,
+        width: int,
+        height: int,
+        border_radius: Optional[int],
+    ):
+        if not border_radius:
+            return
+        try:
+            normalized_border_radius = Pt(border_radius) / min(Pt(width), Pt(height))
+            AdjustmentCollection(autoshape.prstGeom)[0] = normalized_border_radius
+        except:
+            print("Could not apply border radius.")
+
+    def append_paragraphs(
+        self, text_body: etree._Element, paragraph_models: List[PptxParagraphModel]
+    ):
+        for index, paragraph_model in enumerate(paragraph_models):
+            # Both templates start with a single paragraph
+            if index > 0:
+                paragraph = etree.SubElement(text_body, qn("a:p"))
+            else:
+                paragraph = text_body[2]
+            self.populate_paragraph_element(paragraph, paragraph_model)
+
+    def populate_paragraph_element(
+        self, paragraph: etree._Element, paragraph_model: PptxParagraphModel
+    ):
+        if (
+            paragraph_model.spacing
+            or paragraph_model.alignment
+            or paragraph_model.font
+        ):
+            if len(paragraph) and paragraph[0].tag == qn("a:pPr"):
+                paragraph_properties = paragraph[0]
+            else:
+                paragraph_properties = etree.Element(qn("a:pPr"))
+                paragraph.insert(0, paragraph_properties)
+
+            if paragraph_model.spacing:
+                for tag, points in (
+                    ("a:spcBef", paragraph_model.spacing.top),
+                    ("a:spcAft", paragraph_model.spacing.bottom),
+                ):
+                    spacing = etree.SubElement(paragraph_properties, qn(tag))
+                    etree.SubElement(
+                        spacing, qn("a:spcPts"), val=str(Pt(points).centipoints)
+                    )
+            if paragraph_model.alignment:
+                paragraph_properties.set(
+                    "algn", PP_ALIGN.to_xml(paragraph_model.alignment)
+                )
+            if paragraph_model.font:
+                paragraph_properties.append(
+                    self.get_font_element("a:defRPr", paragraph_model.font)
+                )
+
+        text_runs = []
+        if paragraph_model.text:
+            text_runs = self.parse_markdown_text_to_text_runs(
+                paragraph_model.font, paragraph_model.text
+            )
+        elif paragraph_model.text_runs:
+            text_runs = paragraph_model.text_runs
+
+        for text_run_model in text_runs:
+            paragraph.append(self.get_text_run_element(text_run_model))
+
+    def get_text_run_element(self, text_run_model: PptxTextRunModel) -> etree._Element:
+        text_run = etree.Element(qn("a:r"))
+        if text_run_model.font:
+            text_run.append(self.get_font_element("a:rPr", text_run_model.font))
+        text = etree.SubElement(text_run, qn("a:t"))
+        text.text = CT_RegularTextRun._escape_ctrl_chars(text_run_model.text)
+        return text_run
+
+    def get_font_element(self, tag: str, font_model: PptxFontModel) -> etree._Element:
+        key = (
+            tag,
+            (
+                font_model.name,
+                font_model.size,
+                font_model.bold,
+                font_model.italic,
+                font_model.color,
+            ),
+        )
+        template = self._font_templates.get(key)
+        if template is None:
+            template = parse_xml(
+                f"<{tag} {nsdecls('a')}><a:solidFill><a:srgbClr/></a:solidFill>"
+                f"<a:latin/></{tag}>"
+            )
+            template.set("b", "1" if font_model.bold else "0")
+            template.set("i", "1" if font_model.italic else "0")
+            template.set("sz", str(Pt(font_model.size).centipoints))
+            template[0][0].set("val", get_rgb(font_model.color))
+            template[1].set("typeface", font_model.name)
+            self._font_templates[key] = template
+        return deepcopy(template)
@@ -0,0 +1,100 @@
+import json
+from typing import List
+
+
+class PresentationStreamParser:
+    """
+    Incremental parser for a streamed presentation JSON document.
+
+    Chunks are fed as they arrive and every element of the top level
+    "slides" array is returned as soon as its closing brace is seen, so
+    slides can be processed before the rest of the document is generated.
+    Each character is scanned once and chunks are kept in lists, so the
+    whole document is never rebuilt while streaming.
+    """
+
+    def __init__(self, array_key: str = "slides"):
+        self.array_key = array_key
+
+        self._chunks: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+        # Key tracking for the top level object
+        self._string_parts: List[str] = []
+        self._last_string = None
+        self._current_key = None
+
+        # Depth inside the target array, None until it is found
+        self._array_depth = None
+        self._element_parts: List[str] = []
+        self._element_start = None
+
+        self.n_completed = 0
+
+    def feed(self, chunk: str) -> List[dict]:
+        self._chunks.append(chunk)
+        completed = []
+
+        if self._element_start is not None:
+            self._element_start = 0
+
+        for i, char in enumerate(chunk):
+            if self._in_string:
+                if self._depth == 1:
+                    self._string_parts.append(char)
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = "".join(self._string_parts[:-1])
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_parts = []
+            elif char in "{[":
+                if (
+                    char == "{"
+                    and self._array_depth is not None
+                    and self._depth == self._array_depth
+                ):
+                    self._element_parts = []
+                    self._element_start = i
+                elif (
+                    char == "["
+                    and self._depth == 1
+                    and self._current_key == self.array_key
+                ):
+                    self._array_depth = 2
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._array_depth is not None:
+                    if char == "}" and self._depth == self._array_depth:
+                        self._element_parts.append(chunk[self._element_start : i + 1])
+                        self._element_start = None
+                        completed.append(json.loads("".join(self._element_parts)))
+                        self.n_completed += 1
+                    elif char == "]" and self._depth == self._array_depth - 1:
+                        self._array_depth = None
+            elif self._depth == 1:
+                if char == ":":
+                    self._current_key = self._last_string
+                elif char == ",":
+                    self._current_key = None
+
+        if self._element_start is not None:
+            self._element_parts.append(chunk[self._element_start :])
+
+        return completed
+
+    def get_text(self) -> str:
+        return "".join(self._chunks)
+
+    def parse(self) -> dict:
+        return json.loads(self.get_text())
@@ -2,7 +2,11 @@ from typing import Optional
 
 from pydantic import BaseModel
 
-from api.utils.model_utils import get_large_model, get_llm_client, get_small_model
+from api.utils.model_utils import (
+    get_large_model,
+    get_small_model,
+    parse_chat_completion,
+)
 from ppt_config_generator.models import SlideMarkdownModel
 
 from ppt_generator.models.llm_models import (
@@ -118,14 +122,13 @@ def get_prompt_to_select_slide_type(prompt: str, slide_data: dict, slide_type: i
 
 
 async def get_slide_content_from_type_and_outline(
-    slide_type: int, outline: SlideMarkdownModel
+    slide_type: int, outline: SlideMarkdownModel, use_cache: bool = True
 ) -> LLMContentUnion:
     response_model = LLM_CONTENT_TYPE_MAPPING_WITH_VALIDATION[slide_type]
 
-    client = get_llm_client()
     model = get_small_model()
 
-    response = await client.beta.chat.completions.parse(
+    return await parse_chat_completion(
         model=model,
         temperature=0.5,
         messages=get_prompt_to_generate_slide_content(
@@ -133,10 +136,9 @@ async def get_slide_content_from_type_and_outline(
             outline.body,
         ),
         response_format=response_model,
+        use_cache=use_cache,
     )
 
-    return response.choices[0].message.parsed
-
 
 async def get_edited_slide_content_model(
     prompt: str,
@@ -145,12 +147,12 @@ async def get_edited_slide_content_model(
     theme: Optional[dict] = None,
     language: Optional[str] = None,
 ) -> LLMContentUnion:
-    client = get_llm_client()
     model = get_large_model()
 
     content_type_model_type = LLM_CONTENT_TYPE_MAPPING_WITH_VALIDATION[slide_type]
     slide_data = slide.content.to_llm_content().model_dump_json()
-    response = await client.beta.chat.completions.parse(
+    # ? Edits are expected to differ on every call, never serve them from cache
+    return await parse_chat_completion(
         model=model,
         temperature=0.2,
         messages=get_prompt_to_edit_slide_content(
@@ -160,9 +162,8 @@ async def get_edited_slide_content_model(
             language,
         ),
         response_format=content_type_model_type,
+        use_cache=False,
     )
-    response_data = response.choices[0].message.parsed
-    return response_data
 
 
 async def get_slide_type_from_prompt(
@@ -170,15 +171,14 @@ async def get_slide_type_from_prompt(
     slide: SlideModel,
 ) -> SlideTypeModel:
 
-    client = get_llm_client()
     model = get_small_model()
 
-    response = await client.beta.chat.completions.parse(
+    return await parse_chat_completion(
         model=model,
         temperature=0.2,
         messages=get_prompt_to_select_slide_type(
             prompt, slide.content.to_llm_content().model_dump_json(), slide.type
         ),
         response_format=SlideTypeModel,
+        use_cache=False,
     )
-    return response.choices[0].message.parsed
@@ -1,7 +1,8 @@
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from pptx.util import Pt
 
-from PIL import Image, ImageDraw
+from PIL import Image, ImageChops, ImageDraw
 
 from ppt_generator.models.pptx_models import PptxObjectFitEnum, PptxObjectFitModel
 
@@ -53,24 +54,39 @@ def clip_image(
     return clipped_image
 
 
-def round_image_corners(image: Image.Image, radii: List[int]) -> Image.Image:
-    if len(radii) != 4:
-        raise ValueError(
-            "Image Border Radius - radii must contain exactly 4 values for each corner"
+@lru_cache(maxsize=64)
+def get_image_mask(
+    shape: str, size: Tuple[int, int], radii: Optional[Tuple[int, ...]] = None
+) -> Image.Image:
+    """
+    Returns a cached "L" mask, 255 where the image stays visible.
+
+    Slides reuse the same box sizes and radii, so masks are built once and
+    shared. Callers must not modify the returned image.
+    """
+    w, h = size
+
+    if shape == "circle":
+        mask = Image.new("L", size, 0)
+        center_x = w // 2
+        center_y = h // 2
+        radius = min(size) // 2
+        ImageDraw.Draw(mask).ellipse(
+            (
+                center_x - radius,
+                center_y - radius,
+                center_x + radius,
+                center_y + radius,
+            ),
+            fill=255,
         )
+        return mask
 
-    w, h = image.size
-    # Ensure the image has an alpha channel (RGBA)
-    if image.mode != "RGBA":
-        image = image.convert("RGBA")
-
-    # Create a mask for the rounded corners (start with fully transparent)
-    rounded_mask = Image.new("L", image.size, 0)
+    if shape != "rounded":
+        raise ValueError(f"Unknown image mask shape: {shape}")
 
-    # Create a rectangular mask (fully opaque)
-    rectangular_mask = Image.new("L", image.size, 255)
-
-    # Process each corner
+    # Start fully opaque and cut out the square behind every rounded corner
+    mask = Image.new("L", size, 255)
     for i, radius in enumerate(radii):
         if radius > 0:  # Only process if radius is positive
             # Create a circle for this radius
@@ -80,74 +96,63 @@ def round_image_corners(image: Image.Image, radii: List[int]) -> Image.Image:
 
             # Calculate position based on corner index
             if i == 0:  # top-left
-                rounded_mask.paste(circle.crop((0, 0, radius, radius)), (0, 0))
-                rectangular_mask.paste(0, (0, 0, radius, radius))
+                corner = circle.crop((0, 0, radius, radius))
+                box = (0, 0, radius, radius)
             elif i == 1:  # top-right
-                rounded_mask.paste(
-                    circle.crop((radius, 0, radius * 2, radius)), (w - radius, 0)
-                )
-                rectangular_mask.paste(0, (w - radius, 0, w, radius))
+                corner = circle.crop((radius, 0, radius * 2, radius))
+                box = (w - radius, 0, w, radius)
             elif i == 2:  # bottom-right
-                rounded_mask.paste(
-                    circle.crop((radius, radius, radius * 2, radius * 2)),
-                    (w - radius, h - radius),
-                )
-                rectangular_mask.paste(0, (w - radius, h - radius, w, h))
+                corner = circle.crop((radius, radius, radius * 2, radius * 2))
+                box = (w - radius, h - radius, w, h)
             else:  # bottom-left
-                rounded_mask.paste(
-                    circle.crop((0, radius, radius, radius * 2)), (0, h - radius)
-                )
-                rectangular_mask.paste(0, (0, h - radius, radius, h))
+                corner = circle.crop((0, radius, radius, radius * 2))
+                box = (0, h - radius, radius, h)
 
-    # Get the original alpha channel
-    original_alpha = image.getchannel("A")
+            mask.paste(0, box)
+            # ? The corner arc only ever turns pixels back on
+            mask.paste(255, box[:2], corner)
 
-    # Combine the rectangular mask with the rounded corners
-    corner_mask = Image.composite(rounded_mask, rectangular_mask, rounded_mask)
+    return mask
 
-    # Combine the corner mask with the original alpha channel
-    final_alpha = Image.composite(
-        original_alpha, Image.new("L", image.size, 0), corner_mask
-    )
 
-    # Create a new image with the modified alpha channel
-    result = Image.new("RGBA", image.size)
-    result.paste(image.convert("RGB"), (0, 0))
-    result.putalpha(final_alpha)
+def round_image_corners(image: Image.Image, radii: List[int]) -> Image.Image:
+    if len(radii) != 4:
+        raise ValueError(
+            "Image Border Radius - radii must contain exactly 4 values for each corner"
+        )
+
+    # Ensure the image has an alpha channel (RGBA)
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
 
+    corner_mask = get_image_mask("rounded", image.size, tuple(radii))
+
+    # The mask is either 0 or 255, so multiplying keeps or clears the alpha
+    result = image.copy()
+    result.putalpha(ImageChops.multiply(image.getchannel("A"), corner_mask))
     return result
 
 
 def change_image_color(img: Image.Image, color: str) -> Image.Image:
-    # r, g, b, alpha = img.split()
-
-    # color_overlay = Image.new("RGBA", img.size, color=f"#{color}")
-    # return Image.composite(color_overlay, img, alpha)
     if color.startswith("#"):
         color = color[1:]
     r_new = int(color[:2], 16)
     g_new = int(color[2:4], 16)
     b_new = int(color[4:], 16)
 
-    # Get image data
-    data = img.getdata()
-
-    # Process each pixel
-    new_data = []
-    for item in data:
-        # Get current pixel values
-        r, g, b, a = item
-
-        # Apply new color while preserving transparency
-        if a != 0:  # Skip fully transparent pixels
-            new_data.append((r_new, g_new, b_new, a))
-        else:
-            new_data.append((0, 0, 0, 0))
-
-    # Create new image with modified data
-    new_img = Image.new("RGBA", img.size)
-    new_img.putdata(new_data)
-    return new_img
+    # Every visible pixel takes the new color and keeps its alpha, fully
+    # transparent pixels become (0, 0, 0, 0). Lookup tables on the alpha
+    # channel do this natively instead of looping over pixels in Python.
+    alpha = img.getchannel("A")
+    return Image.merge(
+        "RGBA",
+        (
+            alpha.point([0] + [r_new] * 255),
+            alpha.point([0] + [g_new] * 255),
+            alpha.point([0] + [b_new] * 255),
+            alpha,
+        ),
+    )
 
 
 def create_circle_image(
@@ -155,33 +160,13 @@ def create_circle_image(
 ) -> Image.Image:
     # Convert to RGBA if not already
     img = image.convert("RGBA")
-    # Get the original image size
-    size = img.size
-    # Use the smaller dimension for the circle
-    circle_size = min(size)
-    # Create a transparent image of the same size as original
-    mask = Image.new("RGBA", size, color=(0, 0, 0, 0))
-    draw = ImageDraw.Draw(mask)
-
-    # Calculate center position
-    center_x = size[0] // 2
-    center_y = size[1] // 2
-    radius = circle_size // 2
-
-    # Create a circular mask
-    draw.ellipse(
-        (
-            center_x - radius,
-            center_y - radius,
-            center_x + radius,
-            center_y + radius,
-        ),
-        fill=(255, 255, 255, 255),
-    )
 
-    # Apply the circular mask
-    result = Image.composite(img, mask, mask)
-    return result
+    # Pixels outside the circle become fully transparent black
+    return Image.composite(
+        img,
+        Image.new("RGBA", img.size, (0, 0, 0, 0)),
+        get_image_mask("circle", img.size),
+    )
 
 
 def fit_image(
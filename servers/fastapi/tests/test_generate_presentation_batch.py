@@ -0,0 +1,50 @@
+import asyncio
+import json
+
+from api.routers.presentation.handlers import generate_presentation_batch
+from api.routers.presentation.handlers.generate_presentation import (
+    GeneratePresentationHandler,
+)
+from api.routers.presentation.models import (
+    GeneratePresentationBatchRequest,
+    PresentationPathAndEditPath,
+)
+from api.request_utils import RequestUtils
+
+
+def test_batch_streams_results_and_isolates_errors(monkeypatch):
+    async def run(self, logging_service, log_metadata):
+        if self.data.prompt == "fail":
+            raise ValueError("Generation failed")
+        await asyncio.sleep(0.01 if self.data.prompt == "slow" else 0)
+        return PresentationPathAndEditPath(
+            presentation_id=self.presentation_id,
+            path="/static/deck.pptx",
+            edit_path=f"/presentation?id={self.presentation_id}",
+        )
+
+    monkeypatch.setattr(GeneratePresentationHandler, "run", run)
+    handler = generate_presentation_batch.GeneratePresentationBatchHandler(
+        GeneratePresentationBatchRequest(
+            items=[{"prompt": "slow"}, {"prompt": "fail"}, {"prompt": "fast"}]
+        )
+    )
+
+    async def collect():
+        logging_service, log_metadata = await RequestUtils(
+            "/api/v1/ppt/generate/presentation/batch"
+        ).initialize_logger()
+        return [
+            json.loads(each)
+            async for each in handler.get_stream(logging_service, log_metadata)
+        ]
+
+    results = asyncio.run(collect())
+    # The slow item finishes last even though it was submitted first
+    assert results[-1]["index"] == 0
+
+    results_by_index = {each["index"]: each for each in results}
+    assert results_by_index[0]["status"] == "completed"
+    assert results_by_index[1]["status"] == "failed"
+    assert results_by_index[1]["error"] == "Generation failed"
+    assert results_by_index[2]["status"] == "completed"
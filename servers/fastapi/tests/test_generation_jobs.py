@@ -0,0 +1,96 @@
+import asyncio
+import sqlite3
+import uuid
+
+from sqlalchemy import create_engine
+from sqlmodel import SQLModel
+
+from api.services.generation_jobs import GenerationJobService
+
+
+async def wait_for_status(service: GenerationJobService, job_id: str, status: str):
+    for _ in range(100):
+        job = service.get_job(job_id)
+        if job.status == status:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job never reached status {status}")
+
+
+def get_sql_engine(tmp_path):
+    # Never the app database, a job left running there resumes on startup
+    sql_engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False}
+    )
+    SQLModel.metadata.create_all(sql_engine)
+    return sql_engine
+
+
+def test_interrupted_job_resumes_from_last_checkpoint(monkeypatch, tmp_path):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    sql_engine = get_sql_engine(tmp_path)
+    job_id = str(uuid.uuid4())
+    resumed_with = {}
+
+    async def interrupted_runner(job, on_checkpoint):
+        await on_checkpoint("outline", {"title": "Title"})
+        await asyncio.Event().wait()
+
+    async def runner(job, on_checkpoint):
+        resumed_with.update(job.checkpoints)
+        await on_checkpoint("export", {"path": "/static/deck.pptx"})
+        return {"path": "/static/deck.pptx"}
+
+    async def run():
+        service = GenerationJobService(sql_engine)
+        await service.start(interrupted_runner)
+        service.create_job(job_id, "presentation-id", {"prompt": "Prompt"})
+        for _ in range(100):
+            if service.get_job(job_id).stage == "outline":
+                break
+            await asyncio.sleep(0.01)
+        # Simulates a restart while the job is running
+        await service.stop()
+        assert service.get_job(job_id).status == "running"
+
+        service = GenerationJobService(sql_engine)
+        await service.start(runner)
+        job = await wait_for_status(service, job_id, "completed")
+        await service.stop()
+        return job
+
+    job = asyncio.run(run())
+    assert resumed_with == {"outline": {"title": "Title"}}
+    assert job.result == {"path": "/static/deck.pptx"}
+    assert set(job.checkpoints) == {"outline", "export"}
+
+
+def test_worker_survives_a_failing_database_write(monkeypatch, tmp_path):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    monkeypatch.setenv("GENERATION_WORKERS", "1")
+    service = GenerationJobService(get_sql_engine(tmp_path))
+
+    # Starting the first job and marking it failed both hit a locked database
+    update_job = service.update_job
+    failures = [sqlite3.OperationalError("database is locked")] * 2
+
+    def flaky_update_job(job_id, **fields):
+        if failures:
+            raise failures.pop()
+        return update_job(job_id, **fields)
+
+    monkeypatch.setattr(service, "update_job", flaky_update_job)
+
+    async def runner(job, on_checkpoint):
+        return {"path": "/static/deck.pptx"}
+
+    async def run():
+        await service.start(runner)
+        service.create_job("first", "presentation-id", {"prompt": "Prompt"})
+        service.create_job("second", "presentation-id", {"prompt": "Prompt"})
+        job = await wait_for_status(service, "second", "completed")
+        await service.stop()
+        return job
+
+    assert asyncio.run(run()).result == {"path": "/static/deck.pptx"}
+    assert not failures
@@ -0,0 +1,113 @@
+import os
+
+from PIL import Image
+from pptx import Presentation
+
+from api.services.theme_registry import ThemeRegistryService
+from ppt_generator import icon_variants
+from ppt_generator.icon_variants import IconVariantCache
+from ppt_generator.models.pptx_models import (
+    PptxPictureBoxModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from ppt_generator.pptx_presentation_creator import PptxPresentationCreator
+
+
+def get_icon_cache(tmp_path) -> IconVariantCache:
+    icons_dir = tmp_path / "icons"
+    (icons_dir / "bold").mkdir(parents=True)
+    icon = Image.new("RGBA", (256, 256), (0, 0, 0, 0))
+    icon.paste((0, 0, 0, 255), (64, 64, 192, 192))
+    icon.save(icons_dir / "bold" / "square-bold.png")
+    icon.save(icons_dir / "logo.png")
+    return IconVariantCache(str(icons_dir), str(tmp_path / "variants"))
+
+
+def get_icon_model(icon_path: str, size: int = 40, **kwargs) -> PptxPictureBoxModel:
+    return PptxPictureBoxModel(
+        position={"left": 10, "top": 10, "width": size, "height": size},
+        picture={"is_network": False, "path": icon_path},
+        border_radius=[0, 0, 0, 0],
+        object_fit={"fit": "contain"},
+        **kwargs,
+    )
+
+
+def test_recolored_icons_use_a_cached_variant(tmp_path):
+    cache = get_icon_cache(tmp_path)
+    icon_path = str(tmp_path / "icons" / "bold" / "square-bold.png")
+
+    variant_path = cache.get_for_picture(get_icon_model(icon_path, overlay="#5E8CF0"))
+    assert variant_path == cache.get_path("bold/square-bold", "5e8cf0", 64)
+    variant = Image.open(variant_path)
+    assert variant.size == (64, 64)
+    assert variant.getpixel((32, 32)) == (94, 140, 240, 255)
+    assert variant.getpixel((0, 0))[3] == 0
+
+    modified_at = os.path.getmtime(variant_path)
+    assert cache.get_for_picture(get_icon_model(icon_path, overlay="5e8cf0")) == (
+        variant_path
+    )
+    assert os.path.getmtime(variant_path) == modified_at
+
+    # Pictures the variant would not match are processed as before
+    for picture_model in [
+        get_icon_model(icon_path),
+        get_icon_model(icon_path, overlay="ffffff", shape="circle"),
+        get_icon_model(str(tmp_path / "icons" / "logo.png"), overlay="ffffff"),
+        get_icon_model(variant_path, overlay="ffffff"),
+        PptxPictureBoxModel(
+            position={"left": 0, "top": 0, "width": 80, "height": 40},
+            picture={"is_network": False, "path": icon_path},
+            overlay="ffffff",
+        ),
+    ]:
+        assert cache.get_for_picture(picture_model) is None
+
+
+def test_warm_renders_missing_variants_once(tmp_path):
+    cache = get_icon_cache(tmp_path)
+
+    assert cache.warm(["#FFFFFF", "1F1F2D", "ffffff", "not a color"], [32, 64]) == 4
+    assert os.path.exists(cache.get_path("bold/square-bold", "1f1f2d", 32))
+    assert cache.warm(["FFFFFF"], [32, 64]) == 0
+
+
+def test_theme_icon_colors():
+    icon_colors = ThemeRegistryService().get_icon_colors()
+    assert "FFFFFF" in icon_colors
+    assert "5E8CF0" in icon_colors
+
+
+def test_export_adds_the_variant_as_is(tmp_path, monkeypatch):
+    cache = get_icon_cache(tmp_path)
+    monkeypatch.setattr(icon_variants, "_ICON_VARIANT_CACHE", cache)
+    icon_path = str(tmp_path / "icons" / "bold" / "square-bold.png")
+
+    model = PptxPresentationModel(
+        background_color="ffffff",
+        slides=[PptxSlideModel(shapes=[get_icon_model(icon_path, overlay="ffffff")])],
+    )
+    creator = PptxPresentationCreator(model, str(tmp_path))
+    creator.create_ppt()
+    ppt_path = str(tmp_path / "deck.pptx")
+    creator.save(ppt_path)
+
+    picture = Presentation(ppt_path).slides[0].shapes[0]
+    with open(cache.get_path("bold/square-bold", "ffffff", 64), "rb") as f:
+        assert picture.image.blob == f.read()
+
+
+def test_variants_default_to_app_data_and_warming_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    monkeypatch.delenv("ICON_VARIANTS_DIR", raising=False)
+    monkeypatch.delenv("ICON_VARIANT_WARM_SIZES", raising=False)
+
+    cache = IconVariantCache(str(get_icon_cache(tmp_path).icons_dir))
+    assert cache.cache_dir == os.path.realpath(tmp_path / "icon_variants")
+    assert cache.start_warming(["FFFFFF"]) is None
+
+    monkeypatch.setenv("ICON_VARIANT_WARM_SIZES", "32")
+    cache.start_warming(["FFFFFF"]).join()
+    assert os.path.exists(cache.get_path("bold/square-bold", "ffffff", 32))
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from image_processor import icons_finder
+from image_processor.icons_index import IconsIndex, InvalidIconCursorError
+from image_processor.icons_vectorstore import IconsVectorStore
+from ppt_generator.models.query_and_prompt_models import IconCategoryEnum
+
+
+class CountingEmbeddingModel:
+    # Every query embeds to the same vector, so only BM25 separates icons
+    def __init__(self):
+        self.calls = 0
+
+    def query_embed(self, queries):
+        self.calls += 1
+        for _ in queries:
+            yield np.array([1.0, 0.0], dtype=np.float32)
+
+
+def get_index(cache_size: int = 256):
+    names = [
+        "bold/sun-bold",
+        "bold/cloud-sun-bold",
+        "bold/cloud-rain-bold",
+        "bold/leaf-bold",
+        "bold/tree-bold",
+        "regular/sun",
+        "regular/leaf",
+    ]
+    embeddings = np.array([[1.0, 0.0]] * len(names), dtype=np.float32)
+    vector_store = IconsVectorStore(embeddings, names, CountingEmbeddingModel())
+    documents = [
+        name.split("/")[1].replace("-bold", "").replace("-", " ") for name in names
+    ]
+    categories = [
+        (
+            IconCategoryEnum.solid
+            if name.startswith("bold/")
+            else IconCategoryEnum.outline
+        )
+        for name in names
+    ]
+    return IconsIndex(vector_store, documents, categories, cache_size=cache_size)
+
+
+def test_lexical_matches_rank_first_within_the_category():
+    index = get_index()
+
+    names, _ = index.search("sun", IconCategoryEnum.solid, 2)
+    assert names == ["bold/sun-bold", "bold/cloud-sun-bold"]
+
+    names, _ = index.search("sun", IconCategoryEnum.outline, 10)
+    assert names == ["regular/sun", "regular/leaf"]
+
+    # No semi-solid icons are shipped, all icons are searched
+    names, _ = index.search("leaf", IconCategoryEnum.semi_solid, 2)
+    assert names == ["bold/leaf-bold", "regular/leaf"]
+
+
+def test_cursor_pages_through_a_stable_ranking():
+    index = get_index()
+
+    names, cursor = index.search("cloud", IconCategoryEnum.solid, 2)
+    pages = [names]
+    while cursor:
+        names, cursor = index.search(
+            "cloud", IconCategoryEnum.solid, 2, cursor=cursor
+        )
+        pages.append(names)
+
+    # Equal scores keep the icon order
+    assert pages[0] == ["bold/cloud-sun-bold", "bold/cloud-rain-bold"]
+    all_names = [each for page in pages for each in page]
+    assert len(all_names) == len(set(all_names)) == 5
+    assert index.search("cloud", IconCategoryEnum.solid, 2, page=2)[0] == pages[1]
+
+
+def test_popular_queries_are_served_from_the_cache():
+    index = get_index(cache_size=1)
+    embedding_model = index.vector_store.embedding_model
+
+    index.search("sun", None, 2)
+    index.search(" Sun ", None, 2, page=2)
+    assert embedding_model.calls == 1
+
+    index.search("leaf", None, 2)
+    index.search("sun", None, 2)
+    assert embedding_model.calls == 3
+
+    # Empty queries list the category without embedding
+    assert index.search("", IconCategoryEnum.outline, 5)[0] == [
+        "regular/sun",
+        "regular/leaf",
+    ]
+    assert embedding_model.calls == 3
+
+
+def test_cursor_of_another_search_is_rejected():
+    index = get_index()
+    _, cursor = index.search("sun", None, 1)
+
+    with pytest.raises(InvalidIconCursorError):
+        index.search("leaf", None, 1, cursor=cursor)
+    with pytest.raises(InvalidIconCursorError):
+        index.search("sun", None, 1, cursor="not a cursor")
+
+
+def test_icon_search_loads_the_index_off_the_event_loop(monkeypatch):
+    index = get_index()
+    loaded_on = []
+
+    def get_icons_index():
+        loaded_on.append(threading.current_thread())
+        return index
+
+    monkeypatch.setattr(icons_finder, "get_icons_index", get_icons_index)
+    icon_paths, cursor = asyncio.run(icons_finder.get_icons("sun", 1, None))
+    assert icon_paths[0].endswith("bold/sun-bold.png")
+    assert loaded_on[0] is not threading.main_thread()
+
+    with pytest.raises(InvalidIconCursorError):
+        asyncio.run(icons_finder.get_icons("leaf", 1, None, cursor=cursor))
+
+    def get_missing_icons_index():
+        raise FileNotFoundError("icons_embeddings.npy")
+
+    monkeypatch.setattr(icons_finder, "get_icons_index", get_missing_icons_index)
+    icon_paths, cursor = asyncio.run(icons_finder.get_icons("sun", 1, None))
+    assert [each.split("/")[-1] for each in icon_paths] == ["placeholder.png"]
+    assert cursor is None
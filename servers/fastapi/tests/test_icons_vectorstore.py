@@ -0,0 +1,212 @@
+import asyncio
+
+import numpy as np
+
+from image_processor import icons_finder
+from image_processor.icons_finder import (
+    get_icon_query_candidates,
+    get_icons_for_queries,
+    get_icons_for_slides,
+)
+from image_processor.icons_vectorstore import IconsVectorStore, get_distinct_best
+from image_processor.icons_vectorstore_utils import get_icon_document
+from ppt_generator.models.llm_models_with_validations import (
+    LLMHeadingModelWithIconQueryWithValidation,
+)
+from ppt_generator.models.query_and_prompt_models import IconQueryCollectionWithData
+
+
+class AxisEmbeddingModel:
+    # Embeds each known word as its own axis
+    WORDS = ["sun", "rain", "leaf", "bulb"]
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_word(self, word: str) -> np.ndarray:
+        vector = np.zeros(len(self.WORDS), dtype=np.float32)
+        for index, each in enumerate(self.WORDS):
+            if each in word:
+                vector[index] = 1
+        return vector
+
+    def query_embed(self, query):
+        self.calls += 1
+        queries = [query] if isinstance(query, str) else query
+        for each in queries:
+            yield self.embed_word(each)
+
+
+def save_store(tmp_path, dtype: str) -> str:
+    embeddings_path = str(tmp_path / "icons.npy")
+    embeddings = [
+        np.array([1, 0, 0, 0]),
+        np.array([0.6, 0.8, 0, 0]),
+        np.array([0, 0, 1, 0.1]),
+        np.array([0, 0, 0.2, 1]),
+    ]
+    names = ["sun-bold", "cloud-sun-rain-bold", "leaf-bold", "lightbulb-bold"]
+    IconsVectorStore.save(embeddings_path, embeddings, names, dtype)
+    return embeddings_path
+
+
+def test_icon_document_drops_the_weight():
+    assert get_icon_document("bold/address-book-tabs-bold") == "address book tabs"
+    assert (
+        get_icon_document("bold/acorn-bold", {"acorn-bold": ["nut", "oak"]})
+        == "acorn nut oak"
+    )
+
+
+def test_store_is_memory_mapped_and_ranks_by_similarity(tmp_path):
+    embeddings_path = save_store(tmp_path, "float32")
+    store = IconsVectorStore.load(embeddings_path, AxisEmbeddingModel())
+
+    assert isinstance(store.embeddings, np.memmap)
+    assert store.embeddings.dtype == np.float32
+    results = store.search("rain", 2)
+    assert [name for name, _ in results] == ["cloud-sun-rain-bold", "sun-bold"]
+    assert abs(results[0][1] - 0.8) < 1e-6
+    assert store.search("leaf", 10)[0][0] == "leaf-bold"
+    assert len(store.search("leaf", 10)) == 4
+
+
+def test_int8_store_keeps_the_ranking(tmp_path):
+    float_store = IconsVectorStore.load(
+        save_store(tmp_path / "float32", "float32"), AxisEmbeddingModel()
+    )
+    int8_store = IconsVectorStore.load(
+        save_store(tmp_path / "int8", "int8"), AxisEmbeddingModel()
+    )
+
+    assert int8_store.embeddings.dtype == np.int8
+    for query in ["sun", "rain", "leaf", "bulb"]:
+        float_results = float_store.search(query, 4)
+        int8_results = int8_store.search(query, 4)
+        assert [name for name, _ in int8_results] == [
+            name for name, _ in float_results
+        ]
+        assert abs(int8_results[0][1] - float_results[0][1]) < 0.01
+
+
+def test_batch_search_embeds_all_queries_at_once(tmp_path):
+    embedding_model = AxisEmbeddingModel()
+    store = IconsVectorStore.load(save_store(tmp_path, "float32"), embedding_model)
+
+    queries = ["sun", "rain", "leaf", "bulb", "rain"]
+    results = store.search_batch(queries, 1)
+    assert embedding_model.calls == 1
+    assert [each[0][0] for each in results] == [
+        "sun-bold",
+        "cloud-sun-rain-bold",
+        "leaf-bold",
+        "lightbulb-bold",
+        "cloud-sun-rain-bold",
+    ]
+    assert results == [store.search(each, 1) for each in queries]
+    assert store.search_batch([], 1) == []
+
+
+def test_icons_for_queries_are_found_in_one_search(tmp_path):
+    embedding_model = AxisEmbeddingModel()
+    store = IconsVectorStore.load(save_store(tmp_path, "float32"), embedding_model)
+
+    icon_paths = asyncio.run(
+        get_icons_for_queries(
+            [
+                IconQueryCollectionWithData(index=index, icon_query=query)
+                for index, query in enumerate(["leaf", "sun"])
+            ],
+            store,
+        )
+    )
+    assert embedding_model.calls == 1
+    assert [each.split("/")[-1] for each in icon_paths] == [
+        "leaf-bold.png",
+        "sun-bold.png",
+    ]
+
+
+def test_icon_query_candidates_include_generic_nouns():
+    assert get_icon_query_candidates("Led bulb") == ["Led bulb", "bulb"]
+    assert get_icon_query_candidates("Led bulb, bulb, light") == [
+        "Led bulb, bulb, light",
+        "light",
+        "Led bulb",
+        "bulb",
+    ]
+    assert get_icon_query_candidates("") == [""]
+
+
+def test_schema_accepts_three_icon_queries():
+    icon_query = "Renewable energy solar panel, solar panel, sun"
+    item = LLMHeadingModelWithIconQueryWithValidation(
+        heading="Clean energy growth",
+        description="Solar capacity doubled in three years, cutting costs for homes",
+        icon_query=icon_query,
+    )
+    assert "solar panel" in get_icon_query_candidates(item.icon_query)
+
+
+def test_fused_scores_match_each_candidate_group(tmp_path):
+    embedding_model = AxisEmbeddingModel()
+    store = IconsVectorStore.load(save_store(tmp_path, "float32"), embedding_model)
+
+    groups = [["sun"], ["leaf", "bulb"], ["rain"]]
+    max_scores = store.get_fused_scores(groups, "max")
+    rrf_scores = store.get_fused_scores(groups, "rrf")
+    assert embedding_model.calls == 2
+    assert max_scores.shape == rrf_scores.shape == (3, 4)
+    assert np.allclose(max_scores[1], [0, 0, 1, 1], atol=0.05)
+    # Ranked first for both candidates beats first and last
+    assert rrf_scores[1][2] == rrf_scores[1][3] > rrf_scores[1][0]
+    assert [store.names[each] for each in rrf_scores.argmax(axis=1)] == [
+        "sun-bold",
+        "leaf-bold",
+        "cloud-sun-rain-bold",
+    ]
+
+
+def test_distinct_best_never_repeats_an_icon():
+    scores = np.array(
+        [
+            [0.9, 0.8, 0.1],
+            [0.95, 0.2, 0.1],
+            [0.9, 0.85, 0.3],
+        ]
+    )
+    # The most confident row keeps its best icon, the others move down
+    assert get_distinct_best(scores).tolist() == [1, 0, 2]
+    assert get_distinct_best(scores[:1]).tolist() == [0]
+
+
+def test_icons_of_a_slide_are_distinct(tmp_path):
+    embedding_model = AxisEmbeddingModel()
+    store = IconsVectorStore.load(save_store(tmp_path, "float32"), embedding_model)
+
+    slides_icon_queries = [
+        [
+            IconQueryCollectionWithData(index=0, icon_query="leaf"),
+            IconQueryCollectionWithData(index=1, icon_query="green leaf"),
+        ],
+        [],
+        [IconQueryCollectionWithData(index=0, icon_query="leaf")],
+    ]
+    slides_icons = asyncio.run(get_icons_for_slides(slides_icon_queries, store))
+    assert embedding_model.calls == 1
+    assert [[each.split("/")[-1] for each in icons] for icons in slides_icons] == [
+        ["leaf-bold.png", "lightbulb-bold.png"],
+        [],
+        ["leaf-bold.png"],
+    ]
+
+
+def test_icons_fall_back_to_the_placeholder_without_a_store(monkeypatch):
+    def get_icons_vectorstore():
+        raise FileNotFoundError("icons_embeddings.npy")
+
+    monkeypatch.setattr(icons_finder, "get_icons_vectorstore", get_icons_vectorstore)
+    icon_paths = asyncio.run(
+        get_icons_for_queries([IconQueryCollectionWithData(index=0, icon_query="sun")])
+    )
+    assert [each.split("/")[-1] for each in icon_paths] == ["placeholder.png"]
@@ -0,0 +1,203 @@
+import asyncio
+import os
+import time
+
+import redis
+from pydantic import BaseModel
+
+from api.services.llm_cache import (
+    LLMResponseCacheService,
+    RedisLLMCacheBackend,
+    SqliteLLMCacheBackend,
+)
+from api.utils import model_utils
+
+
+class CachedResponseModel(BaseModel):
+    title: str
+
+
+def test_sqlite_llm_cache_evicts_least_recently_used(tmp_path):
+    backend = SqliteLLMCacheBackend(os.path.join(tmp_path, "llm_cache.db"), 2)
+
+    backend.set("a", "1", 60)
+    time.sleep(0.01)
+    backend.set("b", "2", 60)
+    time.sleep(0.01)
+    assert backend.get("a") == "1"
+    time.sleep(0.01)
+    backend.set("c", "3", 60)
+
+    assert backend.count() == 2
+    assert backend.get("a") == "1"
+    assert backend.get("b") is None
+    assert backend.get("c") == "3"
+
+
+def test_sqlite_llm_cache_expires_entries(tmp_path):
+    backend = SqliteLLMCacheBackend(os.path.join(tmp_path, "llm_cache.db"), 10)
+
+    backend.set("a", "1", -1)
+    assert backend.get("a") is None
+
+
+class FakeRedisClient:
+    # Values and sorted sets of a redis server, values expire like in redis
+    def __init__(self):
+        self.values = {}
+        self.sorted_sets = {}
+        self.round_trips = 0
+
+    def call(self, name, *args, **kwargs):
+        self.round_trips += 1
+        return getattr(self, f"_{name}")(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+    def pipeline(self):
+        return FakeRedisPipeline(self)
+
+    def _set(self, key, value, ex=None):
+        self.values[key] = (value, time.time() + ex)
+
+    def _get(self, key):
+        value, expires_at = self.values.get(key, (None, 0))
+        return value if expires_at > time.time() else None
+
+    def _delete(self, *keys):
+        for key in keys:
+            self.sorted_sets.pop(key, None)
+            self.values.pop(key, None)
+
+    def _zadd(self, name, mapping, xx=False):
+        sorted_set = self.sorted_sets.setdefault(name, {})
+        for member, score in mapping.items():
+            if member in sorted_set or not xx:
+                sorted_set[member] = score
+
+    def _zrange(self, name, start, end):
+        members = sorted(self.sorted_sets.get(name, {}).items(), key=lambda x: x[1])
+        return [member for member, _ in members][start : None if end == -1 else end + 1]
+
+    def _zrangebyscore(self, name, min_score, max_score):
+        return [
+            member
+            for member in self._zrange(name, 0, -1)
+            if float(min_score) <= self.sorted_sets[name][member] <= float(max_score)
+        ]
+
+    def _zcard(self, name):
+        return len(self.sorted_sets.get(name, {}))
+
+    def _zrem(self, name, *values):
+        for each in values:
+            self.sorted_sets.get(name, {}).pop(each, None)
+
+
+class FakeRedisPipeline:
+    def __init__(self, client: FakeRedisClient):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    def execute(self):
+        self.client.round_trips += 1
+        return [
+            getattr(self.client, f"_{name}")(*args, **kwargs)
+            for name, args, kwargs in self.commands
+        ]
+
+
+class FakeRedisService:
+    def __init__(self, client):
+        self.client = client
+
+
+def test_redis_llm_cache_drops_expired_keys():
+    client = FakeRedisClient()
+    backend = RedisLLMCacheBackend(FakeRedisService(client), 2)
+
+    backend.set("a", "1", 0.05)
+    backend.set("b", "2", 60)
+    assert backend.count() == 2
+    time.sleep(0.06)
+    assert backend.count() == 1
+
+    # An expired key is not counted and does not evict a live one
+    backend.set("c", "3", 60)
+    assert backend.get("a") is None
+    assert backend.get("b") == "2"
+    assert backend.get("c") == "3"
+    assert backend.count() == 2
+
+    # Calls are batched, a hit and a set without eviction are one round trip
+    client.round_trips = 0
+    backend.get("b")
+    backend.set("c", "4", 60)
+    assert client.round_trips == 2
+
+    backend.set("d", "5", 60)
+    assert backend.get("b") is None
+    assert backend.count() == 2
+
+
+def test_redis_errors_are_counted():
+    class DownRedisClient:
+        def pipeline(self):
+            raise redis.exceptions.ConnectionError("Connection refused")
+
+    service = LLMResponseCacheService(None)
+    service.backend = RedisLLMCacheBackend(FakeRedisService(DownRedisClient()), 2)
+
+    assert asyncio.run(service.get("a")) is None
+    asyncio.run(service.set("a", "1"))
+    assert service.errors == 2
+    assert service.misses == 0
+
+
+def test_parse_chat_completion_uses_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM", "openai")
+    monkeypatch.setenv("LLM_CACHE_BACKEND", "sqlite")
+    monkeypatch.setenv("LLM_CACHE_PATH", os.path.join(tmp_path, "llm_cache.db"))
+    monkeypatch.setattr(
+        model_utils, "LLM_RESPONSE_CACHE_SERVICE", LLMResponseCacheService(None)
+    )
+    calls = []
+
+    class FakeCompletions:
+        async def parse(self, **kwargs):
+            calls.append(kwargs)
+            message = type("Message", (), {"parsed": CachedResponseModel(title="t")})
+            choice = type("Choice", (), {"message": message})
+            return type("Response", (), {"choices": [choice]})
+
+    class FakeChat:
+        completions = FakeCompletions()
+
+    class FakeBeta:
+        chat = FakeChat()
+
+    class FakeClient:
+        beta = FakeBeta()
+
+    monkeypatch.setattr(model_utils, "get_llm_client", lambda: FakeClient())
+    messages = [{"role": "user", "content": "cache me"}]
+
+    for _ in range(2):
+        response = asyncio.run(
+            model_utils.parse_chat_completion(
+                "gpt-4.1", messages, CachedResponseModel, temperature=0.2
+            )
+        )
+        assert response.title == "t"
+    assert len(calls) == 1
+
+    asyncio.run(
+        model_utils.parse_chat_completion(
+            "gpt-4.1", messages, CachedResponseModel, 0.2, use_cache=False
+        )
+    )
+    assert len(calls) == 2
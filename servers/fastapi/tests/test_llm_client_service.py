@@ -0,0 +1,27 @@
+import asyncio
+
+from api.services.llm_client import LLMClientService
+
+
+def test_llm_client_is_reused_for_same_credentials():
+    service = LLMClientService()
+    client = service.get_client("openai", "https://api.openai.com/v1", "key-1")
+
+    assert service.get_client("openai", "https://api.openai.com/v1", "key-1") is client
+    assert service.get_stats()["clients_built"] == 1
+    assert service.get_stats()["clients"][0]["lookups"] == 2
+
+
+def test_llm_client_is_rebuilt_when_credentials_change():
+    service = LLMClientService()
+    old_client = service.get_client("openai", "https://api.openai.com/v1", "key-1")
+    new_client = service.get_client("openai", "https://api.openai.com/v1", "key-2")
+
+    assert new_client is not old_client
+    stats = service.get_stats()
+    assert len(stats["clients"]) == 1
+    assert stats["clients_retired_pending_close"] == 1
+    assert "key-2" not in str(stats)
+
+    asyncio.run(service.close())
+    assert service.get_stats()["clients"] == []
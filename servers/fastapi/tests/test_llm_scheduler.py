@@ -0,0 +1,58 @@
+import asyncio
+
+import httpx
+import openai
+
+from api.services.llm_scheduler import LLMSchedulerService
+
+
+def get_rate_limit_error(retry_after: str):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(
+        429, headers={"retry-after": retry_after}, request=request
+    )
+    return openai.RateLimitError("Rate limited", response=response, body=None)
+
+
+def test_scheduler_caps_concurrency_per_lane(monkeypatch):
+    monkeypatch.setenv("LLM_TEST_MAX_CONCURRENCY", "2")
+    scheduler = LLMSchedulerService()
+    in_flight = 0
+    max_in_flight = 0
+
+    async def call():
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "done"
+
+    async def run_all():
+        return await asyncio.gather(
+            *[scheduler.run("test", call) for _ in range(6)]
+        )
+
+    assert asyncio.run(run_all()) == ["done"] * 6
+    assert max_in_flight == 2
+    stats = scheduler.get_stats()["test"]
+    assert stats["requests"] == 6
+    assert stats["in_flight"] == 0
+
+
+def test_scheduler_retries_after_rate_limit():
+    scheduler = LLMSchedulerService()
+    attempts = 0
+
+    async def call():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise get_rate_limit_error("0.01")
+        return "done"
+
+    assert asyncio.run(scheduler.run("openai", call)) == "done"
+    stats = scheduler.get_stats()["openai"]
+    assert attempts == 2
+    assert stats["rate_limited"] == 1
+    assert stats["rate_multiplier"] < 1.0
@@ -0,0 +1,49 @@
+import os
+
+from PIL import Image
+
+from benchmarks.image_utils_benchmark import (
+    change_image_color_per_pixel,
+    create_circle_image_uncached,
+    round_image_corners_uncached,
+)
+from ppt_generator.utils import (
+    change_image_color,
+    create_circle_image,
+    round_image_corners,
+)
+
+
+def get_random_image(size) -> Image.Image:
+    data = bytearray(os.urandom(size[0] * size[1] * 4))
+    # Make sure fully transparent pixels are covered
+    for i in range(3, len(data), 16):
+        data[i] = 0
+    return Image.frombytes("RGBA", size, bytes(data))
+
+
+def test_change_image_color_matches_per_pixel_implementation():
+    for size in [(1, 1), (17, 31), (128, 64)]:
+        image = get_random_image(size)
+        for color in ["#5E8CF0", "000000", "ffffff"]:
+            expected = change_image_color_per_pixel(image, color)
+            result = change_image_color(image, color)
+            assert result.mode == expected.mode
+            assert result.tobytes() == expected.tobytes()
+
+
+def test_round_image_corners_matches_uncached_implementation():
+    image = get_random_image((120, 80))
+    for radii in [[0, 0, 0, 0], [10, 0, 25, 5], [40, 40, 40, 40], [70, 10, 90, 0]]:
+        expected = round_image_corners_uncached(image, radii)
+        # Called twice so the cached mask is exercised as well
+        for _ in range(2):
+            assert round_image_corners(image, radii).tobytes() == expected.tobytes()
+
+
+def test_create_circle_image_matches_uncached_implementation():
+    for size in [(120, 80), (81, 81), (1, 3)]:
+        image = get_random_image(size)
+        expected = create_circle_image_uncached(image)
+        for _ in range(2):
+            assert create_circle_image(image).tobytes() == expected.tobytes()
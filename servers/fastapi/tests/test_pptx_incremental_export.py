@@ -0,0 +1,127 @@
+import os
+
+import pytest
+from PIL import Image
+from pptx import Presentation
+
+from ppt_generator.models.pptx_models import PptxPresentationModel
+from ppt_generator.pptx_export_manifest import PptxExportManifest, get_presentation_hash
+from ppt_generator.pptx_presentation_creator import (
+    PptxPresentationCreator,
+    get_slide_hashes,
+)
+from ppt_generator.pptx_xml_presentation_creator import PptxXmlPresentationCreator
+
+
+def get_slide(title: str, image_path: str = None) -> dict:
+    shapes = [
+        {
+            "position": {"left": 40, "top": 30, "width": 600, "height": 80},
+            "paragraphs": [{"font": {"size": 32}, "text": f"**{title}**"}],
+        },
+        {
+            "position": {"left": 40, "top": 200, "width": 300, "height": 100},
+            "fill": {"color": "5E8CF0"},
+            "border_radius": 8,
+            "paragraphs": [{"text": title}],
+        },
+    ]
+    if image_path:
+        shapes.append(
+            {
+                "position": {"left": 400, "top": 200, "width": 300, "height": 200},
+                "border_radius": [8, 8, 8, 8],
+                "picture": {"is_network": False, "path": image_path},
+            }
+        )
+    return {"shapes": shapes}
+
+
+def get_parts(path: str) -> dict:
+    return {
+        str(part.partname): part.blob
+        for part in Presentation(path).part.package.iter_parts()
+    }
+
+
+@pytest.mark.parametrize(
+    "creator_class", [PptxPresentationCreator, PptxXmlPresentationCreator]
+)
+def test_update_matches_full_rebuild(tmp_path, creator_class):
+    image_path = str(tmp_path / "source.png")
+    Image.frombytes("RGBA", (64, 48), os.urandom(64 * 48 * 4)).save(image_path)
+    other_image_path = str(tmp_path / "other.png")
+    Image.frombytes("RGBA", (64, 48), os.urandom(64 * 48 * 4)).save(other_image_path)
+
+    previous_model = PptxPresentationModel(
+        background_color="ffffff",
+        slides=[
+            get_slide("One", image_path),
+            get_slide("Two"),
+            get_slide("Three", image_path),
+            get_slide("Four"),
+        ],
+    )
+    previous_path = str(tmp_path / "previous.pptx")
+    previous_slide_hashes = get_slide_hashes(previous_model)
+    creator = creator_class(previous_model, str(tmp_path))
+    creator.create_ppt()
+    creator.save(previous_path)
+
+    slides = [
+        get_slide("One", image_path),
+        get_slide("Two, edited"),
+        get_slide("Three", other_image_path),
+    ]
+    updated_path = str(tmp_path / "updated.pptx")
+    creator = creator_class(
+        PptxPresentationModel(background_color="ffffff", slides=slides), str(tmp_path)
+    )
+    assert creator.update_ppt(previous_path, previous_slide_hashes) == 2
+    creator.save(updated_path)
+
+    rebuilt_path = str(tmp_path / "rebuilt.pptx")
+    creator = creator_class(
+        PptxPresentationModel(background_color="ffffff", slides=slides), str(tmp_path)
+    )
+    creator.create_ppt()
+    creator.save(rebuilt_path)
+
+    updated = get_parts(updated_path)
+    rebuilt = get_parts(rebuilt_path)
+    assert updated.keys() == rebuilt.keys()
+    for partname, blob in rebuilt.items():
+        assert updated[partname] == blob, partname
+
+    # Adding slides back extends the package
+    slides.append(get_slide("Five", image_path))
+    creator = creator_class(
+        PptxPresentationModel(background_color="ffffff", slides=slides), str(tmp_path)
+    )
+    assert creator.update_ppt(updated_path, get_slide_hashes(creator._ppt_model)[:3]) == 1
+    creator.save(updated_path)
+    assert len(get_parts(updated_path)) == len(rebuilt) + 1
+
+
+def test_manifest_requires_unchanged_package_and_globals(tmp_path):
+    model = PptxPresentationModel(background_color="ffffff", slides=[get_slide("One")])
+    path = str(tmp_path / "deck.pptx")
+    creator = PptxPresentationCreator(model, str(tmp_path))
+    creator.create_ppt()
+    creator.save(path)
+
+    presentation_hash = get_presentation_hash(model, {"name": "light"})
+    PptxExportManifest.create(path, presentation_hash, get_slide_hashes(model)).save(
+        str(tmp_path)
+    )
+    manifest = PptxExportManifest.load(str(tmp_path))
+
+    assert manifest.can_update(presentation_hash)
+    assert not manifest.can_update(get_presentation_hash(model, {"name": "dark"}))
+    model.background_color = "000000"
+    assert not manifest.can_update(get_presentation_hash(model, {"name": "light"}))
+
+    with open(path, "ab") as f:
+        f.write(b"\0")
+    assert not manifest.can_update(presentation_hash)
+    assert PptxExportManifest.load(str(tmp_path / "missing")) is None
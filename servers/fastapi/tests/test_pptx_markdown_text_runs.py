@@ -0,0 +1,139 @@
+import pytest
+
+from ppt_generator.models.pptx_models import PptxFontModel, PptxPresentationModel
+from ppt_generator.pptx_presentation_creator import (
+    PptxPresentationCreator,
+    tokenize_markdown_line,
+)
+
+# Output of the previous parser, as (text, (bold, italic)) with None for no font
+PINNED_TEXT_RUNS = [
+    ("plain text", [("plain text", (False, True))]),
+    (
+        "**bold** and __it__ and ***both***",
+        [
+            ("bold", (True, True)),
+            (" and ", (False, True)),
+            ("it", (False, True)),
+            (" and ", (False, True)),
+            ("both", (True, True)),
+        ],
+    ),
+    (
+        "a***b***c**d**e__f__g",
+        [
+            ("a", (False, True)),
+            ("b", (True, True)),
+            ("c", (False, True)),
+            ("d", (True, True)),
+            ("e", (False, True)),
+            ("f", (False, True)),
+            ("g", (False, True)),
+        ],
+    ),
+    ("****", [("", (True, True))]),
+    ("******", [("", (True, True))]),
+    ("***a**", [("*a", (True, True))]),
+    (
+        "x\ny\nx",
+        [("x", (False, True)), ("y", (False, True)), ("\n", None), ("x", (False, True))],
+    ),
+    ("same\nsame", [("same", (False, True)), ("same", (False, True))]),
+    (
+        "line one\n\nline **three**\n",
+        [
+            ("line one", (False, True)),
+            ("\n", None),
+            ("line ", (False, True)),
+            ("three", (True, True)),
+            ("\n", None),
+        ],
+    ),
+    ("__a__**b**", [("a", (False, True)), ("b", (True, True))]),
+    ("*single* stars", [("*single* stars", (False, True))]),
+    ("** lead **", [(" lead ", (True, True))]),
+    (
+        "a __ b __ c",
+        [("a ", (False, True)), (" b ", (False, True)), (" c", (False, True))],
+    ),
+    ("__**x**__", [("**x**", (False, True))]),
+    ("**__x__**", [("__x__", (True, True))]),
+    (
+        "a\n**b**\n",
+        [("a", (False, True)), ("\n", None), ("b", (True, True)), ("\n", None)],
+    ),
+    ("", []),
+    ("\n", []),
+]
+
+
+def parse(text: str):
+    ppt_creator = PptxPresentationCreator(
+        PptxPresentationModel(background_color="ffffff", slides=[]), ""
+    )
+    font = PptxFontModel(name="Inter", size=20, color="111111", italic=True)
+    return [
+        (each.text, None if each.font is None else (each.font.bold, each.font.italic))
+        for each in ppt_creator.parse_markdown_text_to_text_runs(font, text)
+    ]
+
+
+@pytest.mark.parametrize("text, text_runs", PINNED_TEXT_RUNS)
+def test_text_runs_match_previous_parser(text, text_runs):
+    assert parse(text) == text_runs
+
+
+def test_unclosed_markers_are_plain_text():
+    assert parse("trail **") == [("trail ", (False, True)), ("**", (False, True))]
+    assert parse("**a***b***") == [
+        ("a", (True, True)),
+        ("*b", (False, True)),
+        ("***", (False, True)),
+    ]
+    assert parse("**bold\nstill**") == [
+        ("**bold", (False, True)),
+        ("\n", None),
+        ("still", (False, True)),
+        ("**", (False, True)),
+    ]
+
+
+def test_font_variants_are_shared():
+    ppt_creator = PptxPresentationCreator(
+        PptxPresentationModel(background_color="ffffff", slides=[]), ""
+    )
+    font = PptxFontModel()
+    text_runs = ppt_creator.parse_markdown_text_to_text_runs(font, "**a** b **c**")
+
+    assert text_runs[0].font is text_runs[2].font
+    assert text_runs[1].font is font
+    assert font.bold is False
+
+
+class ScanCountingStr(str):
+    # Counts the characters scanned by find, the only search the tokenizer does
+    scanned = 0
+
+    def find(self, sub, start=0, end=None):
+        found_at = super().find(sub, start)
+        ScanCountingStr.scanned += (
+            len(self) if found_at == -1 else found_at + len(sub)
+        ) - start
+        return found_at
+
+
+def get_scanned_characters(line: str) -> int:
+    ScanCountingStr.scanned = 0
+    tokenize_markdown_line(ScanCountingStr(line))
+    return ScanCountingStr.scanned
+
+
+def test_long_paragraphs_parse_in_linear_time():
+    text = "word **bold** __italic__ ** " * 2500
+
+    assert len(parse(text)) > 2500
+    # Doubling the line at most doubles the scanned characters, a quadratic
+    # tokenizer would scan four times as many
+    scanned = get_scanned_characters(text)
+    assert get_scanned_characters(text * 2) <= 2.2 * scanned
+    assert scanned <= 4 * len(text)
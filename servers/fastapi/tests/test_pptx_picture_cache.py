@@ -0,0 +1,74 @@
+import os
+import time
+
+from PIL import Image
+
+from ppt_generator import picture_cache
+from ppt_generator.models.pptx_models import PptxPictureBoxModel
+from ppt_generator.picture_cache import PictureCache
+from ppt_generator.picture_processing import process_picture
+
+
+def get_picture_model(image_path: str, **kwargs) -> PptxPictureBoxModel:
+    return PptxPictureBoxModel(
+        position={"left": 0, "top": 0, "width": 120, "height": 90},
+        picture={"is_network": False, "path": image_path},
+        **kwargs,
+    )
+
+
+def save_random_image(path: str, size=(64, 48)) -> str:
+    Image.frombytes("RGBA", size, os.urandom(size[0] * size[1] * 4)).save(path)
+    return path
+
+
+def test_cache_key_depends_on_content_and_transforms(tmp_path):
+    cache = PictureCache(str(tmp_path / "cache"), max_bytes=1024 * 1024)
+    image_path = save_random_image(str(tmp_path / "source.png"))
+
+    key = cache.get_key(get_picture_model(image_path, border_radius=[8, 8, 8, 8]))
+    moved = get_picture_model(image_path, border_radius=[8, 8, 8, 8])
+    moved.position.left = 300
+    assert cache.get_key(moved) == key
+    assert cache.get_key(get_picture_model(image_path, border_radius=[4, 4, 4, 4])) != key
+    assert cache.get_key(get_picture_model(image_path, overlay="#5E8CF0")) != key
+
+    save_random_image(image_path)
+    assert (
+        cache.get_key(get_picture_model(image_path, border_radius=[8, 8, 8, 8])) != key
+    )
+    assert cache.get_key(get_picture_model(str(tmp_path / "missing.png"))) is None
+
+
+def test_process_picture_reuses_cached_output(tmp_path, monkeypatch):
+    cache = PictureCache(str(tmp_path / "cache"), max_bytes=1024 * 1024)
+    monkeypatch.setattr(picture_cache, "_PICTURE_CACHE", cache)
+    image_path = save_random_image(str(tmp_path / "source.png"))
+    picture_model = get_picture_model(image_path, shape="circle").model_dump(
+        mode="json"
+    )
+
+    first_picture = process_picture(picture_model)
+    (cache_file,) = os.listdir(cache.cache_dir)
+    cache_path = os.path.join(cache.cache_dir, cache_file)
+    os.utime(cache_path, (time.time() - 100, time.time() - 100))
+    first_mtime = os.stat(cache_path).st_mtime
+
+    assert process_picture(picture_model) == first_picture
+    assert os.listdir(cache.cache_dir) == [cache_file]
+    assert os.stat(cache_path).st_mtime > first_mtime
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    cache = PictureCache(str(tmp_path / "cache"), max_bytes=1024 * 1024)
+    paths = [cache.set(f"key{i}", os.urandom(1024)) for i in range(3)]
+    for i, path in enumerate(paths):
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+    # Reading the oldest entry makes it the most recently used
+    cache.get("key0")
+
+    cache.max_bytes = os.path.getsize(paths[0]) * 2
+    assert cache.evict() == 1
+    assert os.path.exists(paths[0])
+    assert not os.path.exists(paths[1])
+    assert os.path.exists(paths[2])
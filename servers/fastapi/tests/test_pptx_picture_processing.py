@@ -0,0 +1,59 @@
+import os
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+from PIL import Image
+
+from ppt_generator import picture_cache
+from ppt_generator.models.pptx_models import PptxPictureBoxModel
+from ppt_generator.picture_processing import encode_picture, process_pictures
+
+
+def get_picture_model(image_path: str, **kwargs) -> PptxPictureBoxModel:
+    return PptxPictureBoxModel(
+        position={"left": 0, "top": 0, "width": 120, "height": 90},
+        picture={"is_network": False, "path": image_path},
+        **kwargs,
+    )
+
+
+def test_process_pool_matches_inline_processing(tmp_path, monkeypatch):
+    # ? Disabled so the pool does not pick up pictures cached inline
+    monkeypatch.setenv("PPTX_PICTURE_CACHE_MAX_MB", "0")
+    monkeypatch.setattr(picture_cache, "_PICTURE_CACHE", None)
+
+    image_path = str(tmp_path / "source.png")
+    Image.frombytes("RGBA", (64, 48), os.urandom(64 * 48 * 4)).save(image_path)
+
+    picture_models = [
+        get_picture_model(image_path, border_radius=[8, 8, 8, 8]),
+        get_picture_model(image_path, shape="circle", overlay="#5E8CF0"),
+        get_picture_model(image_path, object_fit={"fit": "contain"}),
+        get_picture_model(str(tmp_path / "missing.png")),
+    ]
+
+    inline = process_pictures(picture_models)
+    with ProcessPoolExecutor(
+        max_workers=2, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        pooled = process_pictures(picture_models, executor)
+
+    assert inline.keys() == pooled.keys()
+    for key, picture in inline.items():
+        if picture is None:
+            assert pooled[key] is None
+            continue
+        assert (
+            Image.open(BytesIO(picture)).tobytes()
+            == Image.open(BytesIO(pooled[key])).tobytes()
+        )
+
+
+def test_encode_picture_picks_format_by_transparency():
+    opaque = Image.new("RGBA", (32, 32), (94, 140, 240, 255))
+    transparent = Image.new("RGBA", (32, 32), (94, 140, 240, 0))
+
+    assert Image.open(BytesIO(encode_picture(opaque))).format == "JPEG"
+    assert Image.open(BytesIO(encode_picture(transparent))).format == "PNG"
+    assert Image.open(BytesIO(encode_picture(opaque.convert("RGB")))).format == "JPEG"
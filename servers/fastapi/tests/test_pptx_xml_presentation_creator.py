@@ -0,0 +1,105 @@
+import os
+
+from PIL import Image
+
+from api.services.theme_registry import ThemeRegistryService
+from ppt_generator.models.pptx_models import PptxPresentationModel
+from ppt_generator.pptx_presentation_creator import PptxPresentationCreator
+from ppt_generator.pptx_xml_presentation_creator import PptxXmlPresentationCreator
+
+
+def get_presentation_model(image_path: str) -> PptxPresentationModel:
+    font = {"name": "Inter", "size": 20, "bold": False, "color": "1f2937"}
+    return PptxPresentationModel(
+        background_color="ffffff",
+        slides=[
+            {
+                "shapes": [
+                    {
+                        "position": {"left": 40, "top": 30, "width": 600, "height": 80},
+                        "margin": {"top": 4, "left": 2},
+                        "fill": {"color": "f3f4f6"},
+                        "paragraphs": [
+                            {
+                                "spacing": {"top": 3, "bottom": 5},
+                                "alignment": 2,
+                                "font": font,
+                                "text": "Hello **bold** and ***both***\nnext __italic__ \x07",
+                            },
+                            {
+                                "text_runs": [
+                                    {"text": "plain"},
+                                    {"text": "styled", "font": {**font, "italic": True}},
+                                ]
+                            },
+                            {"font": {**font, "size": 12}, "text": ""},
+                        ],
+                    },
+                    {
+                        "type": 5,
+                        "position": {"left": 10, "top": 200, "width": 300, "height": 120},
+                        "margin": {"left": 6, "right": 6},
+                        "fill": {"color": "5E8CF0"},
+                        "stroke": {"color": "000000", "thickness": 1.5},
+                        "shadow": {"radius": 4, "offset": 2, "opacity": 0.25, "angle": 90},
+                        "border_radius": 12,
+                        "text_wrap": False,
+                        "paragraphs": [{"alignment": 1, "text": "Box"}],
+                    },
+                    {
+                        "position": {"left": 400, "top": 200, "width": 200, "height": 100},
+                        "border_radius": 8,
+                    },
+                    {
+                        "position": {"left": 20, "top": 400, "width": 300, "height": 200},
+                        "border_radius": [8, 8, 8, 8],
+                        "picture": {"is_network": False, "path": image_path},
+                    },
+                    {
+                        "position": {"left": 600, "top": 500, "width": -200, "height": 0},
+                        "thickness": 2,
+                        "color": "333333",
+                    },
+                    {
+                        "position": {"left": 0, "top": 0, "width": 10, "height": 10},
+                        "thickness": 0,
+                    },
+                    {
+                        "position": {"left": 700, "top": 30, "width": 100, "height": 40},
+                        "text_wrap": False,
+                        "paragraphs": [{"text": "Last"}],
+                    },
+                ]
+            },
+            {"shapes": []},
+        ],
+    )
+
+
+def get_parts(creator: PptxPresentationCreator) -> dict:
+    creator.create_ppt()
+    return {
+        str(part.partname): part.blob
+        for part in creator._ppt.part.package.iter_parts()
+    }
+
+
+def test_xml_creator_matches_python_pptx(tmp_path):
+    image_path = str(tmp_path / "source.png")
+    Image.frombytes("RGBA", (64, 48), os.urandom(64 * 48 * 4)).save(image_path)
+    theme_colors = ThemeRegistryService().get_pptx_color_mapping({"name": "light"})
+
+    expected = get_parts(
+        PptxPresentationCreator(
+            get_presentation_model(image_path), str(tmp_path), theme_colors
+        )
+    )
+    actual = get_parts(
+        PptxXmlPresentationCreator(
+            get_presentation_model(image_path), str(tmp_path), theme_colors
+        )
+    )
+
+    assert actual.keys() == expected.keys()
+    for partname, blob in expected.items():
+        assert actual[partname] == blob, partname
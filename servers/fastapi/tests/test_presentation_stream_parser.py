@@ -0,0 +1,43 @@
+import json
+
+from ppt_generator.presentation_stream_parser import PresentationStreamParser
+
+
+PRESENTATION = {
+    "title": "slides [ { } ]",
+    "slides": [
+        {"type": 1, "content": {"title": "Intro", "body": 'Quote \\" and } brace'}},
+        {"type": 2, "content": {"title": "Items", "body": [{"heading": "a"}]}},
+        {"type": 5, "content": {"graph": {"data": [[1, 2], [3, 4]]}}},
+    ],
+    "notes": ["{ not a slide }"],
+}
+
+
+def test_parser_emits_each_slide_as_soon_as_it_completes():
+    text = json.dumps(PRESENTATION)
+    parser = PresentationStreamParser()
+
+    completed = []
+    completed_at = []
+    for i in range(0, len(text), 7):
+        for slide in parser.feed(text[i : i + 7]):
+            completed.append(slide)
+            completed_at.append(i)
+
+    assert completed == PRESENTATION["slides"]
+    # Slides are returned while the document is still streaming
+    assert completed_at[0] < completed_at[1] < completed_at[2] < len(text) - 7
+    assert parser.parse() == PRESENTATION
+
+
+def test_parser_handles_single_character_chunks():
+    text = json.dumps({"slides": PRESENTATION["slides"]}, indent=2)
+    parser = PresentationStreamParser()
+
+    completed = []
+    for char in text:
+        completed.extend(parser.feed(char))
+
+    assert completed == PRESENTATION["slides"]
+    assert parser.n_completed == 3
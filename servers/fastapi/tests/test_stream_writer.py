@@ -0,0 +1,123 @@
+import asyncio
+import gc
+import os
+from io import BytesIO
+
+import pytest
+from pptx import Presentation
+
+from api.routers.presentation.handlers.export_as_pptx_stream import (
+    ExportAsPptxStreamHandler,
+)
+from api.utils.stream_writer import QueueStreamWriter
+from ppt_generator.models.pptx_models import PptxPresentationModel
+from ppt_generator.pptx_presentation_creator import PptxPresentationCreator
+
+
+def get_ppt_creator(tmp_path) -> PptxPresentationCreator:
+    slide = {
+        "shapes": [
+            {
+                "position": {"left": 40, "top": 30, "width": 600, "height": 80},
+                "paragraphs": [{"font": {}, "text": "Streamed **slide** " * 20}],
+            }
+        ]
+    }
+    ppt_creator = PptxPresentationCreator(
+        PptxPresentationModel(background_color="ffffff", slides=[slide] * 20),
+        str(tmp_path),
+    )
+    ppt_creator.create_ppt()
+    return ppt_creator
+
+
+async def stream(writer: QueueStreamWriter, write, limit=None) -> bytes:
+    def run():
+        failed = False
+        try:
+            write(writer)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            writer.close(failed)
+
+    task = asyncio.create_task(asyncio.to_thread(run))
+    chunks = []
+    async for chunk in writer.iter_chunks():
+        chunks.append(chunk)
+        if limit and len(chunks) >= limit:
+            break
+    if limit:
+        with pytest.raises(OSError):
+            await task
+    else:
+        await task
+    return b"".join(chunks)
+
+
+def test_streamed_package_matches_saved_package(tmp_path):
+    ppt_creator = get_ppt_creator(tmp_path)
+    tee_path = str(tmp_path / "tee.pptx")
+    writer = QueueStreamWriter(chunk_size=1024, max_chunks=2, tee_path=tee_path)
+
+    streamed = asyncio.run(stream(writer, ppt_creator.save))
+
+    saved = BytesIO()
+    ppt_creator.save(saved)
+    expected = {
+        str(part.partname): part.blob
+        for part in Presentation(saved).part.package.iter_parts()
+    }
+    actual = {
+        str(part.partname): part.blob
+        for part in Presentation(BytesIO(streamed)).part.package.iter_parts()
+    }
+    assert actual == expected
+    with open(tee_path, "rb") as f:
+        assert f.read() == streamed
+    assert not os.path.exists(f"{tee_path}.partial")
+
+
+def test_writer_stops_when_reader_goes_away(tmp_path):
+    tee_path = str(tmp_path / "tee.bin")
+    writer = QueueStreamWriter(chunk_size=16, max_chunks=1, tee_path=tee_path)
+
+    def write(writer):
+        for _ in range(1000):
+            writer.write(os.urandom(16))
+
+    streamed = asyncio.run(stream(writer, write, limit=2))
+
+    assert len(streamed) == 32
+    assert not os.path.exists(tee_path)
+    assert not os.path.exists(f"{tee_path}.partial")
+
+
+def test_aborted_download_retrieves_the_save_error(tmp_path):
+    class EndlessPptCreator:
+        def save(self, writer):
+            for _ in range(1000):
+                writer.write(b"x" * 64 * 1024)
+
+    handler = ExportAsPptxStreamHandler.__new__(ExportAsPptxStreamHandler)
+    handler.temp_dir = str(tmp_path)
+    unhandled = []
+
+    async def download_first_chunk():
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: unhandled.append(context)
+        )
+        chunks = handler.get_stream(EndlessPptCreator(), None, "hash", [])
+        assert await chunks.__anext__()
+        # The client disconnects
+        await chunks.aclose()
+        # Waits for the save to fail, then for its task to be collected
+        for _ in range(100):
+            if len(asyncio.all_tasks()) == 1:
+                break
+            await asyncio.sleep(0.01)
+        gc.collect()
+
+    asyncio.run(download_first_chunk())
+    assert unhandled == []
@@ -0,0 +1,61 @@
+import json
+import os
+import subprocess
+import sys
+
+from api.services.theme_registry import ThemeRegistryService
+
+
+def test_theme_names_are_normalized():
+    registry = ThemeRegistryService()
+
+    theme = registry.get_theme("royal-blue")
+    assert theme["name"] == "royal_blue"
+    assert theme["colors"]["slideBg"] == "#091433"
+    assert "royal blue" in registry.get_prompt("Royal Blue")
+    assert registry.get_theme("unknown")["colors"] == registry.get_theme("light")[
+        "colors"
+    ]
+
+
+def test_pptx_color_mapping_prefers_saved_colors():
+    registry = ThemeRegistryService()
+
+    mapping = registry.get_pptx_color_mapping(
+        {"name": "custom", "colors": {"slideTitle": "#abcdef", "chartColors": []}}
+    )
+    assert mapping == {"dk1": "ABCDEF"}
+    assert registry.get_pptx_color_mapping({"name": "dark"})["accent1"] == "5E8CF0"
+
+
+def test_reload_picks_up_changed_themes(tmp_path):
+    themes_path = tmp_path / "themes.json"
+    themes_path.write_text(json.dumps({"themes": {"light": {"colors": {}}}}))
+    registry = ThemeRegistryService(str(themes_path))
+    assert list(registry.get_themes()) == ["light"]
+
+    themes_path.write_text(
+        json.dumps({"themes": {"light": {"colors": {}}, "Ocean-Blue": {"colors": {}}}})
+    )
+    assert registry.reload() == ["light", "ocean_blue"]
+
+
+def test_exporter_does_not_create_the_services():
+    # Creating the services cleans TEMP_DIRECTORY and sets up the database
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys\n"
+            "import ppt_generator.pptx_xml_presentation_creator\n"
+            "import ppt_generator.slide_model_utils\n"
+            "assert 'api.services.instances' not in sys.modules",
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env={
+            key: value
+            for key, value in os.environ.items()
+            if key not in ("APP_DATA_DIRECTORY", "TEMP_DIRECTORY")
+        },
+    )
+    assert completed.returncode == 0